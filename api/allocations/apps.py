@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AllocationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.allocations'
+
+    def ready(self):
+        from .invalidation import connect_signals
+        connect_signals()
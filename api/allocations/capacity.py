@@ -0,0 +1,190 @@
+"""
+Capacity planning engine behind GET /allocations/capacity.
+
+A workspace's workload is a users x periods matrix of allocated hours.
+The grid's columns are the time periods of one cadence (week by default)
+overlapping the requested range. The rows are the workspace's members
+plus any other user with allocations on its tasks.
+
+The matrix is built from two columnar reads:
+- allocated hours summed by the database per (user, time period),
+- the start and end of the time periods those allocations use.
+An allocation on a period of another cadence (a month, a quarter) is
+spread over the grid periods it overlaps, in proportion to overlapping
+days. Each allocation period gets a share row over the grid, so
+load = hours[user, allocation period] @ share[allocation period, grid].
+
+Capacity per period is the weekly capacity scaled by the period's working
+days (Monday to Friday). Spare capacity and over-allocation are
+vectorized comparisons of the load matrix against it.
+
+Load matrices are kept in the Django cache, keyed by workspace, cadence
+and range, and tagged with versions that allocation, membership, user and
+time period changes replace (api.allocations.invalidation). Invalidation
+across processes therefore requires a shared CACHES backend.
+
+Usage:
+    plan = capacity_plan(workspace, start_on, end_on, cadence='week', weekly_capacity=40)
+    plan['users'][0]['over_allocated']
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import List
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Q, Sum
+
+from common.columns import read_columns
+from .invalidation import SHARED_SCOPE, current_version
+from .models import Allocation
+
+
+DEFAULT_WEEKLY_CAPACITY = 40.0
+
+# Seconds a load matrix stays cached; versions make stale ones unreachable sooner
+CACHE_TIMEOUT = 60 * 60
+
+# Largest users x periods grid a plan may cover
+MAX_GRID_CELLS = 2_000_000
+
+# Load above capacity by more than this counts as over-allocated
+OVER_ALLOCATION_EPSILON = 1e-6
+
+CADENCES = ('week', 'month', 'quarter', 'year')
+
+
+class CapacityError(ValueError):
+    """Invalid capacity plan parameters."""
+
+
+@dataclass
+class LoadMatrix:
+    """Allocated hours per (user, grid period), with the labels of both axes."""
+    users: List[dict]
+    periods: List[dict]
+    working_days: np.ndarray
+    load: np.ndarray
+
+
+def _days(values) -> np.ndarray:
+    return np.asarray(values, dtype='datetime64[D]').astype(np.int64)
+
+
+def build_load(workspace_id: int, cadence: str, start_on: date, end_on: date) -> LoadMatrix:
+    """Compute a workspace's load matrix over the grid periods of a cadence, in four queries."""
+    from api.time_periods.models import TimePeriod
+    from api.users.models import User
+
+    grid = list(TimePeriod.objects.filter(
+        period=cadence, start_on__lte=end_on, end_on__gte=start_on
+    ).order_by('start_on', 'id').values_list('gid', 'display_name', 'start_on', 'end_on'))
+    grid_starts = _days([row[2] for row in grid])
+    grid_ends = _days([row[3] for row in grid])
+
+    allocations = Allocation.objects.filter(
+        task__workspace_id=workspace_id, effort_allocation__isnull=False,
+        time_period__start_on__lte=end_on, time_period__end_on__gte=start_on,
+    )
+    hours = read_columns(
+        allocations.values('user_id', 'time_period_id').annotate(hours=Sum('effort_allocation')),
+        ('user_id', 'time_period_id', 'hours'), dtypes={'hours': np.float64},
+    )
+    users = list(User.objects.filter(
+        Q(user_workspaces__workspace_id=workspace_id) | Q(pk__in=allocations.values('user_id'))
+    ).distinct().order_by('id').values_list('id', 'gid', 'name'))
+    if len(users) * len(grid) > MAX_GRID_CELLS:
+        raise CapacityError('Capacity plan too large; narrow the date range or choose a longer period')
+
+    # Share of each allocation period's hours falling in each grid period
+    period_ids, period_index = np.unique(hours['time_period_id'], return_inverse=True)
+    spans = {
+        pk: (start, end) for pk, start, end in
+        TimePeriod.objects.filter(pk__in=period_ids.tolist()).values_list('id', 'start_on', 'end_on')
+    }
+    starts = _days([spans[pk][0] for pk in period_ids.tolist()])
+    ends = _days([spans[pk][1] for pk in period_ids.tolist()])
+    overlap = np.minimum(ends[:, None], grid_ends[None, :]) - np.maximum(starts[:, None], grid_starts[None, :]) + 1
+    share = np.clip(overlap, 0, None) / np.maximum(ends - starts + 1, 1)[:, None]
+
+    user_ids = np.array([row[0] for row in users], dtype=np.int64)
+    user_index = np.searchsorted(user_ids, hours['user_id'])
+    by_period = np.bincount(
+        user_index * len(period_ids) + period_index, weights=hours['hours'],
+        minlength=len(user_ids) * len(period_ids),
+    ).reshape(len(user_ids), len(period_ids))
+
+    return LoadMatrix(
+        users=[{'gid': gid, 'resource_type': 'user', 'name': name} for _, gid, name in users],
+        periods=[
+            {'gid': gid, 'resource_type': 'time_period', 'display_name': name, 'start_on': start, 'end_on': end}
+            for gid, name, start, end in grid
+        ],
+        working_days=np.busday_count(grid_starts.astype('datetime64[D]'), (grid_ends + 1).astype('datetime64[D]')),
+        load=by_period @ share,
+    )
+
+
+def workspace_load(workspace_id: int, cadence: str, start_on: date, end_on: date) -> LoadMatrix:
+    """The cached load matrix of a workspace, computed on a miss."""
+    key = 'allocation-capacity:{}:{}:{}:{}:{}:{}'.format(
+        workspace_id, cadence, start_on.isoformat(), end_on.isoformat(),
+        current_version(workspace_id), current_version(SHARED_SCOPE),
+    )
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_load(workspace_id, cadence, start_on, end_on)
+        cache.set(key, matrix, CACHE_TIMEOUT)
+    return matrix
+
+
+def capacity_plan(workspace, start_on: date, end_on: date, cadence: str = 'week',
+                  weekly_capacity: float = DEFAULT_WEEKLY_CAPACITY, over_allocated_only: bool = False) -> dict:
+    """
+    Load, spare capacity and over-allocation of every user in every grid
+    period, with per-period totals over all users.
+    """
+    if cadence not in CADENCES:
+        raise CapacityError(f"period must be one of {', '.join(CADENCES)}")
+    if start_on > end_on:
+        raise CapacityError('start_on must not be after end_on')
+    if not np.isfinite(weekly_capacity) or weekly_capacity < 0:
+        raise CapacityError('capacity must be a non-negative number of hours')
+
+    matrix = workspace_load(workspace.pk, cadence, start_on, end_on)
+    capacity = weekly_capacity * matrix.working_days / 5
+    spare = capacity[None, :] - matrix.load
+    over = spare < -OVER_ALLOCATION_EPSILON
+    rows = np.flatnonzero(over.any(axis=1)) if over_allocated_only else np.arange(len(matrix.users))
+
+    # Whole matrices are converted to lists at once, rows only picked out
+    load = np.round(matrix.load[rows], 2).tolist()
+    spare = np.round(spare[rows], 2).tolist()
+    flags = over[rows].tolist()
+    user_totals = np.round(matrix.load[rows].sum(axis=1), 2).tolist()
+    user_over = over[rows].sum(axis=1).tolist()
+    return {
+        'start_on': start_on,
+        'end_on': end_on,
+        'period': cadence,
+        'weekly_capacity': weekly_capacity,
+        'periods': [
+            dict(period, capacity=round(float(hours), 2)) for period, hours in zip(matrix.periods, capacity)
+        ],
+        'users': [
+            {
+                'user': matrix.users[i],
+                'load': load[n],
+                'spare_capacity': spare[n],
+                'over_allocated': flags[n],
+                'total_load': user_totals[n],
+                'num_over_allocated_periods': user_over[n],
+            }
+            for n, i in enumerate(rows.tolist())
+        ],
+        'totals': {
+            'load': np.round(matrix.load.sum(axis=0), 2).tolist(),
+            'capacity': np.round(capacity * len(matrix.users), 2).tolist(),
+            'num_over_allocated_users': over.sum(axis=0).tolist(),
+        },
+    }
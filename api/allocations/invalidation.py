@@ -0,0 +1,85 @@
+"""
+Invalidation of cached capacity plans (api.allocations.capacity).
+
+Each workspace's cached load matrices are tagged with a version kept in
+the Django cache, plus a version shared by all workspaces. Replacing a
+version makes every process recompute on next use:
+- allocation changes replace the version of the allocated task's workspace,
+- workspace membership changes that of the workspace,
+- user and time period changes the shared one.
+Replacements happen once the transaction commits.
+
+Kept apart from the engine so wiring the signals does not import NumPy.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from common.transactions import defer_to_commit
+from .models import Allocation
+
+
+# Version shared by every workspace, for users and time periods
+SHARED_SCOPE = 'shared'
+
+
+def _version_key(scope) -> str:
+    return f'allocation-capacity:{scope}'
+
+
+def current_version(scope) -> str:
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_workspaces(workspace_ids) -> None:
+    """Drop the cached load matrices of these workspaces in every process."""
+    for workspace_id in set(workspace_ids):
+        cache.set(_version_key(workspace_id), uuid.uuid4().hex, None)
+
+
+def invalidate_shared(_=None) -> None:
+    """Drop every cached load matrix, after user or time period changes."""
+    cache.set(_version_key(SHARED_SCOPE), uuid.uuid4().hex, None)
+
+
+def _on_allocation_change(sender, instance, raw=False, **kwargs):
+    from api.tasks.models import Task
+
+    if not raw:
+        # Resolved now: when the task itself is being deleted it is gone at commit
+        workspace_ids = Task.objects.filter(pk=instance.task_id).values_list('workspace_id', flat=True)
+        defer_to_commit('allocations.capacity', list(workspace_ids), invalidate_workspaces)
+
+
+def _on_membership_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('allocations.capacity', [instance.workspace_id], invalidate_workspaces)
+
+
+def _on_shared_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('allocations.capacity.shared', [SHARED_SCOPE], invalidate_shared)
+
+
+def connect_signals() -> None:
+    """Drop cached load matrices as allocations, members, users and time periods change."""
+    from api.time_periods.models import TimePeriod
+    from api.users.models import User, UserWorkspace
+
+    post_save.connect(_on_allocation_change, sender=Allocation, dispatch_uid='allocations.capacity.save')
+    post_delete.connect(_on_allocation_change, sender=Allocation, dispatch_uid='allocations.capacity.delete')
+    post_save.connect(_on_membership_change, sender=UserWorkspace, dispatch_uid='allocations.capacity.member_save')
+    post_delete.connect(
+        _on_membership_change, sender=UserWorkspace, dispatch_uid='allocations.capacity.member_delete'
+    )
+    for model in (User, TimePeriod):
+        post_save.connect(_on_shared_change, sender=model, dispatch_uid=f'allocations.capacity.{model.__name__}.save')
+        post_delete.connect(
+            _on_shared_change, sender=model, dispatch_uid=f'allocations.capacity.{model.__name__}.delete'
+        )
@@ -2,12 +2,17 @@
 Allocations views matching FastAPI behavior exactly.
 Implements all allocations endpoints from FastAPI allocations_api.py
 """
+from datetime import date, timedelta
+
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Allocation
 from .serializers import (
@@ -39,6 +44,8 @@ class AllocationsViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = Allocation.objects.all()
+        projection = compile_opt_fields(AllocationCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +53,7 @@ class AllocationsViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = AllocationCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +61,7 @@ class AllocationsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = AllocationCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +85,59 @@ class AllocationsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(AllocationResponseSerializer, opt_fields)
         try:
-            resource = Allocation.objects.get(gid=resource_gid)
+            resource = projection.apply(Allocation.objects).get(gid=resource_gid)
         except Allocation.DoesNotExist:
             return asana_not_found_error('Allocation')
         
-        serializer = AllocationResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    @action(detail=False, methods=['get'], url_path='capacity')
+    def capacity(self, request: Request) -> Response:
+        """
+        GET /allocations/capacity
+        Returns the workload of a workspace's users: allocated hours, spare
+        capacity and over-allocation per user in each time period of one
+        cadence between start_on and end_on (default: the next 52 weeks).
+        Query params: workspace (required), start_on, end_on, period,
+        capacity (hours per user per week), over_allocated_only
+        """
+        from .capacity import DEFAULT_WEEKLY_CAPACITY, CapacityError, capacity_plan
+        from api.workspaces.models import Workspace
+        
+        workspace_gid = request.query_params.get('workspace')
+        try:
+            workspace = Workspace.objects.only('id').get(gid=workspace_gid)
+        except Workspace.DoesNotExist:
+            return asana_not_found_error('Workspace')
+        
+        try:
+            start_on = date.fromisoformat(request.query_params['start_on']) if request.query_params.get('start_on') \
+                else timezone.localdate()
+            end_on = date.fromisoformat(request.query_params['end_on']) if request.query_params.get('end_on') \
+                else start_on + timedelta(weeks=52, days=-1)
+        except ValueError:
+            return asana_validation_error('start_on and end_on must be dates (YYYY-MM-DD)')
+        try:
+            weekly_capacity = float(request.query_params.get('capacity', DEFAULT_WEEKLY_CAPACITY))
+        except ValueError:
+            return asana_validation_error('capacity must be a number of hours')
+        
+        try:
+            data = capacity_plan(
+                workspace, start_on, end_on,
+                cadence=request.query_params.get('period', 'week'),
+                weekly_capacity=weekly_capacity,
+                over_allocated_only=request.query_params.get('over_allocated_only', 'false').lower() == 'true',
+            )
+        except CapacityError as e:
+            return asana_validation_error(str(e))
+        
+        return Response(wrap_single_response(data))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(fields=['parent', 'created_at'], name='attachments_parent_created_idx'),
+        ),
+    ]
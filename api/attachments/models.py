@@ -79,6 +79,10 @@ class Attachment(models.Model):
     class Meta:
         db_table = 'attachments'
         ordering = ['-created_at']
+        indexes = [
+            # GET /tasks/{task_gid}/attachments ORDER BY created_at DESC
+            models.Index(fields=['parent', 'created_at'], name='attachments_parent_created_idx'),
+        ]
 
     def __str__(self):
         return self.name or self.gid
@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Attachment
 from .serializers import (
@@ -42,12 +43,13 @@ class AttachmentsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(AttachmentResponseSerializer, opt_fields)
         try:
-            attachment = Attachment.objects.get(gid=attachment_gid)
+            attachment = projection.apply(Attachment.objects).get(gid=attachment_gid)
         except Attachment.DoesNotExist:
             return asana_not_found_error('Attachment')
         
-        serializer = AttachmentResponseSerializer(attachment)
+        serializer = projection.serializer(attachment)
         data = serializer.data
         
         if opt_fields:
@@ -101,13 +103,16 @@ class AttachmentsViewSet(viewsets.ViewSet):
         # Query attachments for this task
         queryset = Attachment.objects.filter(parent=task).order_by('-created_at')
         
+        projection = compile_opt_fields(AttachmentCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = AttachmentCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -115,7 +120,7 @@ class AttachmentsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = AttachmentCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
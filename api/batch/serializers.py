@@ -26,3 +26,16 @@ class BatchResponseSerializer(serializers.ModelSerializer):
         model = BatchRequest
         fields = '__all__'
         read_only_fields = ['gid']
+
+
+class CreateBatchRequestSerializer(serializers.Serializer):
+    """
+    Create batch request serializer.
+    Matches CreateBatchRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    actions = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        allow_null=True
+    )
@@ -8,12 +8,15 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import BatchRequest
 from .serializers import (
     BatchCompactSerializer,
     BatchResponseSerializer,
+    CreateBatchRequestSerializer,
 )
+from .executor import BatchExecutor, validate_actions
 
 
 class BatchViewSet(viewsets.ViewSet):
@@ -39,6 +42,8 @@ class BatchViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = BatchRequest.objects.all()
+        projection = compile_opt_fields(BatchCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +51,7 @@ class BatchViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = BatchCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +59,7 @@ class BatchViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = BatchCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +83,41 @@ class BatchViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(BatchResponseSerializer, opt_fields)
         try:
-            resource = BatchRequest.objects.get(gid=resource_gid)
+            resource = projection.apply(BatchRequest.objects).get(gid=resource_gid)
         except BatchRequest.DoesNotExist:
             return asana_not_found_error('Batch')
         
-        serializer = BatchResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    def create(self, request: Request) -> Response:
+        """
+        POST /batch
+        Submits parallel requests and returns the responses of every action.
+        
+        Body:
+        - data.actions: array of {relative_path, method, data, options}
+        """
+        serializer = CreateBatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        actions = data_dict.get('actions') or request_data.get('actions')
+        
+        error = validate_actions(actions)
+        if error:
+            return asana_validation_error(error)
+        
+        # Run every action in-process against the matching viewset
+        results = BatchExecutor(request).execute(actions)
+        
+        return Response({'data': results})
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BudgetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.budgets'
+
+    def ready(self):
+        from .spend import connect_signals
+        connect_signals()
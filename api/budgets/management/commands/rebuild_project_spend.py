@@ -0,0 +1,14 @@
+"""
+Rebuild the project spend table from the time tracking entries and rates.
+"""
+from django.core.management.base import BaseCommand
+
+from api.budgets.spend import rebuild_spend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project_spend table: tracked minutes per project, user and day, priced at current rates.'
+
+    def handle(self, *args, **options):
+        written = rebuild_spend()
+        self.stdout.write(f'Wrote {written:,} spend rows')
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_userworkspace_user_workspaces_ws_user_idx'),
+        ('projects', '0002_project_projects_ws_name_idx'),
+        ('budgets', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entered_on', models.DateField()),
+                ('minutes', models.IntegerField(default=0)),
+                ('cost', models.FloatField(default=0, help_text="Minutes priced at the user's rate in effect.")),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spend', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_spend', to='users.user')),
+            ],
+            options={
+                'db_table': 'project_spend',
+                'indexes': [models.Index(fields=['project', 'entered_on'], name='project_spend_date_idx'), models.Index(fields=['user', 'project'], name='project_spend_user_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projectspend',
+            constraint=models.UniqueConstraint(fields=('project', 'user', 'entered_on'), name='project_spend_uniq'),
+        ),
+    ]
@@ -54,3 +54,38 @@ class Budget(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.amount} {self.currency_code or ''}"
+
+
+class ProjectSpend(models.Model):
+    """
+    Tracked minutes and their cost in a project, per user and day
+    (see api.budgets.spend).
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='spend'
+    )
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='project_spend'
+    )
+    entered_on = models.DateField()
+    minutes = models.IntegerField(default=0)
+    cost = models.FloatField(
+        default=0,
+        help_text="Minutes priced at the user's rate in effect."
+    )
+
+    class Meta:
+        db_table = 'project_spend'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'user', 'entered_on'], name='project_spend_uniq'),
+        ]
+        indexes = [
+            # Burn-down series and spent-to-date of a project
+            models.Index(fields=['project', 'entered_on'], name='project_spend_date_idx'),
+            # Repricing a user's spend after a rate change
+            models.Index(fields=['user', 'project'], name='project_spend_user_idx'),
+        ]
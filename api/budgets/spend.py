@@ -0,0 +1,291 @@
+"""
+Budget burn: cost of tracked time per project.
+
+ProjectSpend holds, per project, user and day, the minutes tracked on the
+project's tasks and their cost at the user's rate in effect. A user's
+rate in effect in a workspace is their most recent Rate there, else the
+workspace's most recent default rate (no user), else 0. Rates carry no
+effective date, so a rate change reprices all of the user's spend.
+Amounts are in the rates' currency; currencies are not converted.
+
+Rows are adjusted with F() updates in the writing transaction:
+- time tracking entry saves and deletes move minutes and cost between the
+  (project, user, day) rows of the entry's task's projects,
+- a task joining a project (api.tasks.counts.task_memberships_added)
+  brings its existing entries into the project,
+- tasks about to be deleted (api.tasks.counts.tasks_removed) take theirs
+  out, with one grouped query,
+- rate changes reprice the workspace's rows with one UPDATE per distinct
+  rate in effect.
+Entries deleted along with their task or user are skipped: the task path
+above removed them, and a user's rows are deleted with the user.
+
+Spent-to-date and burn-down series of a budget are sums over its
+project's daily rows, so no entry is priced on read. rebuild_project_spend
+recomputes the table.
+
+Usage:
+    burn = burn_down(budget, interval='week')
+    burn['spent'], burn['remaining'], burn['series'][-1]['cumulative']
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Tuple
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.signals import post_delete, post_save
+
+from common.counters import adjust
+from .models import ProjectSpend
+
+
+INTERVALS = ('day', 'week', 'month')
+
+# (project_id, user_id, entered_on) -> minutes
+SpendDeltas = Dict[Tuple[int, int, date], int]
+
+
+def user_rates(workspace_id: int, user_ids: Iterable[int]) -> Dict[int, float]:
+    """Hourly rate in effect for each user in a workspace, in one query."""
+    from api.rates.models import Rate
+
+    user_ids = set(user_ids)
+    latest = {}
+    rates = Rate.objects.filter(workspace_id=workspace_id).filter(
+        Q(user_id__in=user_ids) | Q(user__isnull=True)
+    ).order_by('created_at', 'id').values_list('user_id', 'rate')
+    for user_id, rate in rates:
+        latest[user_id] = float(rate)
+    default = latest.get(None, 0.0)
+    return {user_id: latest.get(user_id, default) for user_id in user_ids}
+
+
+def apply_spend(deltas: SpendDeltas) -> None:
+    """Add tracked minutes, priced at each user's rate in effect, to the spend rows."""
+    from api.projects.models import Project
+
+    deltas = {key: minutes for key, minutes in deltas.items() if minutes}
+    if not deltas:
+        return
+    workspaces = dict(Project.objects.filter(
+        pk__in={project_id for project_id, _, _ in deltas}
+    ).values_list('id', 'workspace_id'))
+    users = defaultdict(set)
+    for project_id, user_id, _ in deltas:
+        users[workspaces[project_id]].add(user_id)
+    rates = {
+        (workspace_id, user_id): rate
+        for workspace_id, user_ids in users.items()
+        for user_id, rate in user_rates(workspace_id, user_ids).items()
+    }
+    with transaction.atomic():
+        emptied = []
+        for (project_id, user_id, entered_on), minutes in deltas.items():
+            key = {'project_id': project_id, 'user_id': user_id, 'entered_on': entered_on}
+            adjust(ProjectSpend, key, {'minutes': minutes, 'cost': minutes * rates[(workspaces[project_id], user_id)] / 60})
+            if minutes < 0:
+                emptied.append(key)
+        # Days without tracked time left are dropped, so series only show
+        # days that still count
+        for key in emptied:
+            ProjectSpend.objects.filter(minutes__lte=0, **key).delete()
+
+
+def entries_changed(changes: Iterable[Tuple[int, int, date, int]]) -> None:
+    """
+    Apply changes of tracked minutes given as (task_id, user_id,
+    entered_on, minutes) to the projects of the tasks.
+    """
+    from api.tasks.models import TaskProject
+
+    changes = [change for change in changes if change[3]]
+    if not changes:
+        return
+    projects = defaultdict(list)
+    for task_id, project_id in TaskProject.objects.filter(
+        task_id__in={change[0] for change in changes}
+    ).values_list('task_id', 'project_id'):
+        projects[task_id].append(project_id)
+
+    deltas = Counter()
+    for task_id, user_id, entered_on, minutes in changes:
+        for project_id in projects[task_id]:
+            deltas[(project_id, user_id, entered_on)] += minutes
+    apply_spend(deltas)
+
+
+def _task_entries(tasks, project_field: str):
+    """Tracked minutes of tasks per (project, user, day), grouped in the database."""
+    from api.time_tracking_entries.models import TimeTrackingEntry
+
+    return TimeTrackingEntry.objects.filter(task__in=tasks).values_list(
+        project_field, 'user_id', 'entered_on'
+    ).annotate(minutes=Sum('duration_minutes')).order_by()
+
+
+def memberships_added(memberships: Iterable[Tuple[int, int]]) -> None:
+    """Bring the tracked time of tasks into projects they just joined, given (task_id, project_id) pairs."""
+    projects = defaultdict(list)
+    for task_id, project_id in memberships:
+        projects[task_id].append(project_id)
+    if not projects:
+        return
+    deltas = Counter()
+    for task_id, user_id, entered_on, minutes in _task_entries(list(projects), 'task_id'):
+        for project_id in projects[task_id]:
+            deltas[(project_id, user_id, entered_on)] += minutes
+    apply_spend(deltas)
+
+
+def tasks_removed(tasks) -> None:
+    """Take the tracked time of a queryset of tasks about to be deleted out of their projects."""
+    apply_spend({
+        (project_id, user_id, entered_on): -minutes
+        for project_id, user_id, entered_on, minutes in _task_entries(tasks, 'task__task_projects__project_id')
+        if project_id is not None
+    })
+
+
+def reprice_workspace(workspace_id: int) -> int:
+    """
+    Reprice a workspace's spend rows at the current rates, with one UPDATE
+    per distinct rate in effect. Returns the number of rows updated.
+    """
+    rows = ProjectSpend.objects.filter(project__workspace_id=workspace_id)
+    by_rate = defaultdict(list)
+    for user_id, rate in user_rates(workspace_id, rows.values_list('user_id', flat=True).distinct()).items():
+        by_rate[rate].append(user_id)
+    updated = 0
+    with transaction.atomic():
+        for rate, user_ids in by_rate.items():
+            updated += rows.filter(user_id__in=user_ids).update(cost=F('minutes') * rate / 60)
+    return updated
+
+
+def rebuild_spend() -> int:
+    """Recompute ProjectSpend from the time tracking entries. Returns the number of rows written."""
+    from api.projects.models import Project
+    from api.tasks.models import Task
+
+    with transaction.atomic():
+        ProjectSpend.objects.all().delete()
+        minutes = {
+            (project_id, user_id, entered_on): total
+            for project_id, user_id, entered_on, total in _task_entries(
+                Task.objects.all(), 'task__task_projects__project_id'
+            )
+            if project_id is not None
+        }
+        workspaces = dict(Project.objects.values_list('id', 'workspace_id'))
+        users = defaultdict(set)
+        for project_id, user_id, _ in minutes:
+            users[workspaces[project_id]].add(user_id)
+        rates = {
+            (workspace_id, user_id): rate
+            for workspace_id, user_ids in users.items()
+            for user_id, rate in user_rates(workspace_id, user_ids).items()
+        }
+        ProjectSpend.objects.bulk_create([
+            ProjectSpend(
+                project_id=project_id, user_id=user_id, entered_on=entered_on, minutes=total,
+                cost=total * rates[(workspaces[project_id], user_id)] / 60,
+            )
+            for (project_id, user_id, entered_on), total in minutes.items()
+        ], batch_size=1000)
+    return len(minutes)
+
+
+def _bucket(day: date, interval: str) -> date:
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def burn_down(budget, interval: str = 'week') -> dict:
+    """
+    Spent-to-date, remaining amount and the cumulative spend series of a
+    budget's project, per day, week or month. One grouped query over the
+    project's daily rows.
+    """
+    rows = ProjectSpend.objects.filter(project_id=budget.project_id).values('entered_on').annotate(
+        cost=Sum('cost'), minutes=Sum('minutes')
+    ).order_by('entered_on')
+    buckets = {}
+    for row in rows:
+        bucket = buckets.setdefault(_bucket(row['entered_on'], interval), {'spent': 0.0, 'minutes': 0})
+        bucket['spent'] += row['cost']
+        bucket['minutes'] += row['minutes']
+
+    amount = float(budget.amount) if budget.amount is not None else None
+    series = []
+    spent = 0.0
+    minutes = 0
+    for start_on, bucket in buckets.items():
+        spent += bucket['spent']
+        minutes += bucket['minutes']
+        series.append({
+            'start_on': start_on,
+            'spent': round(bucket['spent'], 2),
+            'minutes': bucket['minutes'],
+            'cumulative': round(spent, 2),
+            'remaining': round(amount - spent, 2) if amount is not None else None,
+        })
+    return {
+        'amount': amount,
+        'currency_code': budget.currency_code,
+        'spent': round(spent, 2),
+        'minutes': minutes,
+        'remaining': round(amount - spent, 2) if amount is not None else None,
+        'percent_spent': round(spent / amount * 100, 2) if amount else None,
+        'interval': interval,
+        'series': series,
+    }
+
+
+def _on_entry_save(sender, instance, created, raw=False, **kwargs):
+    from api.time_tracking_entries.totals import stored_entry
+
+    if raw:
+        return
+    changes = [(instance.task_id, instance.user_id, instance.entered_on, instance.duration_minutes)]
+    previous = stored_entry(instance)
+    if not created and previous is not None:
+        changes.append((previous[0], previous[1], previous[2], -previous[3]))
+    entries_changed(changes)
+
+
+def _on_entry_delete(sender, instance, origin=None, **kwargs):
+    # Only direct deletes of entries; cascades from a task or user are
+    # covered by tasks_removed and the user's own cascade
+    if origin is instance or getattr(origin, 'model', None) is sender:
+        entries_changed([(instance.task_id, instance.user_id, instance.entered_on, -instance.duration_minutes)])
+
+
+def _on_memberships_added(sender, memberships, **kwargs):
+    memberships_added(memberships)
+
+
+def _on_tasks_removed(sender, tasks, **kwargs):
+    tasks_removed(tasks)
+
+
+def _on_rate_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reprice_workspace(instance.workspace_id)
+
+
+def connect_signals() -> None:
+    """Keep project spend current as entries, task memberships and rates change."""
+    from api.rates.models import Rate
+    from api.tasks.counts import task_memberships_added, tasks_removed as tasks_removed_signal
+    from api.time_tracking_entries.models import TimeTrackingEntry
+
+    post_save.connect(_on_entry_save, sender=TimeTrackingEntry, dispatch_uid='budgets.spend.entry_save')
+    post_delete.connect(_on_entry_delete, sender=TimeTrackingEntry, dispatch_uid='budgets.spend.entry_delete')
+    task_memberships_added.connect(_on_memberships_added, dispatch_uid='budgets.spend.memberships')
+    tasks_removed_signal.connect(_on_tasks_removed, dispatch_uid='budgets.spend.tasks_removed')
+    post_save.connect(_on_rate_change, sender=Rate, dispatch_uid='budgets.spend.rate_save')
+    post_delete.connect(_on_rate_change, sender=Rate, dispatch_uid='budgets.spend.rate_delete')
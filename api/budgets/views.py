@@ -3,13 +3,16 @@ Budgets views matching FastAPI behavior exactly.
 Implements all budgets endpoints from FastAPI budgets_api.py
 """
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Budget
+from .spend import INTERVALS, burn_down
 from .serializers import (
     BudgetCompactSerializer,
     BudgetResponseSerializer,
@@ -39,6 +42,8 @@ class BudgetsViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = Budget.objects.all()
+        projection = compile_opt_fields(BudgetCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +51,7 @@ class BudgetsViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = BudgetCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +59,7 @@ class BudgetsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = BudgetCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +83,40 @@ class BudgetsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(BudgetResponseSerializer, opt_fields)
         try:
-            resource = Budget.objects.get(gid=resource_gid)
+            resource = projection.apply(Budget.objects).get(gid=resource_gid)
         except Budget.DoesNotExist:
             return asana_not_found_error('Budget')
         
-        serializer = BudgetResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    @action(detail=True, methods=['get'], url_path='burn')
+    def burn(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /budgets/{budget_gid}/burn
+        Returns the budget's spent-to-date and remaining amount, and its
+        burn-down series: cost of the time tracked on the budget's project
+        per day, week or month, with the cumulative spend.
+        Query params: interval (day, week or month; default week)
+        """
+        resource_gid = pk
+        if not resource_gid:
+            return asana_not_found_error('Budget')
+        
+        interval = request.query_params.get('interval', 'week')
+        if interval not in INTERVALS:
+            return asana_validation_error(f"interval must be one of {', '.join(INTERVALS)}")
+        
+        try:
+            budget = Budget.objects.only('id', 'gid', 'amount', 'currency_code', 'project_id').get(gid=resource_gid)
+        except Budget.DoesNotExist:
+            return asana_not_found_error('Budget')
+        
+        return Response(wrap_single_response(burn_down(budget, interval)))
@@ -0,0 +1,188 @@
+"""
+Filtering and sorting tasks by custom field values, shared by GET /tasks
+and GET /workspaces/{workspace_gid}/tasks/search.
+
+Parameters:
+- custom_fields.{gid}.is_set: true/false
+- custom_fields.{gid}.value: a number, text, YYYY-MM-DD date, or for
+  enum and multi-enum fields comma-separated option gids (any matches)
+- custom_fields.{gid}.less_than / .greater_than: number and date fields
+- custom_fields.{gid}.contains / .starts_with / .ends_with: text fields,
+  case-insensitive
+- sort_by=custom_fields.{gid}: number, text, date and enum fields (enum
+  in the field's option order); tasks without a value sort last
+
+Each filter joins the task to its value row of the field, matched on
+(custom_field, column), so it reads one range of the field's composite
+(custom_field, column, task) index. A task has at most one value row per
+field, so the joins never duplicate tasks. Multi-enum filters and
+is_set=false are semi-joins on the value tables instead. Sorting joins
+the field's value rows with a LEFT JOIN restricted to that field.
+
+Usage:
+    try:
+        custom_fields = CustomFieldQuery(request.query_params, workspace)
+        queryset = custom_fields.filter(queryset)
+        if custom_fields.sort_field:
+            queryset = custom_fields.order_by(queryset, ascending=True)
+    except CustomFieldQueryError as error:
+        return asana_validation_error(str(error))
+"""
+from datetime import date
+from typing import List, Optional, Tuple
+
+from django.db.models import F, FilteredRelation, Q, QuerySet
+
+from .models import CustomField, CustomFieldEnumOption, CustomFieldValue, CustomFieldValueOption
+
+
+PREFIX = 'custom_fields.'
+
+# Operator -> field types it applies to
+OPERATORS = {
+    'is_set': ('number', 'text', 'date', 'enum', 'multi_enum'),
+    'value': ('number', 'text', 'date', 'enum', 'multi_enum'),
+    'less_than': ('number', 'date'),
+    'greater_than': ('number', 'date'),
+    'contains': ('text',),
+    'starts_with': ('text',),
+    'ends_with': ('text',),
+}
+
+# Field types tasks can be sorted by, with the value column to order on
+SORT_COLUMNS = {
+    'number': 'number_value',
+    'text': 'text_value',
+    'date': 'date_value',
+    'enum': 'enum_value__rank',
+}
+
+LOOKUPS = {
+    'value': '',
+    'less_than': '__lt',
+    'greater_than': '__gt',
+    'contains': '__icontains',
+    'starts_with': '__istartswith',
+    'ends_with': '__iendswith',
+}
+
+
+class CustomFieldQueryError(ValueError):
+    """An invalid custom field filter or sort parameter."""
+
+
+class CustomFieldQuery:
+    """
+    The custom field filters and sort of a set of query parameters, with
+    the fields (of `workspace`, when given) and enum options they name
+    resolved in one query each.
+    """
+
+    def __init__(self, params, workspace=None):
+        self.filters: List[Tuple[str, str, str]] = []
+        for key in params:
+            if not key.startswith(PREFIX):
+                continue
+            gid, _, operator = key[len(PREFIX):].rpartition('.')
+            if not gid or operator not in OPERATORS:
+                raise CustomFieldQueryError(
+                    f"{key}: custom field filters are custom_fields.{{gid}}.{{{','.join(OPERATORS)}}}"
+                )
+            self.filters.append((gid, operator, params.get(key)))
+
+        sort_by = params.get('sort_by') or ''
+        sort_gid = sort_by[len(PREFIX):] if sort_by.startswith(PREFIX) else None
+        gids = {gid for gid, _, _ in self.filters} | ({sort_gid} if sort_gid else set())
+        self.fields = {}
+        if gids:
+            fields = CustomField.objects.filter(gid__in=gids)
+            if workspace is not None:
+                fields = fields.filter(workspace=workspace)
+            self.fields = {field.gid: field for field in fields}
+            missing = sorted(gids - self.fields.keys())
+            if missing:
+                raise CustomFieldQueryError(f'Custom field {missing[0]} not found')
+
+        self.sort_field: Optional[CustomField] = self.fields[sort_gid] if sort_gid else None
+        if self.sort_field is not None and self.sort_field.type not in SORT_COLUMNS:
+            raise CustomFieldQueryError(f'Tasks cannot be sorted by {self.sort_field.type} custom fields')
+
+        option_gids = {
+            gid.strip() for field_gid, operator, raw in self.filters
+            if operator == 'value' and self.fields[field_gid].type in ('enum', 'multi_enum')
+            for gid in (raw or '').split(',') if gid.strip()
+        }
+        self.options = {
+            (option.custom_field_id, option.gid): option.pk
+            for option in CustomFieldEnumOption.objects.filter(
+                custom_field__in=list(self.fields.values()), gid__in=option_gids
+            ).only('id', 'gid', 'custom_field_id')
+        } if option_gids else {}
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        """Apply the custom field filters to a Task queryset."""
+        for gid, operator, raw in self.filters:
+            field = self.fields[gid]
+            name = f'{PREFIX}{gid}.{operator}'
+            if field.type not in OPERATORS[operator]:
+                raise CustomFieldQueryError(f'{name} does not apply to {field.type} custom fields')
+            if operator == 'is_set':
+                queryset = self._is_set(queryset, field, name, raw)
+            elif field.type in ('enum', 'multi_enum'):
+                queryset = self._options(queryset, field, name, raw)
+            else:
+                column = f'custom_field_values__{field.type}_value{LOOKUPS[operator]}'
+                queryset = queryset.filter(**{
+                    'custom_field_values__custom_field': field, column: self._typed(field, name, raw),
+                })
+        return queryset
+
+    def order_by(self, queryset: QuerySet, ascending: bool) -> QuerySet:
+        """Order a Task queryset by the sort field, tasks without a value last."""
+        column = F(f'custom_field_sort__{SORT_COLUMNS[self.sort_field.type]}')
+        return queryset.alias(custom_field_sort=FilteredRelation(
+            'custom_field_values', condition=Q(custom_field_values__custom_field=self.sort_field),
+        )).order_by(
+            column.asc(nulls_last=True) if ascending else column.desc(nulls_last=True),
+            'id' if ascending else '-id',
+        )
+
+    @staticmethod
+    def _is_set(queryset: QuerySet, field: CustomField, name: str, raw: str) -> QuerySet:
+        value = (raw or '').lower()
+        if value not in ('true', 'false'):
+            raise CustomFieldQueryError(f'{name} must be true or false')
+        if value == 'true':
+            return queryset.filter(custom_field_values__custom_field=field)
+        return queryset.exclude(id__in=CustomFieldValue.objects.filter(custom_field=field).values('task_id'))
+
+    def _options(self, queryset: QuerySet, field: CustomField, name: str, raw: str) -> QuerySet:
+        option_ids = []
+        for gid in (raw or '').split(','):
+            gid = gid.strip()
+            if not gid:
+                continue
+            if (field.pk, gid) not in self.options:
+                raise CustomFieldQueryError(f'{name}: {gid} is not an option of the custom field')
+            option_ids.append(self.options[(field.pk, gid)])
+        if not option_ids:
+            raise CustomFieldQueryError(f'{name} takes comma-separated enum option gids')
+        if field.type == 'enum':
+            return queryset.filter(custom_field_values__custom_field=field, custom_field_values__enum_value__in=option_ids)
+        return queryset.filter(id__in=CustomFieldValueOption.objects.filter(
+            custom_field=field, enum_option__in=option_ids,
+        ).values('task_id'))
+
+    @staticmethod
+    def _typed(field: CustomField, name: str, raw: str):
+        if field.type == 'number':
+            try:
+                return float(raw)
+            except (TypeError, ValueError):
+                raise CustomFieldQueryError(f'{name} must be a number')
+        if field.type == 'date':
+            try:
+                return date.fromisoformat(raw)
+            except (TypeError, ValueError):
+                raise CustomFieldQueryError(f'{name} must be a date in YYYY-MM-DD format')
+        return raw or ''
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '__first__'),
+        ('custom_fields', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomFieldValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number_value', models.FloatField(blank=True, help_text='Value of a number custom field.', null=True)),
+                ('text_value', models.CharField(blank=True, help_text='Value of a text custom field.', max_length=1024, null=True)),
+                ('date_value', models.DateField(blank=True, help_text='Value of a date custom field.', null=True)),
+                ('custom_field', models.ForeignKey(help_text='The custom field this value is for.', on_delete=django.db.models.deletion.CASCADE, related_name='values', to='custom_fields.customfield')),
+                ('enum_value', models.ForeignKey(blank=True, help_text='Selected option of an enum custom field.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='values', to='custom_fields.customfieldenumoption')),
+                ('task', models.ForeignKey(help_text='The task this value belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='custom_field_values', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'custom_field_values',
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomFieldValueOption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('custom_field', models.ForeignKey(help_text='The multi-enum custom field.', on_delete=django.db.models.deletion.CASCADE, related_name='selected_options', to='custom_fields.customfield')),
+                ('enum_option', models.ForeignKey(help_text='The selected option.', on_delete=django.db.models.deletion.CASCADE, related_name='selections', to='custom_fields.customfieldenumoption')),
+                ('task', models.ForeignKey(help_text='The task this selection belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='custom_field_options', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'custom_field_value_options',
+                'indexes': [models.Index(fields=['custom_field', 'enum_option', 'task'], name='cf_value_option_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='customfieldvalueoption',
+            constraint=models.UniqueConstraint(fields=('task', 'custom_field', 'enum_option'), name='custom_field_value_option_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='customfieldvalue',
+            index=models.Index(fields=['custom_field', 'number_value', 'task'], name='cf_value_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customfieldvalue',
+            index=models.Index(fields=['custom_field', 'text_value', 'task'], name='cf_value_text_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customfieldvalue',
+            index=models.Index(fields=['custom_field', 'date_value', 'task'], name='cf_value_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customfieldvalue',
+            index=models.Index(fields=['custom_field', 'enum_value', 'task'], name='cf_value_enum_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='customfieldvalue',
+            constraint=models.UniqueConstraint(fields=('task', 'custom_field'), name='custom_field_value_uniq'),
+        ),
+    ]
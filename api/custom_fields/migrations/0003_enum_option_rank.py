@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:42
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+from common.ranking import keys_between
+
+
+def rank_options(apps, schema_editor):
+    # Keep the order options were listed in until now: by name
+    Option = apps.get_model('custom_fields', 'CustomFieldEnumOption')
+    options = Option.objects.order_by('custom_field_id', 'name', 'id').only('id', 'custom_field_id')
+    ranked = []
+    for _, group in groupby(options.iterator(), key=lambda option: option.custom_field_id):
+        group = list(group)
+        for option, key in zip(group, keys_between(None, None, len(group))):
+            option.rank = key
+            ranked.append(option)
+    Option.objects.bulk_update(ranked, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_fields', '0002_custom_field_values'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='customfieldenumoption',
+            options={'ordering': ['rank', 'id']},
+        ),
+        migrations.RemoveField(
+            model_name='customfieldenumoption',
+            name='insert_after',
+        ),
+        migrations.RemoveField(
+            model_name='customfieldenumoption',
+            name='insert_before',
+        ),
+        migrations.AddField(
+            model_name='customfieldenumoption',
+            name='rank',
+            field=models.CharField(default='', help_text='Fractional sort key of the option within its custom field (see common.ranking).', max_length=255),
+        ),
+        migrations.RunPython(rank_options, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='customfieldenumoption',
+            index=models.Index(fields=['custom_field', 'rank'], name='cf_enum_option_rank_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ Custom Field models matching FastAPI Pydantic models.
 from django.db import models
 import uuid
 from common.models import generate_gid
+from common.ranking import place
 
 
 class CustomField(models.Model):
@@ -95,26 +96,121 @@ class CustomFieldEnumOption(models.Model):
         blank=True,
         help_text="Color of the enum option."
     )
-    insert_before = models.ForeignKey(
-        'self',
-        on_delete=models.SET_NULL,
+    rank = models.CharField(
+        max_length=255,
+        default='',
+        help_text="Fractional sort key of the option within its custom field (see common.ranking)."
+    )
+
+    class Meta:
+        db_table = 'custom_field_enum_options'
+        ordering = ['rank', 'id']
+        indexes = [
+            # A custom field's options ORDER BY rank
+            models.Index(fields=['custom_field', 'rank'], name='cf_enum_option_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.custom_field.name} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        # New options go to the end of their custom field
+        if not self.rank:
+            self.rank = place(
+                CustomFieldEnumOption.objects.filter(custom_field_id=self.custom_field_id), pk=self.pk
+            )
+        super().save(*args, **kwargs)
+
+
+class CustomFieldValue(models.Model):
+    """
+    A task's value of a custom field, stored in the column of the field's
+    type (see api.custom_fields.values). A multi-enum value is this row
+    plus one CustomFieldValueOption per selected option.
+    """
+    task = models.ForeignKey(
+        'tasks.Task',
+        on_delete=models.CASCADE,
+        related_name='custom_field_values',
+        help_text="The task this value belongs to."
+    )
+    custom_field = models.ForeignKey(
+        CustomField,
+        on_delete=models.CASCADE,
+        related_name='values',
+        help_text="The custom field this value is for."
+    )
+    number_value = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Value of a number custom field."
+    )
+    text_value = models.CharField(
+        max_length=1024,
         null=True,
         blank=True,
-        related_name='inserted_after',
-        help_text="The enum option to insert before."
+        help_text="Value of a text custom field."
     )
-    insert_after = models.ForeignKey(
-        'self',
-        on_delete=models.SET_NULL,
+    date_value = models.DateField(
         null=True,
         blank=True,
-        related_name='inserted_before',
-        help_text="The enum option to insert after."
+        help_text="Value of a date custom field."
+    )
+    enum_value = models.ForeignKey(
+        CustomFieldEnumOption,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='values',
+        help_text="Selected option of an enum custom field."
     )
 
     class Meta:
-        db_table = 'custom_field_enum_options'
-        ordering = ['name']
+        db_table = 'custom_field_values'
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'custom_field'], name='custom_field_value_uniq'),
+        ]
+        indexes = [
+            # Filtering and sorting tasks by a custom field: one index range
+            # per field, covering the task id
+            models.Index(fields=['custom_field', 'number_value', 'task'], name='cf_value_number_idx'),
+            models.Index(fields=['custom_field', 'text_value', 'task'], name='cf_value_text_idx'),
+            models.Index(fields=['custom_field', 'date_value', 'task'], name='cf_value_date_idx'),
+            models.Index(fields=['custom_field', 'enum_value', 'task'], name='cf_value_enum_idx'),
+        ]
 
-    def __str__(self):
-        return f"{self.custom_field.name} - {self.name}"
+
+class CustomFieldValueOption(models.Model):
+    """
+    One selected option of a task's multi-enum custom field value.
+    """
+    task = models.ForeignKey(
+        'tasks.Task',
+        on_delete=models.CASCADE,
+        related_name='custom_field_options',
+        help_text="The task this selection belongs to."
+    )
+    custom_field = models.ForeignKey(
+        CustomField,
+        on_delete=models.CASCADE,
+        related_name='selected_options',
+        help_text="The multi-enum custom field."
+    )
+    enum_option = models.ForeignKey(
+        CustomFieldEnumOption,
+        on_delete=models.CASCADE,
+        related_name='selections',
+        help_text="The selected option."
+    )
+
+    class Meta:
+        db_table = 'custom_field_value_options'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'custom_field', 'enum_option'], name='custom_field_value_option_uniq'
+            ),
+        ]
+        indexes = [
+            # Tasks with an option selected, covering the task id
+            models.Index(fields=['custom_field', 'enum_option', 'task'], name='cf_value_option_idx'),
+        ]
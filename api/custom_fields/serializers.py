@@ -3,7 +3,23 @@ CustomFields serializers matching FastAPI/Pydantic models exactly.
 """
 from rest_framework import serializers
 from common.serializers import AsanaResourceSerializer
-from .models import CustomField
+from .models import CustomField, CustomFieldEnumOption
+
+
+class EnumOptionSerializer(serializers.ModelSerializer):
+    """
+    Enum option serializer.
+    Matches EnumOption Pydantic model.
+    """
+    resource_type = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CustomFieldEnumOption
+        fields = ['gid', 'resource_type', 'name', 'enabled', 'color']
+        read_only_fields = ['gid', 'resource_type']
+
+    def get_resource_type(self, obj):
+        return 'enum_option'
 
 
 class CustomFieldCompactSerializer(serializers.ModelSerializer):
@@ -22,7 +38,34 @@ class CustomFieldResponseSerializer(serializers.ModelSerializer):
     CustomField full response serializer.
     Matches CustomFieldResponse Pydantic model.
     """
+    # One query per field, read in rank order through (custom_field, rank)
+    enum_options = EnumOptionSerializer(many=True, read_only=True)
+
     class Meta:
         model = CustomField
         fields = '__all__'
         read_only_fields = ['gid', 'resource_type']
+
+
+class CreateEnumOptionRequestSerializer(serializers.Serializer):
+    """
+    Create enum option request serializer.
+    Matches CreateEnumOptionForCustomFieldRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    name = serializers.CharField(required=False, allow_null=True)
+    color = serializers.CharField(required=False, allow_null=True)
+    enabled = serializers.BooleanField(required=False, allow_null=True)
+    insert_before = serializers.CharField(required=False, allow_null=True)
+    insert_after = serializers.CharField(required=False, allow_null=True)
+
+
+class InsertEnumOptionRequestSerializer(serializers.Serializer):
+    """
+    Reorder enum option request serializer.
+    Matches InsertEnumOptionForCustomFieldRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    enum_option = serializers.CharField(required=False, allow_null=True)
+    before_enum_option = serializers.CharField(required=False, allow_null=True)
+    after_enum_option = serializers.CharField(required=False, allow_null=True)
@@ -0,0 +1,244 @@
+"""
+Typed custom field values of tasks.
+
+A task's value of a custom field is one CustomFieldValue row holding the
+value in the column of the field's type:
+- number: number_value (a JSON number),
+- text: text_value (a string of up to 1024 characters),
+- date: date_value ("YYYY-MM-DD", or {"date": "YYYY-MM-DD"} as Asana
+  returns it),
+- enum: enum_value (the gid of an enabled option of the field),
+- multi_enum: one CustomFieldValueOption row per selected option (a list
+  of option gids), next to the value row.
+A null value, or an empty multi-enum list, clears the value: unset fields
+have no row, so a field is set exactly when its task has a row.
+
+Task payloads carry values as `custom_fields`: {custom field gid: value}.
+ValueWriter resolves every field and option gid of many payloads with one
+query per resource type, validates each payload on its own (so bulk
+requests fail per item) and writes them all with one delete and one
+bulk_create per table.
+
+Values of a page of tasks are loaded with one query per table by
+load_task_values, and rendered as Asana custom field resources.
+
+Usage:
+    set_task_values([(task, {'1201': 42, '1202': '1301'})])
+    load_task_values([task.pk])   # {task_id: [{'gid': '1201', 'number_value': 42.0, ...}]}
+"""
+import math
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.db import transaction
+
+from .models import CustomField, CustomFieldEnumOption, CustomFieldValue, CustomFieldValueOption
+
+
+# Custom field types whose values can be stored
+VALUE_TYPES = ('number', 'text', 'date', 'enum', 'multi_enum')
+
+TEXT_VALUE_LENGTH = CustomFieldValue._meta.get_field('text_value').max_length
+
+# (custom field, typed value) pairs of one task's payload
+CleanValues = List[Tuple[CustomField, Any]]
+
+
+class CustomFieldValueError(ValueError):
+    """An invalid custom field value in a task payload."""
+
+
+def parse_date(value) -> date:
+    """A date value given as "YYYY-MM-DD" or {"date": "YYYY-MM-DD"}."""
+    if isinstance(value, dict):
+        value = value.get('date')
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise CustomFieldValueError('Date custom field values must be dates in YYYY-MM-DD format')
+
+
+class ValueWriter:
+    """
+    Custom fields and enum options referenced by a set of
+    {custom field gid: value} payloads, loaded with one query per type.
+    """
+
+    def __init__(self, payloads: Iterable[Any]):
+        field_gids, option_gids = set(), set()
+        for values in payloads:
+            if not isinstance(values, dict):
+                continue
+            field_gids.update(values)
+            for value in values.values():
+                if isinstance(value, str):
+                    option_gids.add(value)
+                elif isinstance(value, list):
+                    option_gids.update(gid for gid in value if isinstance(gid, str))
+        self.fields = {
+            field.gid: field for field in CustomField.objects.filter(gid__in=field_gids)
+        } if field_gids else {}
+        self.options = {
+            (option.custom_field_id, option.gid): option
+            for option in CustomFieldEnumOption.objects.filter(
+                custom_field__in=[field for field in self.fields.values() if field.type in ('enum', 'multi_enum')],
+                gid__in=option_gids,
+            )
+        } if option_gids and self.fields else {}
+
+    def clean(self, workspace_id: int, values: Any) -> CleanValues:
+        """Validate one payload for a task of a workspace. Raises CustomFieldValueError."""
+        if not isinstance(values, dict):
+            raise CustomFieldValueError('custom_fields must be an object of custom field gids to values')
+        cleaned = []
+        for gid, value in values.items():
+            field = self.fields.get(gid)
+            if field is None or field.workspace_id != workspace_id:
+                raise CustomFieldValueError(f"Custom field {gid} not found in the task's workspace")
+            if field.type not in VALUE_TYPES:
+                raise CustomFieldValueError(f'Values of {field.type} custom fields cannot be set')
+            cleaned.append((field, None if value is None else self._typed(field, value)))
+        return cleaned
+
+    def _typed(self, field: CustomField, value):
+        if field.type == 'number':
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise CustomFieldValueError(f'Custom field {field.gid} takes a number')
+            return float(value)
+        if field.type == 'text':
+            if not isinstance(value, str) or len(value) > TEXT_VALUE_LENGTH:
+                raise CustomFieldValueError(
+                    f'Custom field {field.gid} takes a string of up to {TEXT_VALUE_LENGTH} characters'
+                )
+            return value
+        if field.type == 'date':
+            return parse_date(value)
+        if field.type == 'enum':
+            return self._option(field, value)
+        if not isinstance(value, list):
+            raise CustomFieldValueError(f'Custom field {field.gid} takes a list of enum option gids')
+        return list({option.pk: option for option in (self._option(field, gid) for gid in value)}.values())
+
+    def _option(self, field: CustomField, gid) -> CustomFieldEnumOption:
+        option = self.options.get((field.pk, gid)) if isinstance(gid, str) else None
+        if option is None or not option.enabled:
+            raise CustomFieldValueError(f'{gid} is not an enabled option of custom field {field.gid}')
+        return option
+
+    @staticmethod
+    def write(changes: Iterable[Tuple[int, CleanValues]]) -> None:
+        """
+        Replace the values of cleaned payloads, given (task_id, cleaned)
+        pairs, with one delete per custom field and one bulk_create per
+        table. A later value of the same task and field wins.
+        """
+        latest = {}
+        for task_id, cleaned in changes:
+            for field, value in cleaned:
+                latest[(task_id, field.pk)] = (field, value)
+
+        tasks_by_field = defaultdict(set)
+        rows, selections = [], []
+        for (task_id, _), (field, value) in latest.items():
+            tasks_by_field[field.pk].add(task_id)
+            if value is None or value == []:
+                continue
+            row = CustomFieldValue(task_id=task_id, custom_field=field)
+            if field.type == 'multi_enum':
+                selections.extend(
+                    CustomFieldValueOption(task_id=task_id, custom_field=field, enum_option=option)
+                    for option in value
+                )
+            else:
+                setattr(row, f'{field.type}_value', value)
+            rows.append(row)
+        if not tasks_by_field:
+            return
+
+        with transaction.atomic():
+            for field_id, task_ids in tasks_by_field.items():
+                CustomFieldValue.objects.filter(custom_field_id=field_id, task_id__in=task_ids).delete()
+                CustomFieldValueOption.objects.filter(custom_field_id=field_id, task_id__in=task_ids).delete()
+            CustomFieldValue.objects.bulk_create(rows, batch_size=500)
+            CustomFieldValueOption.objects.bulk_create(selections, batch_size=500)
+
+
+def set_task_values(changes: Iterable[Tuple[Any, Any]]) -> None:
+    """
+    Set custom field values of tasks from (task, {custom field gid: value})
+    pairs. Raises CustomFieldValueError, writing nothing, if any payload is
+    invalid.
+    """
+    changes = list(changes)
+    writer = ValueWriter(values for _, values in changes)
+    writer.write([(task.pk, writer.clean(task.workspace_id, values)) for task, values in changes])
+
+
+def _number(value: float):
+    return int(value) if value.is_integer() else value
+
+
+def _option_resource(option: CustomFieldEnumOption) -> dict:
+    return {
+        'gid': option.gid,
+        'resource_type': 'enum_option',
+        'name': option.name,
+        'enabled': option.enabled,
+        'color': option.color,
+    }
+
+
+def load_task_values(task_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """
+    Custom field values of tasks as Asana custom field resources, ordered
+    by field name, with one query per table.
+    """
+    task_ids = list(task_ids)
+    rows = list(
+        CustomFieldValue.objects.filter(task_id__in=task_ids)
+        .select_related('custom_field', 'enum_value')
+        .order_by('custom_field__name', 'custom_field_id')
+    )
+    selected = defaultdict(list)
+    if any(row.custom_field.type == 'multi_enum' for row in rows):
+        options = (
+            CustomFieldValueOption.objects.filter(task_id__in=task_ids)
+            .select_related('enum_option')
+            .order_by('enum_option__rank', 'enum_option_id')
+        )
+        for selection in options:
+            selected[(selection.task_id, selection.custom_field_id)].append(selection.enum_option)
+
+    values = defaultdict(list)
+    for row in rows:
+        field = row.custom_field
+        resource = {
+            'gid': field.gid,
+            'resource_type': 'custom_field',
+            'name': field.name,
+            'type': field.type,
+            'resource_subtype': field.type,
+        }
+        if field.type == 'number':
+            number = None if row.number_value is None else _number(row.number_value)
+            resource.update(number_value=number, display_value=None if number is None else str(number))
+        elif field.type == 'text':
+            resource.update(text_value=row.text_value, display_value=row.text_value)
+        elif field.type == 'date':
+            day = row.date_value.isoformat() if row.date_value else None
+            resource.update(date_value={'date': day, 'date_time': None} if day else None, display_value=day)
+        elif field.type == 'enum':
+            option = row.enum_value
+            resource.update(
+                enum_value=_option_resource(option) if option else None,
+                display_value=option.name if option else None,
+            )
+        elif field.type == 'multi_enum':
+            options = selected[(row.task_id, field.pk)]
+            resource.update(
+                multi_enum_values=[_option_resource(option) for option in options],
+                display_value=', '.join(option.name for option in options) or None,
+            )
+        values[row.task_id].append(resource)
+    return values
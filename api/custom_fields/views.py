@@ -3,16 +3,23 @@ CustomFields views matching FastAPI behavior exactly.
 Implements all custom_fields endpoints from FastAPI custom_fields_api.py
 """
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
+from django.db import transaction
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
-from .models import CustomField
+from common.ranking import place
+from .models import CustomField, CustomFieldEnumOption
 from .serializers import (
     CustomFieldCompactSerializer,
     CustomFieldResponseSerializer,
+    EnumOptionSerializer,
+    CreateEnumOptionRequestSerializer,
+    InsertEnumOptionRequestSerializer,
 )
 
 
@@ -39,6 +46,8 @@ class CustomFieldsViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = CustomField.objects.all()
+        projection = compile_opt_fields(CustomFieldCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +55,7 @@ class CustomFieldsViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = CustomFieldCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +63,7 @@ class CustomFieldsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = CustomFieldCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +87,135 @@ class CustomFieldsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(CustomFieldResponseSerializer, opt_fields)
         try:
-            resource = CustomField.objects.get(gid=resource_gid)
+            resource = projection.apply(CustomField.objects).get(gid=resource_gid)
         except CustomField.DoesNotExist:
             return asana_not_found_error('CustomField')
         
-        serializer = CustomFieldResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    @action(detail=True, methods=['post'], url_path='enum_options')
+    def create_enum_option(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /custom_fields/{custom_field_gid}/enum_options
+        Creates an enum option, at the end of the custom field's options
+        or next to insert_before/insert_after.
+        """
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        serializer = CreateEnumOptionRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        try:
+            custom_field = CustomField.objects.get(gid=pk)
+        except CustomField.DoesNotExist:
+            return asana_not_found_error('CustomField')
+        if custom_field.type not in ('enum', 'multi_enum'):
+            return asana_validation_error('Only enum and multi_enum custom fields have enum options')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        name = data_dict.get('name') or request_data.get('name')
+        color = data_dict.get('color') or request_data.get('color')
+        enabled = data_dict.get('enabled', request_data.get('enabled'))
+        insert_before = data_dict.get('insert_before') or request_data.get('insert_before')
+        insert_after = data_dict.get('insert_after') or request_data.get('insert_after')
+        
+        if not name:
+            return asana_validation_error('Enum option name is required')
+        if insert_before and insert_after:
+            return asana_validation_error('Provide only one of insert_before or insert_after')
+        
+        options = CustomFieldEnumOption.objects.filter(custom_field=custom_field)
+        anchor_gid = insert_before or insert_after
+        anchor_id = None
+        if anchor_gid:
+            anchor_id = options.filter(gid=anchor_gid).values_list('id', flat=True).first()
+            if anchor_id is None:
+                return asana_validation_error('insert_before/insert_after must be an option of this custom field')
+        
+        with transaction.atomic():
+            option = CustomFieldEnumOption(
+                custom_field=custom_field, name=name, color=color,
+                enabled=True if enabled is None else bool(enabled),
+            )
+            if anchor_id is not None:
+                option.rank = place(options, anchor_pk=anchor_id, before=bool(insert_before))
+            option.save()
+        
+        data = compile_opt_fields(EnumOptionSerializer, opt_fields).serializer(option).data
+        if opt_fields:
+            data = apply_opt_fields(data, opt_fields)
+        
+        return Response(wrap_single_response(data), status=201)
+    
+    @action(detail=True, methods=['post'], url_path='enum_options/insert')
+    def insert_enum_option(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /custom_fields/{custom_field_gid}/enum_options/insert
+        Moves an enum option before or after another option of the custom
+        field (to the end without either). Only the moved option's row is
+        written.
+        """
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        serializer = InsertEnumOptionRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        try:
+            custom_field = CustomField.objects.get(gid=pk)
+        except CustomField.DoesNotExist:
+            return asana_not_found_error('CustomField')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        option_gid = data_dict.get('enum_option') or request_data.get('enum_option')
+        before_gid = data_dict.get('before_enum_option') or request_data.get('before_enum_option')
+        after_gid = data_dict.get('after_enum_option') or request_data.get('after_enum_option')
+        
+        if not option_gid:
+            return asana_validation_error('enum_option is required')
+        if before_gid and after_gid:
+            return asana_validation_error('Provide only one of before_enum_option or after_enum_option')
+        
+        options = CustomFieldEnumOption.objects.filter(custom_field=custom_field)
+        try:
+            option = options.get(gid=option_gid)
+        except CustomFieldEnumOption.DoesNotExist:
+            return asana_not_found_error('EnumOption')
+        
+        anchor_gid = before_gid or after_gid
+        anchor_id = None
+        if anchor_gid:
+            anchor_id = options.filter(gid=anchor_gid).exclude(pk=option.pk).values_list('id', flat=True).first()
+            if anchor_id is None:
+                return asana_validation_error(
+                    'before_enum_option/after_enum_option must be another option of this custom field'
+                )
+        
+        with transaction.atomic():
+            option.rank = place(options, pk=option.pk, anchor_pk=anchor_id, before=bool(before_gid))
+            option.save(update_fields=['rank'])
+        
+        data = compile_opt_fields(EnumOptionSerializer, opt_fields).serializer(option).data
+        if opt_fields:
+            data = apply_opt_fields(data, opt_fields)
+        
+        return Response(wrap_single_response(data))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.events'
+
+    def ready(self):
+        from .capture import connect_signals
+        connect_signals()
@@ -0,0 +1,218 @@
+"""
+Change capture for the event stream.
+
+Saves and deletes of tasks, projects, sections, stories and tags are
+recorded as Event rows (added/changed/deleted). Events are not written one
+by one: inside a transaction they are buffered and written just before it
+commits, in the same transaction, so a change and its events commit or
+roll back together. Changes made outside a transaction are buffered until
+the response is ready (or the capture_events block exits). Either way the
+events are written with a single bulk_create, with sequence numbers
+reserved in one block per workspace, and events_written is sent once they
+are committed.
+
+Usage:
+    # Automatic, through model signals (connected in EventsConfig.ready)
+    task.save()
+
+    # Explicit, for code paths that bypass signals (bulk_create, update())
+    emit_many('changed', tasks)
+
+    # Group writes outside a request into one insert
+    with capture_events():
+        ...
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+from common.transactions import defer_before_commit
+
+
+# Captured models, mapped to the foreign key that points at their parent
+# resource (None when the model carries its own workspace_id)
+CAPTURED_MODELS = {
+    'tasks.Task': None,
+    'projects.Project': None,
+    'tags.Tag': None,
+    'sections.Section': ('project_id', 'projects.Project'),
+    'stories.Story': ('task_id', 'tasks.Task'),
+}
+
+# Sent once the rows written by a flush are committed, with `events`
+# (the saved Event instances)
+events_written = Signal()
+
+_state = threading.local()
+
+
+def capture_enabled() -> bool:
+    """Return True if change capture is turned on in settings."""
+    return getattr(settings, 'EVENT_CAPTURE_ENABLED', True)
+
+
+def _pending_event(action: str, instance) -> dict:
+    """
+    Snapshot what the Event row needs from an instance at emit time.
+    Parent and workspace lookups are deferred to the flush.
+    """
+    label = instance._meta.label
+    resource = {'gid': instance.gid, 'resource_type': instance.resource_type}
+    name = getattr(instance, 'name', None)
+    if name is not None:
+        resource['name'] = name
+
+    parent_ref = None
+    parent_spec = CAPTURED_MODELS.get(label)
+    if parent_spec is not None:
+        attname, parent_label = parent_spec
+        parent_id = getattr(instance, attname)
+        if parent_id is not None:
+            parent_ref = (parent_label, parent_id)
+
+    return {
+        'action': action,
+        'resource': resource,
+        'key': (label, instance.pk),
+        'workspace_id': getattr(instance, 'workspace_id', None),
+        'parent_ref': parent_ref,
+    }
+
+
+def emit(action: str, instance) -> None:
+    """
+    Record an event for one instance of a captured model.
+    """
+    emit_many(action, [instance])
+
+
+def emit_many(action: str, instances: Iterable) -> None:
+    """
+    Record an event for each instance. Events are written just before the
+    current transaction commits, or by the enclosing capture scope (or
+    immediately) when there is no transaction.
+    """
+    if not capture_enabled():
+        return
+    events = [_pending_event(action, instance) for instance in instances]
+    if not events:
+        return
+
+    if transaction.get_connection().in_atomic_block:
+        defer_before_commit('events', events, write_events)
+    else:
+        _deliver(events)
+
+
+def _deliver(events: List[dict]) -> None:
+    """Hand events of autocommitted changes to the enclosing capture scope, or write them."""
+    scope = getattr(_state, 'scope', None)
+    if scope is not None:
+        scope.extend(events)
+    else:
+        write_events(events)
+
+
+@contextmanager
+def capture_events():
+    """
+    Buffer events of changes made outside a transaction until the block
+    exits and write them together. Nested scopes share the outermost
+    buffer.
+    """
+    if getattr(_state, 'scope', None) is not None:
+        yield
+        return
+    _state.scope = []
+    try:
+        yield
+    finally:
+        events, _state.scope = _state.scope, None
+        write_events(events)
+
+
+def _resolve_parents(events: List[dict]) -> Dict[Tuple[str, int], Tuple[str, str, Optional[int]]]:
+    """
+    Map (model label, pk) -> (gid, resource_type, workspace_id) for every
+    parent referenced by the events, with one query per parent model.
+    Parents captured in the same batch (e.g. deleted by the same cascade)
+    are taken from the batch itself.
+    """
+    resolved = {
+        event['key']: (event['resource']['gid'], event['resource']['resource_type'], event['workspace_id'])
+        for event in events
+    }
+    missing = defaultdict(set)
+    for event in events:
+        ref = event['parent_ref']
+        if ref is not None and ref not in resolved:
+            missing[ref[0]].add(ref[1])
+
+    for label, ids in missing.items():
+        model = apps.get_model(label)
+        rows = model.objects.filter(pk__in=ids).values_list('pk', 'gid', 'resource_type', 'workspace_id')
+        for pk, gid, resource_type, workspace_id in rows:
+            resolved[(label, pk)] = (gid, resource_type, workspace_id)
+    return resolved
+
+
+def write_events(events: List[dict]) -> None:
+    """
+    Write pending events with one bulk_create, reserving a block of
+    sequence numbers per workspace. Inside a transaction the rows commit
+    with it; events_written is sent after the commit.
+    """
+    if not events:
+        return
+    from .models import Event, EventSequence
+
+    parents = _resolve_parents(events) if any(e['parent_ref'] for e in events) else {}
+    rows = []
+    by_workspace = defaultdict(list)
+    for event in events:
+        parent = None
+        workspace_id = event['workspace_id']
+        if event['parent_ref'] is not None and event['parent_ref'] in parents:
+            gid, resource_type, workspace_id = parents[event['parent_ref']]
+            parent = {'gid': gid, 'resource_type': resource_type}
+        row = Event(
+            action=event['action'],
+            resource=event['resource'],
+            parent=parent,
+            workspace_id=workspace_id,
+        )
+        rows.append(row)
+        if workspace_id is not None:
+            by_workspace[workspace_id].append(row)
+
+    with transaction.atomic():
+        for workspace_id, workspace_rows in by_workspace.items():
+            first = EventSequence.reserve(workspace_id, len(workspace_rows))
+            for offset, row in enumerate(workspace_rows):
+                row.sequence = first + offset
+        Event.objects.bulk_create(rows)
+        transaction.on_commit(lambda: events_written.send(sender=Event, events=rows))
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    emit('added' if created else 'changed', instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    emit('deleted', instance)
+
+
+def connect_signals() -> None:
+    """Connect change capture to the captured models' save/delete signals."""
+    for label in CAPTURED_MODELS:
+        post_save.connect(_on_save, sender=label, dispatch_uid=f'events.capture.save.{label}')
+        post_delete.connect(_on_delete, sender=label, dispatch_uid=f'events.capture.delete.{label}')
@@ -0,0 +1,19 @@
+"""
+Middleware that writes the events captured during a request in one batch.
+"""
+from .capture import capture_events
+
+
+class EventCaptureMiddleware:
+    """
+    Buffer events of changes autocommitted while handling a request and
+    write them with a single insert once the response is ready. Changes
+    made in a transaction have their events written inside it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_events():
+            return self.get_response(request)
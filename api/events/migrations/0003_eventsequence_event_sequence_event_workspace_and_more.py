@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0001_initial'),
+        ('events', '0002_event_events_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSequence',
+            fields=[
+                ('workspace', models.OneToOneField(help_text='The workspace this counter belongs to.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='event_sequence', serialize=False, to='workspaces.workspace')),
+                ('last_sequence', models.BigIntegerField(default=0, help_text='The last sequence number handed out in this workspace.')),
+            ],
+            options={
+                'db_table': 'event_sequences',
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, help_text="Monotonic position of this event in its workspace's event stream.", null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='workspace',
+            field=models.ForeignKey(blank=True, help_text='The workspace this event belongs to.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='workspaces.workspace'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('workspace', 'sequence'), name='events_workspace_sequence_uniq'),
+        ),
+    ]
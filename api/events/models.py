@@ -1,7 +1,8 @@
 """
 Event models matching FastAPI Pydantic models.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 import uuid
 from common.models import generate_gid
 
@@ -54,10 +55,77 @@ class Event(models.Model):
         related_name='events',
         help_text="The user who triggered the event."
     )
+    workspace = models.ForeignKey(
+        'workspaces.Workspace',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='events',
+        help_text="The workspace this event belongs to."
+    )
+    sequence = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Monotonic position of this event in its workspace's event stream."
+    )
 
     class Meta:
         db_table = 'events'
         ordering = ['-created_at']
+        indexes = [
+            # GET /events ORDER BY created_at DESC
+            models.Index(fields=['created_at'], name='events_created_idx'),
+        ]
+        constraints = [
+            # GET /workspaces/{gid}/events: WHERE workspace_id = ? AND sequence > ?
+            models.UniqueConstraint(fields=['workspace', 'sequence'], name='events_workspace_sequence_uniq'),
+        ]
 
     def __str__(self):
         return f"Event {self.gid} - {self.action}"
+
+
+class EventSequence(models.Model):
+    """
+    Per-workspace event sequence counter.
+
+    Sequence numbers are handed out by incrementing this row, so writers to
+    the same workspace are serialized on it until their transaction commits
+    and readers never see a gap that is filled in later.
+    """
+    workspace = models.OneToOneField(
+        'workspaces.Workspace',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='event_sequence',
+        help_text="The workspace this counter belongs to."
+    )
+    last_sequence = models.BigIntegerField(
+        default=0,
+        help_text="The last sequence number handed out in this workspace."
+    )
+
+    class Meta:
+        db_table = 'event_sequences'
+
+    def __str__(self):
+        return f"Event sequence {self.workspace_id} @ {self.last_sequence}"
+
+    @classmethod
+    def reserve(cls, workspace_id: int, count: int = 1) -> int:
+        """
+        Reserve `count` consecutive sequence numbers for a workspace.
+        Returns the first reserved number. Must be called inside the
+        transaction that writes the events.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(workspace_id=workspace_id).update(
+                last_sequence=F('last_sequence') + count
+            )
+            if not updated:
+                cls.objects.get_or_create(workspace_id=workspace_id)
+                cls.objects.filter(workspace_id=workspace_id).update(
+                    last_sequence=F('last_sequence') + count
+                )
+            last = cls.objects.filter(workspace_id=workspace_id).values_list('last_sequence', flat=True).get()
+        return last - count + 1
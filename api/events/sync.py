@@ -0,0 +1,36 @@
+"""
+Sync tokens for the workspace event stream.
+
+A sync token records the workspace and the last event sequence number the
+client has seen, so the next poll only reads events with a higher sequence.
+"""
+import base64
+import binascii
+import json
+from typing import Optional, Tuple
+
+
+def encode_sync_token(workspace_gid: str, sequence: int) -> str:
+    """
+    Encode a sync token for a workspace positioned after `sequence`.
+    """
+    payload = json.dumps({'workspace': workspace_gid, 'seq': sequence}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_sync_token(token: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Decode a sync token into (workspace_gid, sequence).
+    Returns None if the token is missing or malformed.
+    """
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        workspace_gid = payload['workspace']
+        sequence = payload['seq']
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError):
+        return None
+    if not isinstance(workspace_gid, str) or not isinstance(sequence, int) or sequence < 0:
+        return None
+    return workspace_gid, sequence
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '__first__'),
+        ('goals', '0002_goal_progress'),
+        ('projects', '0002_project_projects_ws_name_idx'),
+        ('goal_relationships', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goalrelationship',
+            name='supporting_goal',
+            field=models.ForeignKey(blank=True, help_text='The supporting goal, when supporting_resource is a goal.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='supported_goal_relationships', to='goals.goal'),
+        ),
+        migrations.AddField(
+            model_name='goalrelationship',
+            name='supporting_progress',
+            field=models.FloatField(default=0, help_text='Last known progress (0 to 1) of the supporting resource.'),
+        ),
+        migrations.AddField(
+            model_name='goalrelationship',
+            name='supporting_project',
+            field=models.ForeignKey(blank=True, help_text='The supporting project, when supporting_resource is a project.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='goal_relationships', to='projects.project'),
+        ),
+        migrations.AddField(
+            model_name='goalrelationship',
+            name='supporting_task',
+            field=models.ForeignKey(blank=True, help_text='The supporting task, when supporting_resource is a task.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='goal_relationships', to='tasks.task'),
+        ),
+    ]
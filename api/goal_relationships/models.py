@@ -10,6 +10,7 @@ class GoalRelationship(models.Model):
     Goal Relationship model matching GoalRelationshipResponse Pydantic model.
     """
     SUPPORTING_RESOURCE_TYPE_CHOICES = [
+        ('goal', 'Goal'),
         ('project', 'Project'),
         ('task', 'Task'),
     ]
@@ -46,6 +47,36 @@ class GoalRelationship(models.Model):
         related_name='goal_relationships',
         help_text="The goal that is being supported."
     )
+    # Typed link to supporting_resource, resolved on save, so the
+    # relationships a resource supports are an indexed lookup
+    supporting_goal = models.ForeignKey(
+        'goals.Goal',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='supported_goal_relationships',
+        help_text="The supporting goal, when supporting_resource is a goal."
+    )
+    supporting_project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='goal_relationships',
+        help_text="The supporting project, when supporting_resource is a project."
+    )
+    supporting_task = models.ForeignKey(
+        'tasks.Task',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='goal_relationships',
+        help_text="The supporting task, when supporting_resource is a task."
+    )
+    supporting_progress = models.FloatField(
+        default=0,
+        help_text="Last known progress (0 to 1) of the supporting resource."
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
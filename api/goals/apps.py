@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.goals'
+
+    def ready(self):
+        from .progress import connect_signals
+        connect_signals()
@@ -0,0 +1,17 @@
+"""
+Recompute goal progress from the goals' supporting goals, projects and tasks.
+"""
+from django.core.management.base import BaseCommand
+
+from api.goals.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the supporting progress of every goal relationship and recompute goal progress. '
+        'Run after rebuild_task_counts, whose project totals it reads.'
+    )
+
+    def handle(self, *args, **options):
+        changed = rebuild_progress()
+        self.stdout.write(f'Updated progress of {changed:,} goals')
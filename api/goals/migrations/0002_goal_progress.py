@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='progress',
+            field=models.FloatField(default=0, help_text="Weighted progress (0 to 1) of the goal's supporting goals, projects and tasks (see api.goals.progress)."),
+        ),
+    ]
@@ -52,6 +52,10 @@ class Goal(models.Model):
         default=False,
         help_text="True if the goal is liked by the authorized user."
     )
+    progress = models.FloatField(
+        default=0,
+        help_text="Weighted progress (0 to 1) of the goal's supporting goals, projects and tasks (see api.goals.progress)."
+    )
     status = models.CharField(
         max_length=50,
         default='green',
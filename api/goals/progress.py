@@ -0,0 +1,265 @@
+"""
+Goal progress propagation.
+
+A goal's progress is the weighted average of the progress of the
+resources supporting it through GoalRelationship rows (weight:
+contribution_weight, 1 when unset):
+- a task counts 1 when completed, else 0,
+- a project counts its completed share of tasks (api.tasks.counts),
+- a goal counts its own progress.
+Goals without supporting resources keep their stored progress.
+
+Each relationship stores the last known progress of its supporting
+resource (supporting_progress) and each goal its own (Goal.progress), so
+reads never recurse. When a resource changes, the relationships it
+supports are updated and only the goals above it are recomputed: their
+ancestors are collected along the supported-goal DAG, ordered so every
+goal comes after the goals supporting it, and each is computed once from
+one load of their relationships. Propagation stops at goals whose progress
+did not change.
+
+Usage:
+    goals_changed([goal.pk])           # after editing a goal's inputs
+    rebuild_progress()                 # recompute everything
+"""
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from common.transactions import defer_to_commit
+from .models import Goal
+
+
+# Progress changes smaller than this do not propagate further
+PROGRESS_EPSILON = 1e-9
+
+
+def _relationship_model():
+    from api.goal_relationships.models import GoalRelationship
+    return GoalRelationship
+
+
+def task_progress(completed: bool) -> float:
+    return 1.0 if completed else 0.0
+
+
+def project_progress(project_ids: Iterable[int]) -> Dict[int, float]:
+    """Completed share of each project's tasks, from the maintained counts."""
+    from api.tasks.models import ProjectTaskCount
+
+    progress = dict.fromkeys(project_ids, 0.0)
+    counts = ProjectTaskCount.objects.filter(project_id__in=list(progress), section__isnull=True).values_list(
+        'project_id', 'num_tasks', 'num_completed_tasks'
+    )
+    for project_id, num_tasks, num_completed_tasks in counts:
+        progress[project_id] = num_completed_tasks / num_tasks if num_tasks else 0.0
+    return progress
+
+
+def weighted_progress(inputs: Iterable) -> Optional[float]:
+    """Weighted average of (weight, progress) pairs; None when there are none."""
+    inputs = list(inputs)
+    if not inputs:
+        return None
+    total = sum(1.0 if weight is None else weight for weight, _ in inputs)
+    if total <= 0:
+        return 0.0
+    return sum((1.0 if weight is None else weight) * progress for weight, progress in inputs) / total
+
+
+def link_supporting_resource(relationship) -> None:
+    """
+    Fill the typed supporting_* link and supporting_progress of a
+    relationship from its supporting_resource {gid, resource_type}.
+    """
+    from api.projects.models import Project
+    from api.tasks.models import Task
+
+    resource = relationship.supporting_resource or {}
+    gid, resource_type = resource.get('gid'), resource.get('resource_type')
+    if gid and not (relationship.supporting_goal_id or relationship.supporting_project_id
+                    or relationship.supporting_task_id):
+        if resource_type == 'goal':
+            relationship.supporting_goal = Goal.objects.filter(gid=gid).first()
+        elif resource_type == 'project':
+            relationship.supporting_project = Project.objects.filter(gid=gid).first()
+        elif resource_type == 'task':
+            relationship.supporting_task = Task.objects.filter(gid=gid).first()
+
+    if relationship.supporting_goal_id:
+        relationship.supporting_progress = relationship.supporting_goal.progress
+    elif relationship.supporting_project_id:
+        relationship.supporting_progress = project_progress([relationship.supporting_project_id])[
+            relationship.supporting_project_id
+        ]
+    elif relationship.supporting_task_id:
+        relationship.supporting_progress = task_progress(relationship.supporting_task.completed)
+
+
+def _ancestors_in_order(goal_ids: Set[int]) -> List[int]:
+    """
+    The goals and every goal they (transitively) support, ordered so each
+    goal follows the goals supporting it. One query per DAG level.
+    """
+    GoalRelationship = _relationship_model()
+    supporting: Dict[int, Set[int]] = defaultdict(set)
+    reached = set(goal_ids)
+    frontier = set(goal_ids)
+    while frontier:
+        edges = GoalRelationship.objects.filter(supporting_goal_id__in=frontier).values_list(
+            'supporting_goal_id', 'supported_goal_id'
+        )
+        frontier = set()
+        for child, parent in edges:
+            supporting[parent].add(child)
+            if parent not in reached:
+                reached.add(parent)
+                frontier.add(parent)
+
+    pending = {goal: len(supporting[goal] & reached) for goal in reached}
+    ready = deque(sorted(goal for goal, count in pending.items() if count == 0))
+    supported: Dict[int, Set[int]] = defaultdict(set)
+    for parent, children in supporting.items():
+        for child in children:
+            supported[child].add(parent)
+    order = []
+    while ready:
+        goal = ready.popleft()
+        order.append(goal)
+        for parent in sorted(supported[goal]):
+            pending[parent] -= 1
+            if pending[parent] == 0:
+                ready.append(parent)
+    # Goals on a support cycle are computed once, after the others
+    order.extend(sorted(reached - set(order)))
+    return order
+
+
+def goals_changed(goal_ids: Iterable[int]) -> int:
+    """
+    Recompute the progress of goals whose inputs changed and propagate it to
+    the goals above them. Returns the number of goals whose progress changed.
+    """
+    GoalRelationship = _relationship_model()
+    goal_ids = set(goal_ids)
+    if not goal_ids:
+        return 0
+
+    with transaction.atomic():
+        order = _ancestors_in_order(goal_ids)
+        # (supporting goal, weight, progress) inputs of each goal, and the
+        # goals each goal supports within this pass
+        inputs: Dict[int, List] = defaultdict(list)
+        supported: Dict[int, Set[int]] = defaultdict(set)
+        rows = GoalRelationship.objects.filter(supported_goal_id__in=order).values_list(
+            'supported_goal_id', 'supporting_goal_id', 'contribution_weight', 'supporting_progress'
+        )
+        for goal_id, supporting_goal_id, weight, progress in rows:
+            inputs[goal_id].append((supporting_goal_id, weight, progress))
+            if supporting_goal_id is not None:
+                supported[supporting_goal_id].add(goal_id)
+        memo = dict(Goal.objects.filter(id__in=order).values_list('id', 'progress'))
+
+        dirty = set(goal_ids)
+        changed: Dict[int, float] = {}
+        for goal_id in order:
+            if goal_id not in dirty or goal_id not in memo:
+                continue
+            # Goal inputs recomputed earlier in this pass use their new value
+            progress = weighted_progress(
+                (weight, changed.get(supporting_goal_id, value)) for supporting_goal_id, weight, value in inputs[goal_id]
+            )
+            if progress is None or abs(progress - memo[goal_id]) <= PROGRESS_EPSILON:
+                continue
+            memo[goal_id] = changed[goal_id] = progress
+            dirty.update(supported[goal_id])
+
+        if changed:
+            Goal.objects.bulk_update([Goal(id=goal_id, progress=value) for goal_id, value in changed.items()], ['progress'])
+            for goal_id, value in changed.items():
+                GoalRelationship.objects.filter(supporting_goal_id=goal_id).update(supporting_progress=value)
+    return len(changed)
+
+
+def _resources_changed(lookup: str, progress: Dict[int, float]) -> None:
+    """Store new progress values of supporting projects or tasks and propagate them."""
+    GoalRelationship = _relationship_model()
+    affected = set()
+    for resource_id, value in progress.items():
+        relationships = GoalRelationship.objects.filter(**{lookup: resource_id}).exclude(supporting_progress=value)
+        affected.update(relationships.values_list('supported_goal_id', flat=True))
+        relationships.update(supporting_progress=value)
+    goals_changed(affected)
+
+
+def projects_changed(project_ids: Iterable[int]) -> None:
+    """Propagate the current progress of projects to the goals they support."""
+    GoalRelationship = _relationship_model()
+    project_ids = set(GoalRelationship.objects.filter(supporting_project_id__in=set(project_ids)).values_list(
+        'supporting_project_id', flat=True
+    ))
+    if project_ids:
+        _resources_changed('supporting_project_id', project_progress(project_ids))
+
+
+def tasks_changed(tasks: Iterable) -> None:
+    """Propagate the completion state of tasks to the goals they support."""
+    _resources_changed('supporting_task_id', {task.pk: task_progress(task.completed) for task in tasks})
+
+
+def rebuild_progress() -> int:
+    """
+    Recompute every relationship's supporting progress and every goal's
+    progress from scratch. Returns the number of goals whose progress
+    changed.
+    """
+    from api.tasks.models import Task
+
+    GoalRelationship = _relationship_model()
+    with transaction.atomic():
+        by_project = project_progress(set(
+            GoalRelationship.objects.filter(supporting_project__isnull=False).values_list('supporting_project_id', flat=True)
+        ))
+        for project_id, value in by_project.items():
+            GoalRelationship.objects.filter(supporting_project_id=project_id).update(supporting_progress=value)
+        for completed in (True, False):
+            GoalRelationship.objects.filter(supporting_task__in=Task.objects.filter(completed=completed)).update(
+                supporting_progress=task_progress(completed)
+            )
+        GoalRelationship.objects.filter(supporting_goal__isnull=False).update(
+            supporting_progress=Subquery(Goal.objects.filter(pk=OuterRef('supporting_goal_id')).values('progress')[:1])
+        )
+        return goals_changed(GoalRelationship.objects.values_list('supported_goal_id', flat=True).distinct())
+
+
+def _on_relationship_pre_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        link_supporting_resource(instance)
+
+
+def _on_relationship_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('goals.progress', [instance.supported_goal_id], goals_changed)
+
+
+def _on_project_counts(sender, deltas, **kwargs):
+    projects_changed(deltas)
+
+
+def _on_task_states(sender, tasks, **kwargs):
+    tasks_changed(tasks)
+
+
+def connect_signals() -> None:
+    """Recompute goal progress as relationships, projects and tasks change."""
+    from api.goal_relationships.models import GoalRelationship
+    from api.tasks.counts import project_task_counts_changed, task_states_changed
+
+    pre_save.connect(_on_relationship_pre_save, sender=GoalRelationship, dispatch_uid='goals.progress.link')
+    post_save.connect(_on_relationship_change, sender=GoalRelationship, dispatch_uid='goals.progress.save')
+    post_delete.connect(_on_relationship_change, sender=GoalRelationship, dispatch_uid='goals.progress.delete')
+    project_task_counts_changed.connect(_on_project_counts, dispatch_uid='goals.progress.projects')
+    task_states_changed.connect(_on_task_states, dispatch_uid='goals.progress.tasks')
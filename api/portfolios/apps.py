@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PortfoliosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.portfolios'
+
+    def ready(self):
+        from .rollups import connect_signals
+        connect_signals()
@@ -0,0 +1,17 @@
+"""
+Rebuild the portfolio progress rollups from the projects each portfolio contains.
+"""
+from django.core.management.base import BaseCommand
+
+from api.portfolios.rollups import rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the portfolio_rollups and portfolio_rollup_projects tables. '
+        'Run after rebuild_task_counts, whose totals they are built from.'
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(f'Rebuilt rollups of {count:,} portfolios')
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_projects_ws_name_idx'),
+        ('portfolios', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioRollup',
+            fields=[
+                ('portfolio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='portfolios.portfolio')),
+                ('num_projects', models.IntegerField(default=0)),
+                ('num_tasks', models.IntegerField(default=0)),
+                ('num_completed_tasks', models.IntegerField(default=0)),
+                ('start_on', models.DateField(blank=True, help_text="Earliest start_on of the portfolio's projects.", null=True)),
+                ('due_on', models.DateField(blank=True, help_text="Latest due_on of the portfolio's projects.", null=True)),
+            ],
+            options={
+                'db_table': 'portfolio_rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='PortfolioRollupProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('num_tasks', models.IntegerField(default=0)),
+                ('num_completed_tasks', models.IntegerField(default=0)),
+                ('start_on', models.DateField(blank=True, null=True)),
+                ('due_on', models.DateField(blank=True, null=True)),
+                ('status_type', models.CharField(blank=True, help_text="status_type of the project's latest status update.", max_length=50, null=True)),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollup_projects', to='portfolios.portfolio')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_rollups', to='projects.project')),
+            ],
+            options={
+                'db_table': 'portfolio_rollup_projects',
+                'indexes': [models.Index(fields=['project', 'portfolio'], name='portfolio_rollup_proj_idx')],
+                'unique_together': {('portfolio', 'project')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PortfolioPortfolio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parent_portfolio_links', to='portfolios.portfolio')),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='child_portfolio_links', to='portfolios.portfolio')),
+            ],
+            options={
+                'db_table': 'portfolio_portfolios',
+                'indexes': [models.Index(fields=['child', 'portfolio'], name='portfolio_portfolios_child_idx')],
+                'unique_together': {('portfolio', 'child')},
+            },
+        ),
+    ]
@@ -153,3 +153,95 @@ class PortfolioProject(models.Model):
     class Meta:
         db_table = 'portfolio_projects'
         unique_together = ['portfolio', 'project']
+
+
+class PortfolioPortfolio(models.Model):
+    """
+    Many-to-many relationship between portfolios and the portfolios nested
+    in them.
+    """
+    portfolio = models.ForeignKey(
+        Portfolio,
+        on_delete=models.CASCADE,
+        related_name='child_portfolio_links'
+    )
+    child = models.ForeignKey(
+        Portfolio,
+        on_delete=models.CASCADE,
+        related_name='parent_portfolio_links'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'portfolio_portfolios'
+        unique_together = ['portfolio', 'child']
+        indexes = [
+            # Portfolios containing a portfolio (rollup propagation upwards)
+            models.Index(fields=['child', 'portfolio'], name='portfolio_portfolios_child_idx'),
+        ]
+
+
+class PortfolioRollup(models.Model):
+    """
+    Maintained progress aggregates of a portfolio over every project it
+    contains, directly or through nested portfolios (see
+    api.portfolios.rollups). Each project counts once.
+    """
+    portfolio = models.OneToOneField(
+        Portfolio,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rollup'
+    )
+    num_projects = models.IntegerField(default=0)
+    num_tasks = models.IntegerField(default=0)
+    num_completed_tasks = models.IntegerField(default=0)
+    start_on = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Earliest start_on of the portfolio's projects."
+    )
+    due_on = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Latest due_on of the portfolio's projects."
+    )
+
+    class Meta:
+        db_table = 'portfolio_rollups'
+
+
+class PortfolioRollupProject(models.Model):
+    """
+    Snapshot of one project's progress within a portfolio rollup: one row
+    per (portfolio, project) for every project the portfolio contains,
+    directly or through nested portfolios.
+    """
+    portfolio = models.ForeignKey(
+        Portfolio,
+        on_delete=models.CASCADE,
+        related_name='rollup_projects'
+    )
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='portfolio_rollups'
+    )
+    num_tasks = models.IntegerField(default=0)
+    num_completed_tasks = models.IntegerField(default=0)
+    start_on = models.DateField(null=True, blank=True)
+    due_on = models.DateField(null=True, blank=True)
+    status_type = models.CharField(
+        max_length=50,
+        null=True,
+        blank=True,
+        help_text="status_type of the project's latest status update."
+    )
+
+    class Meta:
+        db_table = 'portfolio_rollup_projects'
+        unique_together = ['portfolio', 'project']
+        indexes = [
+            # Portfolios reached by a project (delta propagation)
+            models.Index(fields=['project', 'portfolio'], name='portfolio_rollup_proj_idx'),
+        ]
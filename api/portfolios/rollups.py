@@ -0,0 +1,281 @@
+"""
+Portfolio progress rollups.
+
+Every portfolio has a PortfolioRollup row (project count, task and
+completed task counts, earliest start, latest due) and one
+PortfolioRollupProject row per project it contains, directly or through
+nested portfolios, holding that project's task counts, dates and latest
+status. Showing a portfolio's progress reads these rows instead of
+aggregating each project's tasks.
+
+Project-level changes are applied as deltas to every portfolio that
+contains the project:
+- task count changes (api.tasks.counts.project_task_counts_changed) are
+  F() updates of the project's snapshot rows and of the rollups reaching it,
+- project date changes and new status updates rewrite the snapshot rows
+  and recompute the date range of the rollups reaching the project.
+
+Structural changes (a project or portfolio added to or removed from a
+portfolio) rebuild the rollups of that portfolio and of every portfolio
+above it once the transaction commits. rebuild_portfolio_rollups
+recomputes everything.
+
+Usage:
+    rollup = portfolio_rollup(portfolio)
+    rollup['num_completed_tasks'], rollup['projects'][0]['status_type']
+"""
+from typing import Dict, Iterable, List, Set
+
+from django.db import transaction
+from django.db.models import F, Max, Min, OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save
+
+from common.transactions import defer_to_commit
+from .models import Portfolio, PortfolioPortfolio, PortfolioProject, PortfolioRollup, PortfolioRollupProject
+
+
+class PortfolioNestingError(Exception):
+    """A nested portfolio that would contain itself."""
+
+
+def _walk(start: Iterable[int], links, source: str, target: str) -> Set[int]:
+    """Portfolio ids reachable from `start` (inclusive) along PortfolioPortfolio links, one query per level."""
+    reached = set(start)
+    frontier = set(reached)
+    while frontier:
+        frontier = set(links.filter(**{f'{source}__in': frontier}).values_list(target, flat=True)) - reached
+        reached |= frontier
+    return reached
+
+
+def ancestors(portfolio_ids: Iterable[int]) -> Set[int]:
+    """The portfolios and every portfolio that (transitively) contains them."""
+    return _walk(portfolio_ids, PortfolioPortfolio.objects, 'child_id', 'portfolio_id')
+
+
+def descendants(portfolio_ids: Iterable[int]) -> Set[int]:
+    """The portfolios and every portfolio nested in them."""
+    return _walk(portfolio_ids, PortfolioPortfolio.objects, 'portfolio_id', 'child_id')
+
+
+def check_nesting(portfolio: Portfolio, child: Portfolio) -> None:
+    """Raise PortfolioNestingError if nesting `child` in `portfolio` would create a cycle."""
+    if portfolio.pk in descendants([child.pk]):
+        raise PortfolioNestingError('A portfolio cannot contain itself or a portfolio that contains it')
+
+
+def _project_snapshots(project_ids: Iterable[int]) -> Dict[int, dict]:
+    """Current task counts, dates and latest status of projects, in two queries."""
+    from api.projects.models import Project
+    from api.status_updates.models import StatusUpdate
+    from api.tasks.models import ProjectTaskCount
+
+    project_ids = list(project_ids)
+    latest_status = StatusUpdate.objects.filter(parent=OuterRef('pk')).order_by('-created_at', '-id')
+    snapshots = {
+        row['id']: {
+            'start_on': row['start_on'], 'due_on': row['due_on'], 'status_type': row['status_type'],
+            'num_tasks': 0, 'num_completed_tasks': 0,
+        }
+        for row in Project.objects.filter(id__in=project_ids).annotate(
+            status_type=Subquery(latest_status.values('status_type')[:1])
+        ).values('id', 'start_on', 'due_on', 'status_type')
+    }
+    counts = ProjectTaskCount.objects.filter(project_id__in=project_ids, section__isnull=True).values_list(
+        'project_id', 'num_tasks', 'num_completed_tasks'
+    )
+    for project_id, num_tasks, num_completed_tasks in counts:
+        if project_id in snapshots:
+            snapshots[project_id].update(num_tasks=num_tasks, num_completed_tasks=num_completed_tasks)
+    return snapshots
+
+
+def rebuild_rollups(portfolio_ids: Iterable[int]) -> None:
+    """
+    Recompute the rollups of portfolios from their current contents.
+    Callers rebuilding after a structural change pass the ancestors too.
+    """
+    portfolio_ids = set(Portfolio.objects.filter(id__in=set(portfolio_ids)).values_list('id', flat=True))
+    if not portfolio_ids:
+        return
+    with transaction.atomic():
+        # Lock the rollups being rebuilt so concurrent deltas wait for the new rows
+        PortfolioRollup.objects.bulk_create(
+            [PortfolioRollup(portfolio_id=portfolio_id) for portfolio_id in portfolio_ids], ignore_conflicts=True
+        )
+        list(PortfolioRollup.objects.select_for_update().filter(portfolio_id__in=portfolio_ids))
+
+        contents: Dict[int, Set[int]] = {}
+        for portfolio_id in portfolio_ids:
+            nested = descendants([portfolio_id])
+            contents[portfolio_id] = set(
+                PortfolioProject.objects.filter(portfolio_id__in=nested).values_list('project_id', flat=True)
+            )
+        snapshots = _project_snapshots(set().union(*contents.values()))
+
+        PortfolioRollupProject.objects.filter(portfolio_id__in=portfolio_ids).delete()
+        rows = [
+            PortfolioRollupProject(portfolio_id=portfolio_id, project_id=project_id, **snapshots[project_id])
+            for portfolio_id, project_ids in contents.items()
+            for project_id in project_ids if project_id in snapshots
+        ]
+        PortfolioRollupProject.objects.bulk_create(rows, batch_size=1000)
+
+        rollups = []
+        for portfolio_id, project_ids in contents.items():
+            projects = [snapshots[project_id] for project_id in project_ids if project_id in snapshots]
+            starts = [project['start_on'] for project in projects if project['start_on']]
+            dues = [project['due_on'] for project in projects if project['due_on']]
+            rollups.append(PortfolioRollup(
+                portfolio_id=portfolio_id,
+                num_projects=len(projects),
+                num_tasks=sum(project['num_tasks'] for project in projects),
+                num_completed_tasks=sum(project['num_completed_tasks'] for project in projects),
+                start_on=min(starts, default=None),
+                due_on=max(dues, default=None),
+            ))
+        PortfolioRollup.objects.bulk_update(
+            rollups, ['num_projects', 'num_tasks', 'num_completed_tasks', 'start_on', 'due_on']
+        )
+
+
+def rebuild_all() -> int:
+    """Recompute every portfolio rollup. Returns the number of portfolios."""
+    portfolio_ids = list(Portfolio.objects.values_list('id', flat=True))
+    rebuild_rollups(portfolio_ids)
+    return len(portfolio_ids)
+
+
+def _rebuild_with_ancestors(portfolio_ids: List[int]) -> None:
+    rebuild_rollups(ancestors(portfolio_ids))
+
+
+def apply_task_count_deltas(deltas: Dict[int, Dict[str, int]]) -> None:
+    """
+    Add per-project task count changes to the snapshots and rollups of
+    every portfolio containing the projects. Projects in no portfolio cost
+    one UPDATE that matches nothing.
+    """
+    for project_id, changes in deltas.items():
+        updates = {name: F(name) + value for name, value in changes.items() if value}
+        if not updates:
+            continue
+        if PortfolioRollupProject.objects.filter(project_id=project_id).update(**updates):
+            PortfolioRollup.objects.filter(
+                portfolio_id__in=PortfolioRollupProject.objects.filter(project_id=project_id).values('portfolio_id')
+            ).update(**updates)
+
+
+def _refresh_dates(portfolio_ids: Set[int]) -> None:
+    """Recompute the date range of rollups from their project snapshots, one grouped query."""
+    ranges = {
+        row['portfolio_id']: row for row in
+        PortfolioRollupProject.objects.filter(portfolio_id__in=portfolio_ids).values('portfolio_id').annotate(
+            first_start=Min('start_on'), last_due=Max('due_on')
+        ).order_by()
+    }
+    PortfolioRollup.objects.bulk_update([
+        PortfolioRollup(
+            portfolio_id=portfolio_id,
+            start_on=ranges.get(portfolio_id, {}).get('first_start'),
+            due_on=ranges.get(portfolio_id, {}).get('last_due'),
+        )
+        for portfolio_id in portfolio_ids
+    ], ['start_on', 'due_on'])
+
+
+def refresh_projects(project_ids: Iterable[int]) -> None:
+    """
+    Rewrite the dates and latest status in the snapshots of projects, and
+    the date ranges of the rollups containing them.
+    """
+    project_ids = set(project_ids)
+    reaching = set(PortfolioRollupProject.objects.filter(project_id__in=project_ids).values_list(
+        'portfolio_id', flat=True
+    ))
+    if not reaching:
+        return
+    with transaction.atomic():
+        for project_id, snapshot in _project_snapshots(project_ids).items():
+            PortfolioRollupProject.objects.filter(project_id=project_id).update(
+                start_on=snapshot['start_on'], due_on=snapshot['due_on'], status_type=snapshot['status_type'],
+            )
+        _refresh_dates(reaching)
+
+
+def portfolio_rollup(portfolio: Portfolio) -> dict:
+    """
+    Progress of a portfolio and of each project it contains: one read of
+    the rollup row and one of its project snapshots.
+    """
+    rollup = PortfolioRollup.objects.filter(portfolio=portfolio).first()
+    if rollup is None:
+        rebuild_rollups([portfolio.pk])
+        rollup = PortfolioRollup.objects.get(portfolio=portfolio)
+    projects = PortfolioRollupProject.objects.filter(portfolio=portfolio).order_by(
+        'project__name', 'project_id'
+    ).values(
+        'project__gid', 'project__name', 'num_tasks', 'num_completed_tasks', 'start_on', 'due_on', 'status_type'
+    )
+    return {
+        'num_projects': rollup.num_projects,
+        'num_tasks': rollup.num_tasks,
+        'num_completed_tasks': rollup.num_completed_tasks,
+        'completion_ratio': _ratio(rollup.num_completed_tasks, rollup.num_tasks),
+        'start_on': rollup.start_on,
+        'due_on': rollup.due_on,
+        'projects': [
+            {
+                'gid': row['project__gid'],
+                'resource_type': 'project',
+                'name': row['project__name'],
+                'num_tasks': row['num_tasks'],
+                'num_completed_tasks': row['num_completed_tasks'],
+                'completion_ratio': _ratio(row['num_completed_tasks'], row['num_tasks']),
+                'start_on': row['start_on'],
+                'due_on': row['due_on'],
+                'status_type': row['status_type'],
+            }
+            for row in projects
+        ],
+    }
+
+
+def _ratio(completed: int, total: int) -> float:
+    return round(completed / total, 4) if total else 0.0
+
+
+def _on_task_counts(sender, deltas, **kwargs):
+    apply_task_count_deltas(deltas)
+
+
+def _on_membership_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('portfolios.rollups', [instance.portfolio_id], _rebuild_with_ancestors)
+
+
+def _on_project_save(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        defer_to_commit('portfolios.projects', [instance.pk], refresh_projects)
+
+
+def _on_status_update(sender, instance, raw=False, **kwargs):
+    if not raw and instance.parent_id is not None:
+        defer_to_commit('portfolios.projects', [instance.parent_id], refresh_projects)
+
+
+def connect_signals() -> None:
+    """Keep rollups current as projects, task counts, statuses and portfolio contents change."""
+    from api.projects.models import Project
+    from api.status_updates.models import StatusUpdate
+    from api.tasks.counts import project_task_counts_changed
+
+    project_task_counts_changed.connect(_on_task_counts, dispatch_uid='portfolios.rollups.task_counts')
+    for model in (PortfolioProject, PortfolioPortfolio):
+        post_save.connect(_on_membership_change, sender=model, dispatch_uid=f'portfolios.rollups.{model.__name__}.save')
+        post_delete.connect(
+            _on_membership_change, sender=model, dispatch_uid=f'portfolios.rollups.{model.__name__}.delete'
+        )
+    post_save.connect(_on_project_save, sender=Project, dispatch_uid='portfolios.rollups.project')
+    post_save.connect(_on_status_update, sender=StatusUpdate, dispatch_uid='portfolios.rollups.status.save')
+    post_delete.connect(_on_status_update, sender=StatusUpdate, dispatch_uid='portfolios.rollups.status.delete')
@@ -26,3 +26,21 @@ class PortfolioResponseSerializer(serializers.ModelSerializer):
         model = Portfolio
         fields = '__all__'
         read_only_fields = ['gid', 'resource_type']
+
+
+class AddItemForPortfolioRequestSerializer(serializers.Serializer):
+    """
+    Add item for portfolio request serializer.
+    Matches AddItemForPortfolioRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    item = serializers.CharField(required=False, allow_null=True)
+
+
+class RemoveItemForPortfolioRequestSerializer(serializers.Serializer):
+    """
+    Remove item for portfolio request serializer.
+    Matches RemoveItemForPortfolioRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    item = serializers.CharField(required=False, allow_null=True)
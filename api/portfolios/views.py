@@ -3,17 +3,23 @@ Portfolios views matching FastAPI behavior exactly.
 Implements all portfolios endpoints from FastAPI portfolios_api.py
 """
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
-from .models import Portfolio
+from .models import Portfolio, PortfolioPortfolio, PortfolioProject
+from .rollups import PortfolioNestingError, check_nesting, portfolio_rollup
 from .serializers import (
     PortfolioCompactSerializer,
     PortfolioResponseSerializer,
+    AddItemForPortfolioRequestSerializer,
+    RemoveItemForPortfolioRequestSerializer,
 )
+from api.projects.models import Project
 
 
 class PortfoliosViewSet(viewsets.ViewSet):
@@ -39,6 +45,8 @@ class PortfoliosViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = Portfolio.objects.all()
+        projection = compile_opt_fields(PortfolioCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +54,7 @@ class PortfoliosViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = PortfolioCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +62,7 @@ class PortfoliosViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = PortfolioCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +86,98 @@ class PortfoliosViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(PortfolioResponseSerializer, opt_fields)
         try:
-            resource = Portfolio.objects.get(gid=resource_gid)
+            resource = projection.apply(Portfolio.objects).get(gid=resource_gid)
         except Portfolio.DoesNotExist:
             return asana_not_found_error('Portfolio')
         
-        serializer = PortfolioResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    @action(detail=True, methods=['get'], url_path='progress')
+    def progress(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /portfolios/{portfolio_gid}/progress
+        Returns the portfolio's maintained progress rollup: project count,
+        task and completed task counts, completion ratio, earliest start and
+        latest due date over every project it contains (including through
+        nested portfolios), and each project's progress and latest status.
+        """
+        resource_gid = pk
+        if not resource_gid:
+            return asana_not_found_error('Portfolio')
+        
+        try:
+            portfolio = Portfolio.objects.only('id', 'gid').get(gid=resource_gid)
+        except Portfolio.DoesNotExist:
+            return asana_not_found_error('Portfolio')
+        
+        return Response(wrap_single_response(portfolio_rollup(portfolio)))
+    
+    @action(detail=True, methods=['post'], url_path='addItem')
+    def add_item(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /portfolios/{portfolio_gid}/addItem
+        Adds a project or a portfolio to a portfolio.
+        """
+        return self._modify_item(request, pk, AddItemForPortfolioRequestSerializer, add=True)
+    
+    @action(detail=True, methods=['post'], url_path='removeItem')
+    def remove_item(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /portfolios/{portfolio_gid}/removeItem
+        Removes a project or a portfolio from a portfolio.
+        """
+        return self._modify_item(request, pk, RemoveItemForPortfolioRequestSerializer, add=False)
+    
+    def _modify_item(self, request: Request, portfolio_gid: str, serializer_class, add: bool) -> Response:
+        if not portfolio_gid:
+            return asana_not_found_error('Portfolio')
+        
+        # Validate request body
+        serializer = serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        item_gid = data_dict.get('item') or request_data.get('item')
+        if not item_gid:
+            return asana_validation_error('Item is required')
+        
+        try:
+            portfolio = Portfolio.objects.get(gid=portfolio_gid)
+        except Portfolio.DoesNotExist:
+            return asana_not_found_error('Portfolio')
+        
+        # Items are projects or nested portfolios
+        project = Project.objects.filter(gid=item_gid).first()
+        child = None if project else Portfolio.objects.filter(gid=item_gid).first()
+        if project is None and child is None:
+            return asana_not_found_error('Item')
+        
+        if project is not None:
+            links = PortfolioProject.objects.filter(portfolio=portfolio, project=project)
+            if add and not links.exists():
+                PortfolioProject.objects.create(portfolio=portfolio, project=project)
+        else:
+            links = PortfolioPortfolio.objects.filter(portfolio=portfolio, child=child)
+            if add and not links.exists():
+                try:
+                    check_nesting(portfolio, child)
+                except PortfolioNestingError as error:
+                    return asana_validation_error(str(error))
+                PortfolioPortfolio.objects.create(portfolio=portfolio, child=child)
+        if not add:
+            # Deleted one by one so the rollups are told about each link
+            for link in links:
+                link.delete()
+        
+        # Returns empty data record
+        return Response({'data': {}})
@@ -122,6 +122,10 @@ class Project(models.Model):
     class Meta:
         db_table = 'projects'
         ordering = ['name']
+        indexes = [
+            # GET /projects?workspace=... ORDER BY name
+            models.Index(fields=['workspace', 'name'], name='projects_ws_name_idx'),
+        ]
 
     def __str__(self):
         return self.name or self.gid
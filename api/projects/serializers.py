@@ -19,6 +19,34 @@ class ProjectCompactSerializer(serializers.ModelSerializer):
         read_only_fields = ['gid', 'resource_type']
 
 
+# Maintained task counts and tracked time, rendered only when requested
+# through opt_fields
+TASK_COUNT_FIELDS = [
+    'num_tasks', 'num_completed_tasks', 'num_incomplete_tasks', 'num_overdue_tasks',
+    'num_milestones', 'num_completed_milestones', 'num_incomplete_milestones',
+    'actual_time_minutes',
+]
+
+
+class TaskCountField(serializers.SerializerMethodField):
+    """
+    One of the maintained task counts of a project, or of a section when
+    bound to a section serializer. All counts of an object are read
+    together, once per object.
+    """
+
+    def to_representation(self, obj):
+        from api.tasks.counts import task_counts
+        counts = getattr(obj, '_task_counts', None)
+        if counts is None:
+            if hasattr(obj, 'project_id'):
+                counts = task_counts(obj.project_id, obj.pk)
+            else:
+                counts = task_counts(obj.pk)
+            obj._task_counts = counts
+        return counts[self.field_name]
+
+
 class ProjectResponseSerializer(serializers.ModelSerializer):
     """
     Project full response serializer.
@@ -26,6 +54,14 @@ class ProjectResponseSerializer(serializers.ModelSerializer):
     """
     workspace = WorkspaceCompactSerializer(read_only=True)
     members = serializers.SerializerMethodField()
+    num_tasks = TaskCountField()
+    num_completed_tasks = TaskCountField()
+    num_incomplete_tasks = TaskCountField()
+    num_overdue_tasks = TaskCountField()
+    num_milestones = TaskCountField()
+    num_completed_milestones = TaskCountField()
+    num_incomplete_milestones = TaskCountField()
+    actual_time_minutes = TaskCountField()
     
     class Meta:
         model = Project
@@ -34,8 +70,11 @@ class ProjectResponseSerializer(serializers.ModelSerializer):
             'created_at', 'due_on', 'html_notes', 'is_template',
             'modified_at', 'notes', 'public', 'start_on',
             'workspace', 'members'
-        ]
+        ] + TASK_COUNT_FIELDS
         read_only_fields = ['gid', 'resource_type', 'created_at', 'modified_at']
+        # Columns read by SerializerMethodFields, for opt_fields projection
+        opt_field_sources = {'members': [], **{name: [] for name in TASK_COUNT_FIELDS}}
+        opt_in_fields = TASK_COUNT_FIELDS
     
     def get_members(self, obj):
         """Get members for this project."""
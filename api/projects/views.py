@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Project
 from .serializers import (
@@ -20,6 +21,7 @@ from .serializers import (
 from api.workspaces.models import Workspace
 from api.teams.models import Team
 from api.users.models import User
+from api.tasks.dependencies import project_schedule
 
 
 class ProjectsViewSet(viewsets.ViewSet):
@@ -69,13 +71,16 @@ class ProjectsViewSet(viewsets.ViewSet):
         
         queryset = queryset.order_by('name')
         
+        projection = compile_opt_fields(ProjectCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = ProjectCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -83,7 +88,7 @@ class ProjectsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = ProjectCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -141,7 +146,7 @@ class ProjectsViewSet(viewsets.ViewSet):
         # TODO: Handle team association if provided
         
         # Serialize and return
-        response_serializer = ProjectResponseSerializer(project)
+        response_serializer = compile_opt_fields(ProjectResponseSerializer, opt_fields).serializer(project)
         data = response_serializer.data
         
         if opt_fields:
@@ -165,12 +170,13 @@ class ProjectsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(ProjectResponseSerializer, opt_fields)
         try:
-            project = Project.objects.get(gid=project_gid)
+            project = projection.apply(Project.objects).get(gid=project_gid)
         except Project.DoesNotExist:
             return asana_not_found_error('Project')
         
-        serializer = ProjectResponseSerializer(project)
+        serializer = projection.serializer(project)
         data = serializer.data
         
         if opt_fields:
@@ -219,7 +225,7 @@ class ProjectsViewSet(viewsets.ViewSet):
         
         project.save()
         
-        response_serializer = ProjectResponseSerializer(project)
+        response_serializer = compile_opt_fields(ProjectResponseSerializer, opt_fields).serializer(project)
         data = response_serializer.data
         
         if opt_fields:
@@ -246,3 +252,22 @@ class ProjectsViewSet(viewsets.ViewSet):
         
         # Returns empty data record
         return Response({'data': {}})
+    
+    @action(detail=True, methods=['get'], url_path='dependency_graph')
+    def dependency_graph(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /projects/{project_gid}/dependency_graph
+        Returns the project's tasks in dependency order (each after the tasks
+        it is blocked by), their in-project dependencies, and the critical
+        path: the chain of dependent tasks with the longest total duration.
+        """
+        project_gid = pk
+        if not project_gid:
+            return asana_not_found_error('Project')
+        
+        try:
+            project = Project.objects.only('id', 'gid', 'workspace_id').get(gid=project_gid)
+        except Project.DoesNotExist:
+            return asana_not_found_error('Project')
+        
+        return Response({'data': project_schedule(project)})
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.rules'
+
+    def ready(self):
+        from .engine import connect_signals
+        connect_signals()
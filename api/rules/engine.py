@@ -0,0 +1,530 @@
+"""
+Rules runtime: trigger dispatch and batched action execution.
+
+Rule.trigger and Rule.action are JSON objects of these shapes:
+
+    trigger  {"event": "added"}                     task added to the project
+             {"event": "changed", "field": "completed", "value": true}
+             {"event": "changed", "field": "section", "value": "<section gid>"}
+    `field` (one of TRIGGER_FIELDS) and `value` are optional: without a
+    field any change matches, without a value any new value does. Values
+    of assignee and section are gids (null for no assignee), of due_on ISO
+    dates.
+
+    action   one object, or a list of them run in order:
+             {"type": "set_field", "field": "completed", "value": true}
+             {"type": "move_to_section", "section": "<section gid>"}
+             {"type": "add_comment", "text": "Done by rule"}
+    set_field accepts the fields in ACTION_FIELDS; a section must belong
+    to the rule's project.
+
+Dispatch. The enabled rules of a project are compiled, with their gids
+resolved, into a RuleIndex keyed by (event, field) for rules matching any
+value and (event, field, value) for the others. A change is looked up
+with at most three dict reads whatever the number of rules, and only the
+rules it can match are returned. Indexes are cached per process, tagged
+with a version held in the Django cache, as task dependency graphs are
+(api.tasks.dependencies). A rule save or delete increments its project's
+version once the transaction commits; the process that made the change
+patches its cached index with the changed rules only, other processes
+reload the project's rules on next use.
+
+Execution. Task writes only buffer their changes
+(api.tasks.writes.task_fields_changed, api.tasks.counts.
+task_memberships_added). When the transaction commits, the buffer is
+matched against the indexes of the tasks' projects, reading the tasks'
+memberships with one query, and every matched action runs in one
+transaction: one bulk_update for field changes, one for section moves and
+one bulk_create for comments. A rule runs once per task per commit, in
+rule order (name, then id). Changes made by actions do not trigger rules,
+so rules cannot trigger each other in a loop.
+
+Usage:
+    index = project_index(project.pk)
+    index.match('changed', 'completed', True)   # [CompiledRule, ...]
+"""
+import logging
+import random
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from common.transactions import defer_to_commit
+from .models import Rule
+
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ('added', 'changed')
+
+# Fields a 'changed' trigger can watch
+TRIGGER_FIELDS = ('name', 'notes', 'due_on', 'completed', 'assignee', 'section')
+
+# Fields a set_field action can set
+ACTION_FIELDS = ('completed', 'due_on', 'assignee')
+
+ACTION_TYPES = ('set_field', 'move_to_section', 'add_comment')
+
+# Projects whose rule indexes are kept in memory per process
+INDEX_CACHE_SIZE = 256
+
+_indexes: 'OrderedDict[int, Tuple[int, RuleIndex]]' = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+class RuleError(ValueError):
+    """A rule trigger or action that cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """
+    A rule ready for dispatch. `value` is only matched when `has_value`;
+    `actions` are (type, target, value) tuples with gids resolved, except
+    assignee gids, which the task write path resolves.
+    """
+    id: int
+    project_id: int
+    position: Tuple[str, int]
+    event: str
+    field: Optional[str]
+    has_value: bool
+    value: Any
+    actions: Tuple[Tuple[str, Any, Any], ...]
+
+
+class RuleIndex:
+    """Compiled rules of a project, keyed by the changes they match."""
+
+    def __init__(self, rules: Iterable[CompiledRule] = ()):
+        self.rules: Dict[int, CompiledRule] = {rule.id: rule for rule in rules}
+        self.any_value: Dict[Tuple, List[CompiledRule]] = defaultdict(list)
+        self.by_value: Dict[Tuple, List[CompiledRule]] = defaultdict(list)
+        for rule in sorted(self.rules.values(), key=lambda rule: rule.position):
+            if rule.has_value:
+                self.by_value[(rule.event, rule.field, rule.value)].append(rule)
+            else:
+                self.any_value[(rule.event, rule.field)].append(rule)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, event: str, field: Optional[str] = None, value: Any = None) -> List[CompiledRule]:
+        """Rules triggered by an event; for 'changed', by `field` taking the new `value`."""
+        matched = list(self.any_value.get((event, None), ()))
+        if field is not None:
+            matched.extend(self.any_value.get((event, field), ()))
+            matched.extend(self.by_value.get((event, field, value), ()))
+        return matched
+
+    def updated(self, removed: Iterable[int], rules: Iterable[CompiledRule]) -> 'RuleIndex':
+        """A new index without the `removed` rule ids and with `rules` added or replaced."""
+        removed = set(removed)
+        kept = {pk: rule for pk, rule in self.rules.items() if pk not in removed}
+        kept.update((rule.id, rule) for rule in rules)
+        return RuleIndex(kept.values())
+
+
+def _date_value(value) -> Optional[date]:
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise RuleError('due_on values must be ISO dates or null')
+
+
+def _field_value(field: str, value) -> Any:
+    """Validate a trigger or action value of a field; gids are resolved later."""
+    if field == 'completed':
+        if not isinstance(value, bool):
+            raise RuleError('completed values must be true or false')
+        return value
+    if field == 'due_on':
+        return _date_value(value)
+    if field == 'section' and not isinstance(value, str):
+        raise RuleError('section values must be section gids')
+    if value is not None and not isinstance(value, str):
+        raise RuleError(f'{field} values must be strings or null')
+    return value
+
+
+def parse_trigger(trigger) -> Tuple[str, Optional[str], bool, Any]:
+    """(event, field, has_value, value) of a trigger object."""
+    if not isinstance(trigger, dict):
+        raise RuleError('trigger must be an object')
+    event = trigger.get('event')
+    if event not in EVENTS:
+        raise RuleError(f"trigger event must be one of {', '.join(EVENTS)}")
+    field = trigger.get('field')
+    if event == 'added':
+        if field is not None or 'value' in trigger:
+            raise RuleError('added triggers take no field or value')
+        return event, None, False, None
+    if field is not None and field not in TRIGGER_FIELDS:
+        raise RuleError(f"trigger field must be one of {', '.join(TRIGGER_FIELDS)}")
+    if 'value' not in trigger:
+        return event, field, False, None
+    if field is None:
+        raise RuleError('a trigger value needs a field')
+    return event, field, True, _field_value(field, trigger['value'])
+
+
+def parse_actions(action) -> List[Tuple[str, Any, Any]]:
+    """(type, target, value) tuples of an action object or list of them."""
+    actions = action if isinstance(action, list) else [action]
+    if not actions:
+        raise RuleError('action must not be empty')
+    parsed = []
+    for item in actions:
+        kind = item.get('type') if isinstance(item, dict) else None
+        if kind not in ACTION_TYPES:
+            raise RuleError(f"action type must be one of {', '.join(ACTION_TYPES)}")
+        if kind == 'set_field':
+            field = item.get('field')
+            if field not in ACTION_FIELDS or 'value' not in item:
+                raise RuleError(f"set_field needs a field ({', '.join(ACTION_FIELDS)}) and a value")
+            parsed.append((kind, field, _field_value(field, item['value'])))
+        elif kind == 'move_to_section':
+            parsed.append((kind, _field_value('section', item.get('section')), None))
+        else:
+            text = item.get('text')
+            if not isinstance(text, str) or not text.strip():
+                raise RuleError('add_comment needs a text')
+            parsed.append((kind, text, None))
+    return parsed
+
+
+def compile_rules(rules: Iterable[Rule]) -> List[CompiledRule]:
+    """
+    Compile rules, resolving their section and user gids with one query
+    per resource type. Rules that do not compile are skipped with a
+    warning.
+    """
+    from api.sections.models import Section
+    from api.users.models import User
+
+    parsed = []
+    for rule in rules:
+        try:
+            parsed.append((rule, parse_trigger(rule.trigger), parse_actions(rule.action)))
+        except RuleError as error:
+            logger.warning('Skipping rule %s: %s', rule.gid, error)
+
+    section_gids, user_gids = set(), set()
+    for rule, (event, field, has_value, value), actions in parsed:
+        if has_value and value is not None and field in ('section', 'assignee'):
+            (section_gids if field == 'section' else user_gids).add(value)
+        for kind, target, action_value in actions:
+            if kind == 'move_to_section':
+                section_gids.add(target)
+            elif kind == 'set_field' and target == 'assignee' and action_value is not None:
+                user_gids.add(action_value)
+    sections = {
+        gid: (pk, project_id) for gid, pk, project_id in
+        Section.objects.filter(gid__in=section_gids).values_list('gid', 'id', 'project_id')
+    } if section_gids else {}
+    users = dict(User.objects.filter(gid__in=user_gids).values_list('gid', 'id')) if user_gids else {}
+
+    def section_id(rule, gid):
+        pk, project_id = sections.get(gid, (None, None))
+        if project_id != rule.project_id:
+            raise RuleError(f"section {gid} is not in the rule's project")
+        return pk
+
+    def user_id(gid):
+        if gid is not None and gid not in users:
+            raise RuleError(f'user {gid} does not exist')
+        return users.get(gid)
+
+    compiled = []
+    for rule, (event, field, has_value, value), actions in parsed:
+        try:
+            if has_value and field == 'section':
+                value = section_id(rule, value)
+            elif has_value and field == 'assignee':
+                value = user_id(value)
+            resolved = []
+            for kind, target, action_value in actions:
+                if kind == 'move_to_section':
+                    target = section_id(rule, target)
+                elif kind == 'set_field' and target == 'assignee':
+                    user_id(action_value)
+                resolved.append((kind, target, action_value))
+        except RuleError as error:
+            logger.warning('Skipping rule %s: %s', rule.gid, error)
+            continue
+        compiled.append(CompiledRule(
+            id=rule.pk, project_id=rule.project_id, position=(rule.name, rule.pk),
+            event=event, field=field, has_value=has_value, value=value, actions=tuple(resolved),
+        ))
+    return compiled
+
+
+def _version_key(project_id: int) -> str:
+    return f'rule-index:{project_id}'
+
+
+def _current_versions(project_ids: Iterable[int]) -> Dict[int, int]:
+    keys = {_version_key(project_id): project_id for project_id in project_ids}
+    found = cache.get_many(list(keys))
+    for key in keys.keys() - found.keys():
+        # Random starting points, so a version evicted and added again does
+        # not repeat one a process may still hold
+        cache.add(key, random.getrandbits(48), None)
+        found[key] = cache.get(key)
+    return {project_id: found[key] for key, project_id in keys.items()}
+
+
+def project_indexes(project_ids: Iterable[int]) -> Dict[int, RuleIndex]:
+    """
+    Rule indexes of projects, loading the rules of those not cached in
+    this process, or cached with an old version, in one query.
+    """
+    versions = _current_versions(set(project_ids))
+    indexes = {}
+    with _indexes_lock:
+        for project_id, version in versions.items():
+            entry = _indexes.get(project_id)
+            if entry is not None and entry[0] == version:
+                _indexes.move_to_end(project_id)
+                indexes[project_id] = entry[1]
+
+    missing = [project_id for project_id in versions if project_id not in indexes]
+    if missing:
+        by_project = defaultdict(list)
+        for rule in compile_rules(Rule.objects.filter(project_id__in=missing, enabled=True)):
+            by_project[rule.project_id].append(rule)
+        with _indexes_lock:
+            for project_id in missing:
+                indexes[project_id] = RuleIndex(by_project[project_id])
+                _indexes[project_id] = (versions[project_id], indexes[project_id])
+                _indexes.move_to_end(project_id)
+            while len(_indexes) > INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+    return indexes
+
+
+def project_index(project_id: int) -> RuleIndex:
+    """Rule index of one project."""
+    return project_indexes([project_id])[project_id]
+
+
+def rules_changed(changes: List[Tuple[int, int]]) -> None:
+    """
+    Increment the index versions of projects whose rules changed, given
+    (project_id, rule_id) pairs, and patch this process's cached indexes
+    with those rules only, re-read in one query.
+    """
+    changed = defaultdict(set)
+    for project_id, rule_id in changes:
+        changed[project_id].add(rule_id)
+    current = defaultdict(list)
+    for rule in compile_rules(Rule.objects.filter(pk__in={pk for pks in changed.values() for pk in pks}, enabled=True)):
+        current[rule.project_id].append(rule)
+
+    for project_id, rule_ids in changed.items():
+        key = _version_key(project_id)
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            # No version yet (or evicted): every cached index is reloaded
+            cache.add(key, random.getrandbits(48), None)
+            version = None
+        with _indexes_lock:
+            entry = _indexes.pop(project_id, None)
+            # Patch only an index that was current right before this change;
+            # one that missed another process's change is reloaded instead
+            if entry is not None and version is not None and entry[0] == version - 1:
+                _indexes[project_id] = (version, entry[1].updated(rule_ids, current[project_id]))
+
+
+def run_rules(changes: List[Tuple[str, int, Optional[int], Optional[str], Any]]) -> int:
+    """
+    Match committed task changes, as (event, task_id, project_id, field,
+    value) tuples, against the rules of the tasks' projects and run the
+    matched actions. Changes without a project apply to every project of
+    the task. Returns the number of (rule, task) matches run.
+    """
+    from api.tasks.models import TaskProject
+
+    unscoped = {task_id for _, task_id, project_id, _, _ in changes if project_id is None}
+    projects = defaultdict(list)
+    if unscoped:
+        for task_id, project_id in TaskProject.objects.filter(task_id__in=unscoped).values_list('task_id', 'project_id'):
+            projects[task_id].append(project_id)
+    scoped = [
+        (event, task_id, scope, field, value)
+        for event, task_id, project_id, field, value in changes
+        for scope in ([project_id] if project_id is not None else projects[task_id])
+    ]
+    if not scoped:
+        return 0
+
+    indexes = project_indexes({project_id for _, _, project_id, _, _ in scoped})
+    matched = {}
+    for event, task_id, project_id, field, value in scoped:
+        index = indexes[project_id]
+        if index:
+            for rule in index.match(event, field, value):
+                matched.setdefault((task_id, rule.id), rule)
+    if matched:
+        execute_actions((task_id, rule) for (task_id, _), rule in matched.items())
+    return len(matched)
+
+
+def execute_actions(matches: Iterable[Tuple[int, CompiledRule]]) -> None:
+    """
+    Run the actions of matched rules on their tasks, given (task_id, rule)
+    pairs, batched by action type in one transaction. Tasks deleted since
+    are skipped.
+    """
+    from api.tasks.models import Task
+
+    by_task = defaultdict(list)
+    for task_id, rule in matches:
+        by_task[task_id].append(rule)
+
+    with transaction.atomic():
+        tasks = Task.objects.in_bulk(list(by_task))
+        fields = defaultdict(dict)
+        moves = {}
+        comments = []
+        for task_id, rules in by_task.items():
+            if task_id not in tasks:
+                continue
+            for rule in sorted(rules, key=lambda rule: rule.position):
+                for kind, target, value in rule.actions:
+                    if kind == 'set_field':
+                        fields[task_id][target] = value
+                    elif kind == 'move_to_section':
+                        moves[(task_id, rule.project_id)] = target
+                    else:
+                        comments.append((task_id, target))
+        if fields:
+            _set_fields(tasks, fields)
+        if moves:
+            _move_to_sections(tasks, moves)
+        if comments:
+            _add_comments(comments)
+
+
+def _set_fields(tasks: Dict, fields: Dict[int, Dict[str, Any]]) -> None:
+    """Apply set_field actions with PUT /tasks semantics and one bulk_update."""
+    from api.events.capture import emit_many
+    from api.tasks.counts import task_state, tasks_changed
+    from api.tasks.models import Task
+    from api.tasks.writes import BULK_CHUNK_SIZE, apply_task_changes
+    from api.users.models import User
+
+    users = User.objects.in_bulk(
+        {changes['assignee'] for changes in fields.values() if changes.get('assignee')}, field_name='gid'
+    )
+    before = {}
+    updated = set()
+    changed = []
+    for task_id, changes in fields.items():
+        task = tasks[task_id]
+        before[task_id] = task_state(task)
+        updated.update(apply_task_changes(task, changes, users))
+        changed.append(task)
+    if not updated:
+        return
+    now = timezone.now()
+    for task in changed:
+        task.modified_at = now
+    Task.objects.bulk_update(changed, sorted(updated) + ['modified_at'], batch_size=BULK_CHUNK_SIZE)
+    tasks_changed((task, before[task.pk]) for task in changed)
+    emit_many('changed', changed)
+
+
+def _move_to_sections(tasks: Dict, moves: Dict[Tuple[int, int], int]) -> None:
+    """
+    Move tasks to the end of sections of their projects, given
+    {(task_id, project_id): section_id}, with one bulk_update and one
+    count adjustment.
+    """
+    from common.ranking import keys_between, place
+    from api.tasks.counts import CountDeltas, task_state
+    from api.tasks.models import TaskProject
+    from api.tasks.writes import BULK_CHUNK_SIZE
+
+    memberships = TaskProject.objects.filter(
+        task_id__in={task_id for task_id, _ in moves}, project_id__in={project_id for _, project_id in moves}
+    )
+    deltas = CountDeltas()
+    by_section = defaultdict(list)
+    for membership in memberships:
+        section_id = moves.get((membership.task_id, membership.project_id))
+        if section_id is None or section_id == membership.section_id:
+            continue
+        state = task_state(tasks[membership.task_id])
+        deltas.add(membership.project_id, membership.section_id, state, -1)
+        deltas.add(membership.project_id, section_id, state)
+        membership.section_id = section_id
+        by_section[section_id].append(membership)
+
+    moved = []
+    for rows in by_section.values():
+        first = place(rows[0].group(), pk=rows[0].pk)
+        for membership, key in zip(rows, [first] + keys_between(first, None, len(rows) - 1)):
+            membership.rank = key
+        moved.extend(rows)
+    if moved:
+        TaskProject.objects.bulk_update(moved, ['section', 'rank'], batch_size=BULK_CHUNK_SIZE)
+        deltas.apply()
+
+
+def _add_comments(comments: List[Tuple[int, str]]) -> None:
+    """Add comment stories to tasks with one bulk_create."""
+    from api.events.capture import emit_many
+    from api.stories.models import Story
+
+    stories = Story.objects.bulk_create([
+        Story(task_id=task_id, resource_subtype='comment_added', text=text) for task_id, text in comments
+    ])
+    emit_many('added', stories)
+
+
+def _on_fields_changed(sender, changes, **kwargs):
+    defer_to_commit('rules.dispatch', [
+        ('changed', task_id, project_id, field, value) for task_id, project_id, field, value in changes
+    ], run_rules)
+
+
+def _on_memberships_added(sender, memberships, **kwargs):
+    defer_to_commit('rules.dispatch', [
+        ('added', task_id, project_id, None, None) for task_id, project_id in memberships
+    ], run_rules)
+
+
+def _on_rule_pre_save(sender, instance, raw=False, **kwargs):
+    # A rule moved to another project leaves its previous project's index
+    if not raw and instance.pk is not None:
+        previous = Rule.objects.filter(pk=instance.pk).values_list('project_id', flat=True).first()
+        if previous is not None and previous != instance.project_id:
+            defer_to_commit('rules.index', [(previous, instance.pk)], rules_changed)
+
+
+def _on_rule_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('rules.index', [(instance.project_id, instance.pk)], rules_changed)
+
+
+def connect_signals() -> None:
+    """Dispatch task changes to rules, and keep rule indexes current as rules change."""
+    from api.tasks.counts import task_memberships_added
+    from api.tasks.writes import task_fields_changed
+
+    task_fields_changed.connect(_on_fields_changed, dispatch_uid='rules.engine.fields')
+    task_memberships_added.connect(_on_memberships_added, dispatch_uid='rules.engine.memberships')
+    pre_save.connect(_on_rule_pre_save, sender=Rule, dispatch_uid='rules.engine.rule_pre_save')
+    post_save.connect(_on_rule_change, sender=Rule, dispatch_uid='rules.engine.rule_save')
+    post_delete.connect(_on_rule_change, sender=Rule, dispatch_uid='rules.engine.rule_delete')
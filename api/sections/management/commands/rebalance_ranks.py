@@ -0,0 +1,48 @@
+"""
+Rewrite section, task-in-section and enum option rank keys that are
+unranked or have grown long (see common.ranking).
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from common.ranking import REBALANCE_LENGTH, rebalance
+from api.custom_fields.models import CustomFieldEnumOption
+from api.sections.models import Section
+from api.tasks.models import TaskProject
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebalance the rank keys of sections within projects, of tasks within sections '
+        'and of enum options within custom fields.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebalance every group, not only those that need it')
+
+    def handle(self, *args, **options):
+        def needing(queryset):
+            if options['all']:
+                return queryset
+            return queryset.alias(rank_length=Length('rank')).filter(
+                Q(rank='') | Q(rank_length__gt=REBALANCE_LENGTH)
+            )
+
+        # order_by() drops the default rank ordering, which would otherwise be
+        # selected too and defeat distinct()
+        groups = changed = 0
+        for project_id in needing(Section.objects.all()).values_list('project_id', flat=True).order_by().distinct():
+            changed += rebalance(Section.objects.filter(project_id=project_id))
+            groups += 1
+        for project_id, section_id in needing(TaskProject.objects.all()).values_list(
+            'project_id', 'section_id'
+        ).order_by().distinct():
+            changed += rebalance(TaskProject.objects.filter(project_id=project_id, section_id=section_id))
+            groups += 1
+        for custom_field_id in needing(CustomFieldEnumOption.objects.all()).values_list(
+            'custom_field_id', flat=True
+        ).order_by().distinct():
+            changed += rebalance(CustomFieldEnumOption.objects.filter(custom_field_id=custom_field_id))
+            groups += 1
+        self.stdout.write(f'Rebalanced {groups:,} groups ({changed:,} rows changed)')
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Section',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='section', help_text='The base type of this resource.', max_length=50)),
+                ('name', models.CharField(help_text='The name of the section.', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(help_text='The project this section belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='projects.project')),
+            ],
+            options={
+                'db_table': 'sections',
+                'ordering': ['name'],
+            },
+        ),
+    ]
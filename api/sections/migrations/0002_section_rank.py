@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:14
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+from common.ranking import keys_between
+
+
+def rank_sections(apps, schema_editor):
+    # Keep the order sections were listed in until now: by name
+    Section = apps.get_model('sections', 'Section')
+    sections = Section.objects.order_by('project_id', 'name', 'id').only('id', 'project_id')
+    ranked = []
+    for _, group in groupby(sections.iterator(), key=lambda section: section.project_id):
+        group = list(group)
+        for section, key in zip(group, keys_between(None, None, len(group))):
+            section.rank = key
+            ranked.append(section)
+    Section.objects.bulk_update(ranked, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sections', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='section',
+            options={'ordering': ['rank', 'id']},
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='rank',
+            field=models.CharField(default='', help_text='Fractional sort key of the section within its project (see common.ranking).', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='section',
+            index=models.Index(fields=['project', 'rank'], name='sections_project_rank_idx'),
+        ),
+        migrations.RunPython(rank_sections, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ Section models matching FastAPI Pydantic models.
 from django.db import models
 import uuid
 from common.models import generate_gid
+from common.ranking import place
 
 
 class Section(models.Model):
@@ -26,6 +27,11 @@ class Section(models.Model):
         help_text="The name of the section."
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    rank = models.CharField(
+        max_length=255,
+        default='',
+        help_text="Fractional sort key of the section within its project (see common.ranking)."
+    )
     project = models.ForeignKey(
         'projects.Project',
         on_delete=models.CASCADE,
@@ -35,7 +41,17 @@ class Section(models.Model):
 
     class Meta:
         db_table = 'sections'
-        ordering = ['name']
+        ordering = ['rank', 'id']
+        indexes = [
+            # GET /projects/{project_gid}/sections ORDER BY rank
+            models.Index(fields=['project', 'rank'], name='sections_project_rank_idx'),
+        ]
 
     def __str__(self):
         return self.name or self.gid
+
+    def save(self, *args, **kwargs):
+        # New sections go to the end of their project
+        if not self.rank:
+            self.rank = place(Section.objects.filter(project_id=self.project_id), pk=self.pk)
+        super().save(*args, **kwargs)
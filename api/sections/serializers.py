@@ -4,7 +4,7 @@ Section serializers matching FastAPI/Pydantic models exactly.
 from rest_framework import serializers
 from common.serializers import AsanaNamedResourceSerializer
 from .models import Section
-from api.projects.serializers import ProjectCompactSerializer
+from api.projects.serializers import ProjectCompactSerializer, TASK_COUNT_FIELDS, TaskCountField
 
 
 class SectionCompactSerializer(serializers.ModelSerializer):
@@ -24,11 +24,22 @@ class SectionResponseSerializer(serializers.ModelSerializer):
     Matches SectionResponse Pydantic model.
     """
     project = ProjectCompactSerializer(read_only=True)
+    num_tasks = TaskCountField()
+    num_completed_tasks = TaskCountField()
+    num_incomplete_tasks = TaskCountField()
+    num_overdue_tasks = TaskCountField()
+    num_milestones = TaskCountField()
+    num_completed_milestones = TaskCountField()
+    num_incomplete_milestones = TaskCountField()
+    actual_time_minutes = TaskCountField()
     
     class Meta:
         model = Section
-        fields = ['gid', 'resource_type', 'name', 'created_at', 'project']
+        fields = ['gid', 'resource_type', 'name', 'created_at', 'project'] + TASK_COUNT_FIELDS
         read_only_fields = ['gid', 'resource_type', 'created_at']
+        # Task counts are read from api.tasks.counts, not Section columns
+        opt_field_sources = {name: ['project'] for name in TASK_COUNT_FIELDS}
+        opt_in_fields = TASK_COUNT_FIELDS
 
 
 class UpdateSectionRequestSerializer(serializers.Serializer):
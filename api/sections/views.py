@@ -6,10 +6,13 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
+from django.db import transaction
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
+from common.ranking import place
 from .models import Section
 from .serializers import (
     SectionCompactSerializer,
@@ -19,7 +22,9 @@ from .serializers import (
     AddTaskForSectionRequestSerializer,
 )
 from api.projects.models import Project
+from api.tasks.counts import add_memberships, move_membership
 from api.tasks.models import Task, TaskProject
+from api.tasks.writes import task_fields_changed
 
 
 class SectionsViewSet(viewsets.ViewSet):
@@ -46,12 +51,13 @@ class SectionsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(SectionResponseSerializer, opt_fields)
         try:
-            section = Section.objects.get(gid=section_gid)
+            section = projection.apply(Section.objects).get(gid=section_gid)
         except Section.DoesNotExist:
             return asana_not_found_error('Section')
         
-        serializer = SectionResponseSerializer(section)
+        serializer = projection.serializer(section)
         data = serializer.data
         
         if opt_fields:
@@ -94,7 +100,7 @@ class SectionsViewSet(viewsets.ViewSet):
         
         section.save()
         
-        response_serializer = SectionResponseSerializer(section)
+        response_serializer = compile_opt_fields(SectionResponseSerializer, opt_fields).serializer(section)
         data = response_serializer.data
         
         if opt_fields:
@@ -145,8 +151,11 @@ class SectionsViewSet(viewsets.ViewSet):
         except Project.DoesNotExist:
             return asana_not_found_error('Project')
         
-        # Query sections for this project
-        queryset = Section.objects.filter(project=project).order_by('name')
+        # Query sections for this project, in rank order
+        queryset = Section.objects.filter(project=project).order_by('rank', 'id')
+        
+        projection = compile_opt_fields(SectionCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -154,7 +163,7 @@ class SectionsViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = SectionCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -162,7 +171,7 @@ class SectionsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = SectionCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -205,15 +214,32 @@ class SectionsViewSet(viewsets.ViewSet):
         if not section_gid:
             return asana_validation_error('Section is required')
         
+        if insert_before and insert_after:
+            return asana_validation_error('Provide only one of insert_before or insert_after')
+        
         try:
             section = Section.objects.get(gid=section_gid, project=project)
         except Section.DoesNotExist:
             return asana_not_found_error('Section')
         
-        # TODO: Implement insert_before/insert_after logic for ordering
-        # For now, just return the section
-        
-        response_serializer = SectionResponseSerializer(section)
+        # Give the section a rank between the anchor and its neighbour;
+        # only this section's row is written
+        anchor_gid = insert_before or insert_after
+        if anchor_gid:
+            anchor_id = Section.objects.filter(
+                gid=anchor_gid, project=project
+            ).exclude(pk=section.pk).values_list('id', flat=True).first()
+            if anchor_id is None:
+                return asana_validation_error('insert_before/insert_after must be another section in this project')
+            
+            with transaction.atomic():
+                section.rank = place(
+                    Section.objects.filter(project=project),
+                    pk=section.pk, anchor_pk=anchor_id, before=bool(insert_before),
+                )
+                section.save(update_fields=['rank'])
+        
+        response_serializer = compile_opt_fields(SectionResponseSerializer, opt_fields).serializer(section)
         data = response_serializer.data
         
         if opt_fields:
@@ -255,27 +281,56 @@ class SectionsViewSet(viewsets.ViewSet):
         if not task_gid:
             return asana_validation_error('Task is required')
         
+        insert_before = data_dict.get('insert_before') or request_data.get('insert_before')
+        insert_after = data_dict.get('insert_after') or request_data.get('insert_after')
+        if insert_before and insert_after:
+            return asana_validation_error('Provide only one of insert_before or insert_after')
+        
         try:
             task = Task.objects.get(gid=task_gid)
         except Task.DoesNotExist:
             return asana_not_found_error('Task')
         
-        # Add task to section (update TaskProject relationship)
-        task_project = TaskProject.objects.filter(
-            task=task,
-            project=section.project
-        ).first()
-        
-        if task_project:
-            task_project.section = section
-            task_project.save()
-        else:
-            # Create new TaskProject relationship
-            TaskProject.objects.create(
+        group = TaskProject.objects.filter(project_id=section.project_id, section=section)
+        anchor_gid = insert_before or insert_after
+        anchor_id = None
+        if anchor_gid:
+            anchor_id = group.filter(task__gid=anchor_gid).exclude(task=task).values_list('id', flat=True).first()
+            if anchor_id is None:
+                return asana_validation_error('insert_before/insert_after must be another task in this section')
+        
+        with transaction.atomic():
+            # Add task to section (update TaskProject relationship)
+            task_project = TaskProject.objects.filter(
                 task=task,
-                project=section.project,
-                section=section
+                project_id=section.project_id
+            ).first()
+            
+            # Without an anchor the task goes to the top of the section;
+            # the move writes only this membership row
+            rank = place(
+                group, pk=task_project.pk if task_project else None,
+                anchor_pk=anchor_id, before=anchor_id is None or bool(insert_before),
             )
+            if task_project:
+                old_section_id = task_project.section_id
+                task_project.section = section
+                task_project.rank = rank
+                task_project.save()
+                move_membership(task, section.project_id, old_section_id, section.id)
+                if old_section_id != section.id:
+                    task_fields_changed.send(
+                        sender=Task, changes=[(task.pk, section.project_id, 'section', section.id)]
+                    )
+            else:
+                # Create new TaskProject relationship
+                task_project = TaskProject.objects.create(
+                    task=task,
+                    project_id=section.project_id,
+                    section=section,
+                    rank=rank
+                )
+                add_memberships([task_project])
         
         # Return task
         from api.tasks.serializers import TaskResponseSerializer
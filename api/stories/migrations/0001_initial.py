@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Story',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='story', help_text='The base type of this resource.', max_length=50)),
+                ('resource_subtype', models.CharField(choices=[('comment_added', 'Comment Added'), ('attachment_added', 'Attachment Added'), ('dependency_added', 'Dependency Added'), ('dependency_removed', 'Dependency Removed'), ('dependency_marked_complete', 'Dependency Marked Complete'), ('dependency_marked_incomplete', 'Dependency Marked Incomplete'), ('duplicate_added', 'Duplicate Added'), ('duplicate_removed', 'Duplicate Removed'), ('follower_added', 'Follower Added'), ('follower_removed', 'Follower Removed'), ('liked', 'Liked'), ('unliked', 'Unliked'), ('marked_complete', 'Marked Complete'), ('marked_incomplete', 'Marked Incomplete'), ('assigned', 'Assigned'), ('unassigned', 'Unassigned'), ('section_changed', 'Section Changed'), ('section_moved', 'Section Moved'), ('added_to_project', 'Added To Project'), ('removed_from_project', 'Removed From Project'), ('tag_added', 'Tag Added'), ('tag_removed', 'Tag Removed'), ('custom_field_changed', 'Custom Field Changed'), ('custom_field_deleted', 'Custom Field Deleted'), ('custom_field_restored', 'Custom Field Restored'), ('custom_field_updated', 'Custom Field Updated'), ('milestone_added', 'Milestone Added'), ('milestone_removed', 'Milestone Removed'), ('approval_status_changed', 'Approval Status Changed'), ('approval_requested', 'Approval Requested'), ('approval_approved', 'Approval Approved'), ('approval_rejected', 'Approval Rejected'), ('approval_request_removed', 'Approval Request Removed'), ('approval_request_updated', 'Approval Request Updated'), ('approval_request_removed_from_task', 'Approval Request Removed From Task')], help_text='The subtype of this resource.', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The time at which this resource was created.')),
+                ('text', models.TextField(blank=True, help_text='The plain text of the comment to add. Cannot be used with html_text.', null=True)),
+                ('html_text', models.TextField(blank=True, help_text='HTML formatted text for a comment. This will not include the name of the creator.', null=True)),
+                ('is_pinned', models.BooleanField(default=False, help_text='Whether the story is pinned.')),
+                ('sticker_name', models.CharField(blank=True, help_text='The name of the sticker in this story.', max_length=100, null=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='The user who created the story.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stories_created', to='users.user')),
+            ],
+            options={
+                'db_table': 'stories',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
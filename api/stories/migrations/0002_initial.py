@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        ('stories', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='story',
+            name='target',
+            field=models.ForeignKey(blank=True, help_text='The target of the story.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='target_stories', to='tasks.task'),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='task',
+            field=models.ForeignKey(help_text='The task this story belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='stories', to='tasks.task'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['task', 'created_at'], name='stories_task_created_idx'),
+        ),
+    ]
@@ -117,6 +117,10 @@ class Story(models.Model):
     class Meta:
         db_table = 'stories'
         ordering = ['-created_at']
+        indexes = [
+            # GET /tasks/{task_gid}/stories ORDER BY created_at DESC
+            models.Index(fields=['task', 'created_at'], name='stories_task_created_idx'),
+        ]
 
     def __str__(self):
         return f"Story {self.gid} on {self.task}"
@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Story
 from .serializers import (
@@ -43,12 +44,13 @@ class StoriesViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(StoryResponseSerializer, opt_fields)
         try:
-            story = Story.objects.get(gid=story_gid)
+            story = projection.apply(Story.objects).get(gid=story_gid)
         except Story.DoesNotExist:
             return asana_not_found_error('Story')
         
-        serializer = StoryResponseSerializer(story)
+        serializer = projection.serializer(story)
         data = serializer.data
         
         if opt_fields:
@@ -157,13 +159,16 @@ class StoriesViewSet(viewsets.ViewSet):
         # Query stories for this task
         queryset = Story.objects.filter(task=task).order_by('-created_at')
         
+        projection = compile_opt_fields(StoryCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = StoryCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -171,7 +176,7 @@ class StoriesViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = StoryCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('workspaces', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='tag', help_text='The base type of this resource.', max_length=50)),
+                ('name', models.CharField(help_text='The name of the tag.', max_length=255)),
+                ('color', models.CharField(blank=True, choices=[('dark-pink', 'Dark Pink'), ('dark-green', 'Dark Green'), ('dark-blue', 'Dark Blue'), ('dark-red', 'Dark Red'), ('dark-teal', 'Dark Teal'), ('dark-brown', 'Dark Brown'), ('dark-orange', 'Dark Orange'), ('dark-purple', 'Dark Purple'), ('dark-warm-gray', 'Dark Warm Gray'), ('light-pink', 'Light Pink'), ('light-green', 'Light Green'), ('light-blue', 'Light Blue'), ('light-red', 'Light Red'), ('light-teal', 'Light Teal'), ('light-brown', 'Light Brown'), ('light-orange', 'Light Orange'), ('light-purple', 'Light Purple'), ('light-warm-gray', 'Light Warm Gray')], help_text='Color of the tag.', max_length=50, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('followers', models.ManyToManyField(blank=True, help_text='Array of users following this tag.', related_name='followed_tags', to='users.user')),
+                ('workspace', models.ForeignKey(help_text='The workspace this tag belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'tags',
+                'ordering': ['name'],
+            },
+        ),
+    ]
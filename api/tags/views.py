@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Tag
 from .serializers import (
@@ -51,13 +52,16 @@ class TagsViewSet(viewsets.ViewSet):
         
         queryset = queryset.order_by('name')
         
+        projection = compile_opt_fields(TagCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TagCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -65,7 +69,7 @@ class TagsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TagCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -148,12 +152,13 @@ class TagsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TagResponseSerializer, opt_fields)
         try:
-            tag = Tag.objects.get(gid=tag_gid)
+            tag = projection.apply(Tag.objects).get(gid=tag_gid)
         except Tag.DoesNotExist:
             return asana_not_found_error('Tag')
         
-        serializer = TagResponseSerializer(tag)
+        serializer = projection.serializer(tag)
         data = serializer.data
         
         if opt_fields:
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.tasks'
+
+    def ready(self):
+        from .dependencies import connect_signals
+        connect_signals()
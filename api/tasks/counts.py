@@ -0,0 +1,252 @@
+"""
+Maintained task counts per project and section.
+
+ProjectTaskCount holds the number of tasks, completed tasks, milestones and
+completed milestones, and the tracked time (sum of Task.actual_time_minutes)
+of every section with tasks, plus one row per project (section null) for
+the whole project. ProjectTaskDueCount holds the number
+of incomplete tasks per due date with the same keys, so the overdue count
+is a sum over past dates rather than a scan of the project's tasks.
+
+Rows are adjusted with F() updates by the task write paths, which call
+these functions explicitly:
+- add_memberships() after TaskProject rows are inserted,
+- move_membership() when a task changes section within a project,
+- tasks_changed() after completed, due_on or resource_subtype change,
+- time_changed() after a task's actual_time_minutes is adjusted,
+- remove_tasks() before tasks are deleted.
+Deleting a section or project cascades to its rows; tasks of a deleted
+section stay counted in the project total.
+
+rebuild_task_counts recomputes both tables from TaskProject.
+
+Changes to project totals are announced with project_task_counts_changed
+(`deltas`: {project_id: {'num_tasks': n, 'num_completed_tasks': n}}),
+tasks whose state changed with task_states_changed (`tasks`), new
+memberships with task_memberships_added (`memberships`: (task_id,
+project_id) pairs) and tasks about to be deleted with tasks_removed
+(`tasks`: a queryset), all sent inside the writing transaction.
+
+Usage:
+    counts = task_counts(project)             # whole project
+    counts = task_counts(project, section)    # one section
+    counts['num_incomplete_tasks'], counts['num_overdue_tasks']
+"""
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.dispatch import Signal
+from django.utils import timezone
+
+from common.counters import adjust
+from .models import ProjectTaskCount, ProjectTaskDueCount, Task, TaskProject
+
+
+COUNT_FIELDS = (
+    'num_tasks', 'num_completed_tasks', 'num_milestones', 'num_completed_milestones', 'actual_time_minutes',
+)
+
+# Task columns that decide which counts a task contributes to
+STATE_FIELDS = ('completed', 'resource_subtype', 'due_on', 'actual_time_minutes')
+
+# (completed, is milestone, due_on, tracked minutes)
+TaskState = Tuple[bool, bool, Optional[date], float]
+
+project_task_counts_changed = Signal()
+task_states_changed = Signal()
+task_memberships_added = Signal()
+tasks_removed = Signal()
+
+
+def task_state(task: Task) -> TaskState:
+    """The parts of a task its counts depend on."""
+    return bool(task.completed), task.resource_subtype == 'milestone', task.due_on, task.actual_time_minutes or 0.0
+
+
+class CountDeltas:
+    """
+    Count changes accumulated per (project, section) key and applied with
+    one UPDATE per key that changed.
+    """
+
+    def __init__(self):
+        self.counts: Dict[Tuple, Counter] = defaultdict(Counter)
+        self.due: Counter = Counter()
+
+    def add(self, project_id: int, section_id: Optional[int], state: TaskState, weight: int = 1) -> None:
+        """Count `weight` tasks in `state` in a section and its project total (negative removes)."""
+        completed, milestone, due_on, minutes = state
+        for scope in {None, section_id}:
+            counts = self.counts[(project_id, scope)]
+            counts['num_tasks'] += weight
+            counts['num_completed_tasks'] += weight * completed
+            counts['num_milestones'] += weight * milestone
+            counts['num_completed_milestones'] += weight * (completed and milestone)
+            counts['actual_time_minutes'] += weight * minutes
+            if due_on is not None and not completed:
+                self.due[(project_id, scope, due_on)] += weight
+
+    def add_time(self, project_id: int, section_id: Optional[int], minutes: float) -> None:
+        """Add tracked minutes to a section and its project total."""
+        for scope in {None, section_id}:
+            self.counts[(project_id, scope)]['actual_time_minutes'] += minutes
+
+    def apply(self) -> None:
+        with transaction.atomic():
+            for (project_id, section_id), changes in self.counts.items():
+                adjust(ProjectTaskCount, {'project_id': project_id, 'section_id': section_id}, changes)
+
+            emptied = []
+            for (project_id, section_id, due_on), change in self.due.items():
+                key = {'project_id': project_id, 'section_id': section_id, 'due_on': due_on}
+                adjust(ProjectTaskDueCount, key, {'num_incomplete_tasks': change})
+                if change < 0:
+                    emptied.append(key)
+            # Dates without incomplete tasks left are dropped, so overdue
+            # sums only read dates that still count
+            for key in emptied:
+                ProjectTaskDueCount.objects.filter(num_incomplete_tasks__lte=0, **key).delete()
+
+            totals = {
+                project_id: {name: changes[name] for name in ('num_tasks', 'num_completed_tasks')}
+                for (project_id, section_id), changes in self.counts.items()
+                if section_id is None and (changes['num_tasks'] or changes['num_completed_tasks'])
+            }
+            if totals:
+                project_task_counts_changed.send(sender=ProjectTaskCount, deltas=totals)
+
+
+def add_memberships(memberships: Iterable[TaskProject]) -> None:
+    """Count newly inserted memberships, using the states of their in-memory tasks."""
+    memberships = list(memberships)
+    deltas = CountDeltas()
+    for membership in memberships:
+        deltas.add(membership.project_id, membership.section_id, task_state(membership.task))
+    deltas.apply()
+    task_memberships_added.send(
+        sender=TaskProject, memberships=[(membership.task_id, membership.project_id) for membership in memberships]
+    )
+
+
+def move_membership(task: Task, project_id: int, old_section_id: Optional[int], new_section_id: Optional[int]) -> None:
+    """Move a task's counts from one section of a project to another."""
+    if old_section_id == new_section_id:
+        return
+    state = task_state(task)
+    deltas = CountDeltas()
+    deltas.add(project_id, old_section_id, state, -1)
+    deltas.add(project_id, new_section_id, state)
+    deltas.apply()
+
+
+def tasks_changed(changes: Iterable[Tuple[Task, TaskState]]) -> None:
+    """
+    Update counts for tasks whose state changed, given (task, state before
+    the change) pairs. Reads the memberships of the changed tasks in one
+    query.
+    """
+    before = {task.pk: (task, old) for task, old in changes if task_state(task) != old}
+    if not before:
+        return
+    task_states_changed.send(sender=Task, tasks=[task for task, _ in before.values()])
+    deltas = CountDeltas()
+    memberships = TaskProject.objects.filter(task_id__in=list(before)).values_list(
+        'task_id', 'project_id', 'section_id'
+    )
+    for task_id, project_id, section_id in memberships:
+        task, old = before[task_id]
+        deltas.add(project_id, section_id, old, -1)
+        deltas.add(project_id, section_id, task_state(task))
+    deltas.apply()
+
+
+def time_changed(deltas: Dict[int, float]) -> None:
+    """
+    Add changes of tasks' tracked minutes ({task_id: minutes}) to the
+    totals of their projects and sections. Reads the memberships of the
+    tasks in one query.
+    """
+    deltas = {task_id: minutes for task_id, minutes in deltas.items() if minutes}
+    if not deltas:
+        return
+    counts = CountDeltas()
+    memberships = TaskProject.objects.filter(task_id__in=list(deltas)).values_list(
+        'task_id', 'project_id', 'section_id'
+    )
+    for task_id, project_id, section_id in memberships:
+        counts.add_time(project_id, section_id, deltas[task_id])
+    counts.apply()
+
+
+def _grouped_memberships(memberships) -> List[Tuple]:
+    """(project_id, section_id, state, count) for a TaskProject queryset, grouped in the database."""
+    rows = memberships.values(
+        'project_id', 'section_id', *(f'task__{name}' for name in STATE_FIELDS)
+    ).annotate(count=Count('id')).order_by()
+    return [
+        (
+            row['project_id'], row['section_id'],
+            (
+                bool(row['task__completed']), row['task__resource_subtype'] == 'milestone', row['task__due_on'],
+                row['task__actual_time_minutes'] or 0.0,
+            ),
+            row['count'],
+        )
+        for row in rows
+    ]
+
+
+def remove_tasks(tasks) -> None:
+    """
+    Uncount a queryset of tasks that is about to be deleted, with one
+    grouped query over their memberships.
+    """
+    deltas = CountDeltas()
+    for project_id, section_id, state, count in _grouped_memberships(TaskProject.objects.filter(task__in=tasks)):
+        deltas.add(project_id, section_id, state, -count)
+    deltas.apply()
+    tasks_removed.send(sender=Task, tasks=tasks)
+
+
+def task_counts(project, section=None) -> Dict[str, int]:
+    """
+    Task counts of a project, or of one of its sections. Reads the counts
+    row and the due-date rows before today.
+    """
+    project_id = getattr(project, 'pk', project)
+    section_id = getattr(section, 'pk', section)
+    row = ProjectTaskCount.objects.filter(project_id=project_id, section_id=section_id).values(*COUNT_FIELDS).first()
+    counts = row or dict.fromkeys(COUNT_FIELDS, 0)
+    counts['num_incomplete_tasks'] = counts['num_tasks'] - counts['num_completed_tasks']
+    counts['num_incomplete_milestones'] = counts['num_milestones'] - counts['num_completed_milestones']
+    counts['num_overdue_tasks'] = ProjectTaskDueCount.objects.filter(
+        project_id=project_id, section_id=section_id, due_on__lt=timezone.localdate()
+    ).aggregate(total=Sum('num_incomplete_tasks'))['total'] or 0
+    return counts
+
+
+def rebuild_counts() -> int:
+    """
+    Recompute ProjectTaskCount and ProjectTaskDueCount from TaskProject.
+    Returns the number of count rows written.
+    """
+    with transaction.atomic():
+        ProjectTaskCount.objects.all().delete()
+        ProjectTaskDueCount.objects.all().delete()
+
+        deltas = CountDeltas()
+        for project_id, section_id, state, count in _grouped_memberships(TaskProject.objects.all()):
+            deltas.add(project_id, section_id, state, count)
+
+        ProjectTaskCount.objects.bulk_create([
+            ProjectTaskCount(project_id=project_id, section_id=section_id, **counts)
+            for (project_id, section_id), counts in deltas.counts.items()
+        ], batch_size=1000)
+        ProjectTaskDueCount.objects.bulk_create([
+            ProjectTaskDueCount(project_id=project_id, section_id=section_id, due_on=due_on, num_incomplete_tasks=count)
+            for (project_id, section_id, due_on), count in deltas.due.items() if count
+        ], batch_size=1000)
+    return len(deltas.counts) + sum(1 for count in deltas.due.values() if count)
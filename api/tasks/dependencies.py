@@ -0,0 +1,301 @@
+"""
+Task dependency graph engine.
+
+All dependency edges of a workspace are loaded with one query into an
+in-memory adjacency structure (DependencyGraph). Cycle checks, blocked-by
+chains, topological order and the critical path are then graph walks in
+O(V + E), with no recursive queries.
+
+Graphs are cached in-process per workspace, tagged with a version held in
+the Django cache. Any change to a TaskDependency row, or deletion of a
+task, replaces the workspace's version, so every process rebuilds its
+graph on next use. Invalidation across processes therefore requires a
+shared CACHES backend.
+
+A TaskDependency row (task, depends_on) means `task` is blocked by
+`depends_on`.
+
+Usage:
+    graph = workspace_graph(task.workspace_id)
+    if graph.would_create_cycle(task.id, blocker.id):
+        ...
+    schedule = project_schedule(project)
+"""
+import heapq
+import threading
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from common.transactions import defer_to_commit
+from .models import Task, TaskDependency
+
+
+# Workspaces whose graphs are kept in memory per process
+GRAPH_CACHE_SIZE = 32
+
+_graphs: 'OrderedDict[int, Tuple[str, DependencyGraph]]' = OrderedDict()
+_graphs_lock = threading.Lock()
+
+
+class DependencyGraph:
+    """
+    Adjacency sets for a set of (task_id, depends_on_id) edges.
+    `blockers[t]` are the tasks t depends on; `blocking[t]` the tasks that
+    depend on t.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[int, int]]):
+        self.blockers: Dict[int, Set[int]] = defaultdict(set)
+        self.blocking: Dict[int, Set[int]] = defaultdict(set)
+        for task_id, depends_on_id in edges:
+            self.blockers[task_id].add(depends_on_id)
+            self.blocking[depends_on_id].add(task_id)
+
+    def would_create_cycle(self, task_id: int, depends_on_id: int) -> bool:
+        """
+        Return True if making task_id depend on depends_on_id would close a
+        cycle, i.e. depends_on_id is task_id or is already blocked by it.
+        """
+        if task_id == depends_on_id:
+            return True
+        seen = {depends_on_id}
+        stack = [depends_on_id]
+        while stack:
+            for blocker in self.blockers.get(stack.pop(), ()):
+                if blocker == task_id:
+                    return True
+                if blocker not in seen:
+                    seen.add(blocker)
+                    stack.append(blocker)
+        return False
+
+    def blocked_by(self, task_id: int) -> List[Tuple[int, int]]:
+        """
+        Every task that task_id transitively depends on, as
+        (task id, distance) in breadth-first order.
+        """
+        distances = {task_id: 0}
+        queue = deque([task_id])
+        chain = []
+        while queue:
+            current = queue.popleft()
+            for blocker in sorted(self.blockers.get(current, ())):
+                if blocker not in distances:
+                    distances[blocker] = distances[current] + 1
+                    chain.append((blocker, distances[blocker]))
+                    queue.append(blocker)
+        return chain
+
+    def topological_order(self, nodes: Iterable[int], key=None) -> List[int]:
+        """
+        Order `nodes` so that every task comes after the tasks it depends on
+        (edges to tasks outside `nodes` are ignored). Among tasks that are
+        ready at the same time, `key` (default: id) decides. Tasks on a
+        cycle are appended at the end in key order.
+        """
+        nodes = set(nodes)
+        key = key or (lambda node: node)
+        pending = {node: len(self.blockers.get(node, set()) & nodes) for node in nodes}
+        ready = [(key(node), node) for node, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, node = heapq.heappop(ready)
+            order.append(node)
+            for dependent in self.blocking.get(node, ()):
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        heapq.heappush(ready, (key(dependent), dependent))
+        if len(order) < len(nodes):
+            placed = set(order)
+            order.extend(sorted(nodes - placed, key=key))
+        return order
+
+    def critical_path(self, order: List[int], durations: Dict[int, int]) -> Tuple[List[int], int]:
+        """
+        Longest chain of dependencies through `order` (a topological order)
+        weighted by each task's duration in days. Returns (task ids from
+        first to last, total days).
+        """
+        finish: Dict[int, int] = {}
+        previous: Dict[int, Optional[int]] = {}
+        position = {node: i for i, node in enumerate(order)}
+        for node in order:
+            best, best_finish = None, 0
+            for blocker in self.blockers.get(node, ()):
+                # Only blockers placed earlier; cycle members are skipped
+                if blocker in finish and position[blocker] < position[node] and finish[blocker] > best_finish:
+                    best, best_finish = blocker, finish[blocker]
+            finish[node] = best_finish + durations.get(node, 0)
+            previous[node] = best
+
+        if not finish:
+            return [], 0
+        end = max(order, key=lambda node: (finish[node], -position[node]))
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1], finish[end]
+
+
+def _version_key(workspace_id: int) -> str:
+    return f'task-dependency-graph:{workspace_id}'
+
+
+def _current_version(workspace_id: int) -> str:
+    key = _version_key(workspace_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_workspaces(workspace_ids: Iterable[int]) -> None:
+    """Drop the cached dependency graphs of these workspaces in every process."""
+    for workspace_id in set(workspace_ids):
+        cache.set(_version_key(workspace_id), uuid.uuid4().hex, None)
+        with _graphs_lock:
+            _graphs.pop(workspace_id, None)
+
+
+def workspace_graph(workspace_id: int) -> DependencyGraph:
+    """Return the dependency graph of a workspace, loading it in one query if needed."""
+    version = _current_version(workspace_id)
+    with _graphs_lock:
+        entry = _graphs.get(workspace_id)
+        if entry is not None and entry[0] == version:
+            _graphs.move_to_end(workspace_id)
+            return entry[1]
+
+    edges = TaskDependency.objects.filter(task__workspace_id=workspace_id).values_list('task_id', 'depends_on_id')
+    graph = DependencyGraph(edges)
+    with _graphs_lock:
+        _graphs[workspace_id] = (version, graph)
+        _graphs.move_to_end(workspace_id)
+        while len(_graphs) > GRAPH_CACHE_SIZE:
+            _graphs.popitem(last=False)
+    return graph
+
+
+def task_duration(start_on: Optional[date], due_on: Optional[date]) -> int:
+    """
+    Days a task occupies on the schedule: start_on to due_on inclusive,
+    one day when only due_on is set, none when it has no due date.
+    """
+    if due_on is None:
+        return 0
+    if start_on is None or start_on > due_on:
+        return 1
+    return (due_on - start_on).days + 1
+
+
+def project_schedule(project) -> dict:
+    """
+    Dependency schedule of a project's tasks: topological order (ties by
+    due date), in-project blockers of each task, and the critical path.
+    Costs one query for the project's tasks plus the cached graph.
+    """
+    graph = workspace_graph(project.workspace_id)
+    tasks = {
+        row[0]: row for row in
+        Task.objects.filter(task_projects__project=project).values_list(
+            'id', 'gid', 'name', 'start_on', 'due_on', 'completed'
+        )
+    }
+    order = graph.topological_order(tasks, key=lambda task_id: (tasks[task_id][4] or date.max, task_id))
+    durations = {task_id: task_duration(row[3], row[4]) for task_id, row in tasks.items()}
+    path, days = graph.critical_path(order, durations)
+
+    def compact(task_id):
+        return {'gid': tasks[task_id][1], 'resource_type': 'task'}
+
+    return {
+        'tasks': [
+            {
+                'gid': tasks[task_id][1],
+                'resource_type': 'task',
+                'name': tasks[task_id][2],
+                'start_on': tasks[task_id][3],
+                'due_on': tasks[task_id][4],
+                'completed': tasks[task_id][5],
+                'dependencies': [
+                    compact(blocker) for blocker in sorted(graph.blockers.get(task_id, ()))
+                    if blocker in tasks
+                ],
+            }
+            for task_id in order
+        ],
+        'critical_path': [compact(task_id) for task_id in path],
+        'critical_path_days': days,
+    }
+
+
+def _invalidate_for_tasks(task_ids: List[int]) -> None:
+    invalidate_workspaces(Task.objects.filter(pk__in=set(task_ids)).values_list('workspace_id', flat=True))
+
+
+def _on_dependency_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        defer_to_commit('task-dependencies.tasks', [instance.task_id], _invalidate_for_tasks)
+
+
+def _on_task_delete(sender, instance, **kwargs):
+    defer_to_commit('task-dependencies.workspaces', [instance.workspace_id], invalidate_workspaces)
+
+
+def connect_signals() -> None:
+    """Invalidate cached graphs when dependencies change or tasks are deleted."""
+    post_save.connect(_on_dependency_change, sender=TaskDependency, dispatch_uid='tasks.dependencies.save')
+    post_delete.connect(_on_dependency_change, sender=TaskDependency, dispatch_uid='tasks.dependencies.delete')
+    post_delete.connect(_on_task_delete, sender=Task, dispatch_uid='tasks.dependencies.task_delete')
+
+
+class DependencyCycleError(Exception):
+    """A dependency that would make a task (transitively) block itself."""
+
+
+def add_dependency_edges(workspace_id: int, edges: List[Tuple[int, int]]) -> None:
+    """
+    Insert (task_id, depends_on_id) edges, skipping existing ones. Raises
+    DependencyCycleError, before writing anything, if any edge would close
+    a cycle.
+
+    The edges of one request all share an endpoint (addDependencies /
+    addDependents), so checking each against the current graph is enough:
+    none of them can complete a path for another.
+    """
+    graph = workspace_graph(workspace_id)
+    for task_id, depends_on_id in edges:
+        if graph.would_create_cycle(task_id, depends_on_id):
+            raise DependencyCycleError('Adding this dependency would create a dependency cycle')
+    TaskDependency.objects.bulk_create(
+        [TaskDependency(task_id=task_id, depends_on_id=depends_on_id) for task_id, depends_on_id in edges],
+        ignore_conflicts=True,
+    )
+    _edges_changed(workspace_id)
+
+
+def remove_dependency_edges(workspace_id: int, edges: List[Tuple[int, int]]) -> None:
+    """Delete (task_id, depends_on_id) edges; missing ones are ignored."""
+    by_task = defaultdict(list)
+    for task_id, depends_on_id in edges:
+        by_task[task_id].append(depends_on_id)
+    for task_id, depends_on_ids in by_task.items():
+        TaskDependency.objects.filter(task_id=task_id, depends_on_id__in=depends_on_ids).delete()
+    _edges_changed(workspace_id)
+
+
+def _edges_changed(workspace_id: int) -> None:
+    # Now, so later checks in the same transaction see the new edges, and
+    # again at commit, in case another process cached the old ones meanwhile
+    invalidate_workspaces([workspace_id])
+    defer_to_commit('task-dependencies.workspaces', [workspace_id], invalidate_workspaces)
@@ -0,0 +1,164 @@
+"""
+Subtask hierarchy maintenance.
+
+TaskClosure holds one (ancestor, descendant, depth) row for every pair of
+tasks where one is above the other in the subtask tree, so a whole subtree
+or ancestor chain is one indexed range scan instead of one query per
+level. num_subtasks (direct subtasks) is maintained with F() updates, so
+concurrent writers never overwrite each other's counts.
+
+The task write paths call these functions explicitly:
+- link_new_tasks() after tasks with a parent are inserted,
+- set_parent() to move a task (and its subtree) under another parent,
+- delete_task_tree() to delete a task with all of its subtasks.
+
+rebuild_task_closure recomputes both from Task.parent.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .counts import remove_tasks
+from .models import Task, TaskClosure
+
+
+# Rows per TaskClosure bulk_create statement group
+CLOSURE_CHUNK_SIZE = 1000
+
+
+class TaskHierarchyError(Exception):
+    """A parent change that would create a cycle."""
+
+
+def subtree_filter(task_id: int) -> Q:
+    """Task filter matching a task and all of its subtasks, as one subquery."""
+    return Q(pk=task_id) | Q(pk__in=TaskClosure.objects.filter(ancestor_id=task_id).values('descendant_id'))
+
+
+def _ancestor_depths(task_ids: Iterable[int]) -> Dict[int, List]:
+    """{task id: [(ancestor id, depth), ...]} for the given tasks, one query."""
+    ancestors: Dict[int, List] = {task_id: [] for task_id in task_ids}
+    rows = TaskClosure.objects.filter(descendant_id__in=list(ancestors)).values_list(
+        'descendant_id', 'ancestor_id', 'depth'
+    )
+    for descendant_id, ancestor_id, depth in rows:
+        ancestors[descendant_id].append((ancestor_id, depth))
+    return ancestors
+
+
+def _add_subtask_counts(counts: Dict[int, int]) -> None:
+    for parent_id, count in counts.items():
+        if count:
+            Task.objects.filter(pk=parent_id).update(num_subtasks=F('num_subtasks') + count)
+
+
+def link_new_tasks(tasks: Iterable[Task]) -> None:
+    """
+    Add closure rows and parent num_subtasks counts for newly inserted
+    tasks. Parents must already be linked (existing tasks, or earlier in
+    `tasks`).
+    """
+    tasks = [task for task in tasks if task.parent_id is not None]
+    if not tasks:
+        return
+    with transaction.atomic():
+        ancestors = _ancestor_depths({task.parent_id for task in tasks})
+        rows = []
+        for task in tasks:
+            chain = [(task.parent_id, 0)] + ancestors.get(task.parent_id, [])
+            links = [(ancestor_id, depth + 1) for ancestor_id, depth in chain]
+            rows.extend(
+                TaskClosure(ancestor_id=ancestor_id, descendant_id=task.pk, depth=depth)
+                for ancestor_id, depth in links
+            )
+            # Subtasks of this task created in the same batch
+            ancestors[task.pk] = links
+        TaskClosure.objects.bulk_create(rows, batch_size=CLOSURE_CHUNK_SIZE)
+        _add_subtask_counts(Counter(task.parent_id for task in tasks))
+
+
+def set_parent(task: Task, parent: Optional[Task]) -> None:
+    """
+    Move a task and its subtree under `parent` (None makes it top-level).
+    Raises TaskHierarchyError if `parent` is the task or one of its subtasks.
+    """
+    new_parent_id = parent.pk if parent is not None else None
+    old_parent_id = task.parent_id
+    if new_parent_id == old_parent_id:
+        return
+
+    with transaction.atomic():
+        subtree = dict(TaskClosure.objects.filter(ancestor=task).values_list('descendant_id', 'depth'))
+        subtree[task.pk] = 0
+        if new_parent_id in subtree:
+            raise TaskHierarchyError('A task cannot be a subtask of itself or of one of its subtasks')
+
+        # Detach the subtree from its old ancestors
+        TaskClosure.objects.filter(descendant_id__in=list(subtree)).exclude(
+            ancestor_id__in=list(subtree)
+        ).delete()
+
+        # Attach it below the new parent's ancestor chain
+        if new_parent_id is not None:
+            chain = [(new_parent_id, 0)] + _ancestor_depths([new_parent_id])[new_parent_id]
+            TaskClosure.objects.bulk_create([
+                TaskClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=above + 1 + below)
+                for ancestor_id, above in chain
+                for descendant_id, below in subtree.items()
+            ], batch_size=CLOSURE_CHUNK_SIZE)
+
+        task.parent = parent
+        task.save(update_fields=['parent', 'modified_at'])
+        _add_subtask_counts({old_parent_id: -1} if old_parent_id else {})
+        _add_subtask_counts({new_parent_id: 1} if new_parent_id else {})
+
+
+def delete_task_tree(task: Task) -> int:
+    """
+    Delete a task and all of its subtasks. The subtree is selected through
+    the closure table up front, so each dependent table is cleared with one
+    statement for the whole subtree rather than level by level. Returns the
+    number of tasks deleted.
+    """
+    with transaction.atomic():
+        subtree = Task.objects.filter(subtree_filter(task.pk))
+        remove_tasks(subtree)
+        deleted, per_model = subtree.delete()
+        if task.parent_id is not None:
+            _add_subtask_counts({task.parent_id: -1})
+    return per_model.get(Task._meta.label, 0)
+
+
+def rebuild_closure(chunk_size: int = 5000) -> int:
+    """
+    Recompute TaskClosure and num_subtasks from Task.parent.
+    Returns the number of closure rows written.
+    """
+    written = 0
+    with transaction.atomic():
+        TaskClosure.objects.all().delete()
+        parents = dict(Task.objects.filter(parent__isnull=False).values_list('id', 'parent_id'))
+
+        rows = []
+        for task_id, parent_id in parents.items():
+            depth = 1
+            seen = {task_id}
+            while parent_id is not None and parent_id not in seen:
+                rows.append(TaskClosure(ancestor_id=parent_id, descendant_id=task_id, depth=depth))
+                seen.add(parent_id)
+                parent_id = parents.get(parent_id)
+                depth += 1
+            if len(rows) >= chunk_size:
+                TaskClosure.objects.bulk_create(rows, batch_size=CLOSURE_CHUNK_SIZE)
+                written += len(rows)
+                rows = []
+        TaskClosure.objects.bulk_create(rows, batch_size=CLOSURE_CHUNK_SIZE)
+        written += len(rows)
+
+        Task.objects.exclude(num_subtasks=0).update(num_subtasks=0)
+        counts = Task.objects.filter(parent__isnull=False).values('parent_id').annotate(count=Count('id'))
+        for row in counts:
+            Task.objects.filter(pk=row['parent_id']).update(num_subtasks=row['count'])
+    return written
@@ -0,0 +1,231 @@
+"""
+Batched relation loading for task serialization.
+
+TaskResponseSerializer needs projects, tags, followers, dependencies,
+dependents, custom field values and several user/workspace/parent
+foreign keys for every task.
+Loading those per task costs roughly ten queries per row; the loader below
+fetches each relation type once for a whole page of tasks and hands the
+serializer pre-grouped maps keyed by task id.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from .models import Task, TaskDependency, TaskProject, TaskFollower, TaskTag
+
+
+# User foreign keys on Task that are resolved through a single users query
+USER_FK_FIELDS = ('assignee', 'created_by', 'completed_by', 'assigned_by')
+
+# Every relation the loader knows how to fetch
+RELATION_FIELDS = USER_FK_FIELDS + (
+    'workspace', 'parent', 'projects', 'tags', 'followers',
+    'dependencies', 'dependents', 'custom_fields',
+)
+
+
+class TaskRelationLoader:
+    """
+    Load every relation needed to serialize a page of tasks.
+
+    Usage:
+        loader = TaskRelationLoader(tasks)
+        loader.projects_for(task)  # -> [Project, ...]
+
+    Each relation type costs one query regardless of the number of tasks.
+    Foreign keys (assignee, created_by, completed_by, assigned_by, workspace,
+    parent) are attached to the task instances' relation cache so that
+    attribute access does not hit the database again.
+
+    Pass `fields` to load only the relations that will be rendered (for
+    example the serializer fields left after opt_fields projection).
+    """
+
+    def __init__(self, tasks: Iterable[Task], fields: Optional[Iterable[str]] = None):
+        self.tasks = list(tasks)
+        self.fields = set(RELATION_FIELDS if fields is None else fields)
+        self.task_ids = [task.id for task in self.tasks if task.id is not None]
+        self._task_id_set = set(self.task_ids)
+
+        self.projects_by_task: Dict[int, List] = defaultdict(list)
+        self.tags_by_task: Dict[int, List] = defaultdict(list)
+        self.followers_by_task: Dict[int, List] = defaultdict(list)
+        self.dependencies_by_task: Dict[int, List[Task]] = defaultdict(list)
+        self.dependents_by_task: Dict[int, List[Task]] = defaultdict(list)
+        self.custom_fields_by_task: Dict[int, List[dict]] = {}
+
+        self._load_foreign_keys()
+        if self.task_ids:
+            if 'projects' in self.fields:
+                self._load_projects()
+            if 'tags' in self.fields:
+                self._load_tags()
+            if 'followers' in self.fields:
+                self._load_followers()
+            if self.fields & {'dependencies', 'dependents'}:
+                self._load_dependencies()
+            if 'custom_fields' in self.fields:
+                self._load_custom_fields()
+
+    @classmethod
+    def for_created(cls, tasks: Iterable[Task], projects_by_task: Optional[Dict[int, List]] = None,
+                    custom_fields: bool = False):
+        """
+        Build a loader for tasks that were just inserted without querying.
+        Their foreign keys are already attached and they have no tags,
+        followers or dependencies yet; only their projects are supplied.
+        Their custom field values are read back when `custom_fields` is set.
+        """
+        loader = cls(tasks, fields=('custom_fields',) if custom_fields else ())
+        loader.fields = set(RELATION_FIELDS)
+        for task_id, projects in (projects_by_task or {}).items():
+            loader.projects_by_task[task_id] = sorted(projects, key=lambda project: (project.name, project.id))
+        return loader
+
+    def _load_foreign_keys(self):
+        """
+        Resolve user, workspace and parent foreign keys in one query per model
+        and attach them to the task instances.
+        """
+        from api.users.models import User
+        from api.workspaces.models import Workspace
+
+        user_fields = [name for name in USER_FK_FIELDS if name in self.fields]
+        user_ids = set()
+        workspace_ids = set()
+        parent_ids = set()
+        for task in self.tasks:
+            for field_name in user_fields:
+                user_ids.update(self._pending_id(task, field_name))
+            if 'workspace' in self.fields:
+                workspace_ids.update(self._pending_id(task, 'workspace'))
+            if 'parent' in self.fields:
+                parent_ids.update(self._pending_id(task, 'parent'))
+
+        users = User.objects.in_bulk(user_ids) if user_ids else {}
+        workspaces = Workspace.objects.in_bulk(workspace_ids) if workspace_ids else {}
+        parents = (
+            Task.objects.only('id', 'gid', 'name').in_bulk(parent_ids)
+            if parent_ids else {}
+        )
+
+        for task in self.tasks:
+            for field_name in user_fields:
+                self._attach(task, field_name, users)
+            if 'workspace' in self.fields:
+                self._attach(task, 'workspace', workspaces)
+            if 'parent' in self.fields:
+                self._attach(task, 'parent', parents)
+
+    @staticmethod
+    def _pending_id(task: Task, field_name: str) -> List[int]:
+        """Return the foreign key id still to be loaded for a task, if any."""
+        field = Task._meta.get_field(field_name)
+        if field.is_cached(task) or field.attname in task.get_deferred_fields():
+            return []
+        related_id = getattr(task, field.attname)
+        return [] if related_id is None else [related_id]
+
+    @staticmethod
+    def _attach(task: Task, field_name: str, objects_by_id: dict):
+        """Populate a foreign key's relation cache from a pre-loaded map."""
+        field = Task._meta.get_field(field_name)
+        if field.is_cached(task) or field.attname in task.get_deferred_fields():
+            return
+        related_id = getattr(task, field.attname)
+        if related_id is None:
+            field.set_cached_value(task, None)
+        elif related_id in objects_by_id:
+            field.set_cached_value(task, objects_by_id[related_id])
+
+    def _load_projects(self):
+        """Group projects by task, ordered like Project.Meta.ordering."""
+        rows = (
+            TaskProject.objects
+            .filter(task_id__in=self.task_ids)
+            .select_related('project')
+            .order_by('project__name', 'project_id')
+        )
+        for row in rows:
+            self.projects_by_task[row.task_id].append(row.project)
+
+    def _load_tags(self):
+        """Group tags by task, ordered like Tag.Meta.ordering."""
+        rows = (
+            TaskTag.objects
+            .filter(task_id__in=self.task_ids)
+            .select_related('tag')
+            .order_by('tag__name', 'tag_id')
+        )
+        for row in rows:
+            self.tags_by_task[row.task_id].append(row.tag)
+
+    def _load_followers(self):
+        """Group followers by task, ordered like User.Meta.ordering."""
+        rows = (
+            TaskFollower.objects
+            .filter(task_id__in=self.task_ids)
+            .select_related('user')
+            .order_by('user__name', 'user__email', 'user_id')
+        )
+        for row in rows:
+            self.followers_by_task[row.task_id].append(row.user)
+
+    def _load_dependencies(self):
+        """
+        Group both directions of the dependency graph.
+
+        A TaskDependency row (task, depends_on) means `task` is blocked by
+        `depends_on`: it is a dependency of `task` and `task` is a dependent
+        of `depends_on`.
+        """
+        if 'dependencies' in self.fields:
+            rows = (
+                TaskDependency.objects
+                .filter(task_id__in=self.task_ids)
+                .select_related('depends_on')
+                .only('id', 'task_id', 'depends_on__id', 'depends_on__gid')
+                .order_by('id')
+            )
+            for row in rows:
+                self.dependencies_by_task[row.task_id].append(row.depends_on)
+
+        if 'dependents' not in self.fields:
+            return
+        rows = (
+            TaskDependency.objects
+            .filter(depends_on_id__in=self.task_ids)
+            .select_related('task')
+            .only('id', 'depends_on_id', 'task__id', 'task__gid')
+            .order_by('id')
+        )
+        for row in rows:
+            self.dependents_by_task[row.depends_on_id].append(row.task)
+
+    def _load_custom_fields(self):
+        """Custom field values of every task, one query per value table."""
+        from api.custom_fields.values import load_task_values
+
+        self.custom_fields_by_task = load_task_values(self.task_ids)
+
+    def covers(self, task: Task) -> bool:
+        """Return True if this loader was built for the given task."""
+        return task.id in self._task_id_set
+
+    def projects_for(self, task: Task) -> List:
+        return self.projects_by_task.get(task.id, [])
+
+    def tags_for(self, task: Task) -> List:
+        return self.tags_by_task.get(task.id, [])
+
+    def followers_for(self, task: Task) -> List:
+        return self.followers_by_task.get(task.id, [])
+
+    def dependencies_for(self, task: Task) -> List[Task]:
+        return self.dependencies_by_task.get(task.id, [])
+
+    def dependents_for(self, task: Task) -> List[Task]:
+        return self.dependents_by_task.get(task.id, [])
+
+    def custom_fields_for(self, task: Task) -> List[dict]:
+        return self.custom_fields_by_task.get(task.id, [])
@@ -0,0 +1,17 @@
+"""
+Rebuild the subtask closure table and num_subtasks counters from Task.parent.
+"""
+from django.core.management.base import BaseCommand
+
+from api.tasks.hierarchy import rebuild_closure
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the task_closure table and the num_subtasks counters from the parent links.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Closure rows written per batch')
+
+    def handle(self, *args, **options):
+        written = rebuild_closure(chunk_size=options['chunk_size'])
+        self.stdout.write(f'Wrote {written:,} closure rows')
@@ -0,0 +1,14 @@
+"""
+Rebuild the maintained project and section task counts from TaskProject.
+"""
+from django.core.management.base import BaseCommand
+
+from api.tasks.counts import rebuild_counts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project_task_counts and project_task_due_counts tables from the task memberships.'
+
+    def handle(self, *args, **options):
+        written = rebuild_counts()
+        self.stdout.write(f'Wrote {written:,} count rows')
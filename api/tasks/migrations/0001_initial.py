@@ -0,0 +1,124 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('sections', '0001_initial'),
+        ('workspaces', '0001_initial'),
+        ('tags', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='task', help_text='The base type of this resource.', max_length=50)),
+                ('name', models.CharField(help_text='Name of the task.', max_length=500)),
+                ('resource_subtype', models.CharField(choices=[('default_task', 'Default Task'), ('milestone', 'Milestone'), ('approval', 'Approval')], default='default_task', help_text='The subtype of this resource.', max_length=50)),
+                ('approval_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('changes_requested', 'Changes Requested')], help_text='Reflects the approval status of this task.', max_length=50, null=True)),
+                ('assignee_status', models.CharField(blank=True, choices=[('today', 'Today'), ('upcoming', 'Upcoming'), ('later', 'Later'), ('new', 'New'), ('inbox', 'Inbox')], help_text='Scheduling status of this task for the user it is assigned to.', max_length=50, null=True)),
+                ('completed', models.BooleanField(default=False, help_text='True if the task is currently marked complete, false if not.')),
+                ('completed_at', models.DateTimeField(blank=True, help_text='The time at which this task was completed.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The time at which this resource was created.')),
+                ('due_at', models.DateTimeField(blank=True, help_text='The UTC date and time on which this task is due.', null=True)),
+                ('due_on', models.DateField(blank=True, help_text='The localized date on which this task is due.', null=True)),
+                ('html_notes', models.TextField(blank=True, help_text='The notes of the text with formatting as HTML.', null=True)),
+                ('liked', models.BooleanField(default=False, help_text='True if the task is liked by the authorized user.')),
+                ('modified_at', models.DateTimeField(auto_now=True, help_text='The time at which this task was last modified.')),
+                ('notes', models.TextField(blank=True, help_text='Free-form textual information associated with the task.', null=True)),
+                ('num_likes', models.IntegerField(default=0, help_text='The number of users who have liked this task.')),
+                ('num_subtasks', models.IntegerField(default=0, help_text='The number of subtasks on this task.')),
+                ('start_at', models.DateTimeField(blank=True, help_text='Date and time on which work begins for the task.', null=True)),
+                ('start_on', models.DateField(blank=True, help_text='The day on which work begins for the task.', null=True)),
+                ('actual_time_minutes', models.FloatField(blank=True, help_text='Sum of all Time Tracking entries in the Actual Time field.', null=True)),
+                ('permalink_url', models.URLField(blank=True, help_text='A url that points directly to the object within Asana.', null=True)),
+                ('assigned_by', models.ForeignKey(blank=True, help_text='The user who assigned the task.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks_assigned', to='users.user')),
+                ('assignee', models.ForeignKey(blank=True, help_text='The user to whom this task is assigned.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tasks', to='users.user')),
+                ('completed_by', models.ForeignKey(blank=True, help_text='The user who completed the task.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks_completed', to='users.user')),
+                ('created_by', models.ForeignKey(blank=True, help_text='The user who created the task.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks_created', to='users.user')),
+                ('parent', models.ForeignKey(blank=True, help_text='The parent task of this task.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='tasks.task')),
+                ('workspace', models.ForeignKey(help_text='The workspace this task is associated with.', on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'tasks',
+                'ordering': ['-modified_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_tasks', to='tags.tag')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tags', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'task_tags',
+                'unique_together': {('task', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_tasks', to='projects.project')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_projects', to='sections.section')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_projects', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'task_projects',
+                'unique_together': {('task', 'project')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_likes', to='tasks.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='liked_tasks', to='users.user')),
+            ],
+            options={
+                'db_table': 'task_likes',
+                'unique_together': {('task', 'user')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskFollower',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_followers', to='tasks.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='followed_tasks', to='users.user')),
+            ],
+            options={
+                'db_table': 'task_followers',
+                'unique_together': {('task', 'user')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('depends_on', models.ForeignKey(help_text='The task that this task depends on.', on_delete=django.db.models.deletion.CASCADE, related_name='dependents', to='tasks.task')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependencies', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'task_dependencies',
+                'unique_together': {('task', 'depends_on')},
+            },
+        ),
+    ]
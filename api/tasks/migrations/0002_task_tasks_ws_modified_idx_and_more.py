@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'modified_at'], name='tasks_ws_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'modified_at'], name='tasks_assignee_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'completed', 'modified_at'], name='tasks_assignee_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskproject',
+            index=models.Index(fields=['project', 'section', 'task'], name='task_projects_proj_sect_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_tasks_ws_modified_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'completed', 'modified_at'], name='tasks_ws_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'created_at'], name='tasks_ws_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'due_on'], name='tasks_ws_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskfollower',
+            index=models.Index(fields=['user', 'task'], name='task_followers_user_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktag',
+            index=models.Index(fields=['tag', 'task'], name='task_tags_tag_task_idx'),
+        ),
+    ]
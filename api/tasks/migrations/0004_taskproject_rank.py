@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:14
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+from common.ranking import keys_between
+
+
+def rank_memberships(apps, schema_editor):
+    # Tasks of a section keep their creation order, as rebalance orders
+    # unranked rows
+    TaskProject = apps.get_model('tasks', 'TaskProject')
+    memberships = TaskProject.objects.order_by('project_id', 'section_id', 'id').only(
+        'id', 'project_id', 'section_id'
+    )
+    ranked = []
+    for _, group in groupby(memberships.iterator(), key=lambda row: (row.project_id, row.section_id)):
+        group = list(group)
+        for membership, key in zip(group, keys_between(None, None, len(group))):
+            membership.rank = key
+            ranked.append(membership)
+    TaskProject.objects.bulk_update(ranked, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_tasks_ws_completed_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskproject',
+            name='rank',
+            field=models.CharField(default='', help_text='Fractional sort key of the task within its project section (see common.ranking).', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='taskproject',
+            index=models.Index(fields=['project', 'section', 'rank'], name='task_projects_group_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskproject',
+            index=models.Index(fields=['section', 'rank', 'task'], name='task_projects_sect_rank_idx'),
+        ),
+        migrations.RunPython(rank_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_closure(apps, schema_editor):
+    # Backfill the ancestor links of existing subtasks
+    from api.tasks.hierarchy import rebuild_closure
+    rebuild_closure()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_taskproject_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Number of parent links between the ancestor and the descendant.')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='tasks.task')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'task_closure',
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='task_closure_subtree_idx'), models.Index(fields=['descendant', 'depth', 'ancestor'], name='task_closure_ancestors_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskclosure',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='task_closure_pair_uniq'),
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
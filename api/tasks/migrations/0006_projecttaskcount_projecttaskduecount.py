@@ -0,0 +1,68 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_counts(apps, schema_editor):
+    # Count the existing memberships of every project and section
+    from api.tasks.counts import rebuild_counts
+    rebuild_counts()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_projects_ws_name_idx'),
+        ('sections', '0002_section_rank'),
+        ('tasks', '0005_taskclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTaskDueCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_on', models.DateField()),
+                ('num_incomplete_tasks', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_due_counts', to='projects.project')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_due_counts', to='sections.section')),
+            ],
+            options={
+                'db_table': 'project_task_due_counts',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTaskCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('num_tasks', models.IntegerField(default=0)),
+                ('num_completed_tasks', models.IntegerField(default=0)),
+                ('num_milestones', models.IntegerField(default=0)),
+                ('num_completed_milestones', models.IntegerField(default=0)),
+                ('actual_time_minutes', models.FloatField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counts', to='projects.project')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_counts', to='sections.section')),
+            ],
+            options={
+                'db_table': 'project_task_counts',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskduecount',
+            constraint=models.UniqueConstraint(condition=models.Q(('section__isnull', False)), fields=('project', 'section', 'due_on'), name='project_task_due_counts_sect_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskduecount',
+            constraint=models.UniqueConstraint(condition=models.Q(('section__isnull', True)), fields=('project', 'due_on'), name='project_task_due_counts_proj_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('section__isnull', False)), fields=('project', 'section'), name='project_task_counts_section_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='projecttaskcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('section__isnull', True)), fields=('project',), name='project_task_counts_project_uniq'),
+        ),
+        migrations.RunPython(build_counts, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 import uuid
 from common.models import generate_gid
+from common.ranking import place
 
 
 class Task(models.Model):
@@ -188,6 +189,18 @@ class Task(models.Model):
     class Meta:
         db_table = 'tasks'
         ordering = ['-modified_at']
+        indexes = [
+            # GET /tasks?workspace=... ORDER BY modified_at DESC
+            models.Index(fields=['workspace', 'modified_at'], name='tasks_ws_modified_idx'),
+            # GET /tasks?assignee=... ORDER BY modified_at DESC
+            models.Index(fields=['assignee', 'modified_at'], name='tasks_assignee_modified_idx'),
+            # Incomplete/complete tasks per assignee (My Tasks) ORDER BY modified_at DESC
+            models.Index(fields=['assignee', 'completed', 'modified_at'], name='tasks_assignee_completed_idx'),
+            # Task search: completed filter and the other sort_by columns per workspace
+            models.Index(fields=['workspace', 'completed', 'modified_at'], name='tasks_ws_completed_idx'),
+            models.Index(fields=['workspace', 'created_at'], name='tasks_ws_created_idx'),
+            models.Index(fields=['workspace', 'due_on'], name='tasks_ws_due_idx'),
+        ]
 
     def __str__(self):
         return self.name or self.gid
@@ -215,6 +228,38 @@ class TaskDependency(models.Model):
         unique_together = ['task', 'depends_on']
 
 
+class TaskClosure(models.Model):
+    """
+    Subtask hierarchy closure: one row per (ancestor, descendant) pair, with
+    depth 1 for a direct subtask. Maintained by api.tasks.hierarchy.
+    """
+    ancestor = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='descendant_links'
+    )
+    descendant = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='ancestor_links'
+    )
+    depth = models.PositiveIntegerField(
+        help_text="Number of parent links between the ancestor and the descendant."
+    )
+
+    class Meta:
+        db_table = 'task_closure'
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='task_closure_pair_uniq'),
+        ]
+        indexes = [
+            # Subtree of a task, shallowest first (GET /tasks/{gid}/subtasks)
+            models.Index(fields=['ancestor', 'depth', 'descendant'], name='task_closure_subtree_idx'),
+            # Ancestor chain of a task
+            models.Index(fields=['descendant', 'depth', 'ancestor'], name='task_closure_ancestors_idx'),
+        ]
+
+
 class TaskProject(models.Model):
     """
     Many-to-many relationship between tasks and projects.
@@ -236,11 +281,108 @@ class TaskProject(models.Model):
         blank=True,
         related_name='task_projects'
     )
+    rank = models.CharField(
+        max_length=255,
+        default='',
+        help_text="Fractional sort key of the task within its project section (see common.ranking)."
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'task_projects'
         unique_together = ['task', 'project']
+        indexes = [
+            # GET /tasks?project=... (covers the task_id subquery) and
+            # tasks of a section within a project
+            models.Index(fields=['project', 'section', 'task'], name='task_projects_proj_sect_idx'),
+            # Placement within a (project, section) group
+            models.Index(fields=['project', 'section', 'rank'], name='task_projects_group_rank_idx'),
+            # GET /tasks?section=... ORDER BY rank, and the task search
+            # sections.any join
+            models.Index(fields=['section', 'rank', 'task'], name='task_projects_sect_rank_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # New memberships go to the end of their (project, section) group
+        if not self.rank:
+            self.rank = place(self.group(), pk=self.pk)
+        super().save(*args, **kwargs)
+
+    def group(self):
+        """The memberships ordered together with this one."""
+        return TaskProject.objects.filter(project_id=self.project_id, section_id=self.section_id)
+
+
+class ProjectTaskCount(models.Model):
+    """
+    Maintained task counts of a project section, or of the whole project
+    when section is null (see api.tasks.counts).
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='task_counts'
+    )
+    section = models.ForeignKey(
+        'sections.Section',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='task_counts'
+    )
+    num_tasks = models.IntegerField(default=0)
+    num_completed_tasks = models.IntegerField(default=0)
+    num_milestones = models.IntegerField(default=0)
+    num_completed_milestones = models.IntegerField(default=0)
+    actual_time_minutes = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'project_task_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'section'], condition=models.Q(section__isnull=False),
+                name='project_task_counts_section_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['project'], condition=models.Q(section__isnull=True),
+                name='project_task_counts_project_uniq'
+            ),
+        ]
+
+
+class ProjectTaskDueCount(models.Model):
+    """
+    Number of incomplete tasks per due date in a project section, or in the
+    whole project when section is null. Overdue counts are the sum over
+    past dates, so they stay correct as days go by without rewriting rows.
+    """
+    project = models.ForeignKey(
+        'projects.Project',
+        on_delete=models.CASCADE,
+        related_name='task_due_counts'
+    )
+    section = models.ForeignKey(
+        'sections.Section',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='task_due_counts'
+    )
+    due_on = models.DateField()
+    num_incomplete_tasks = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'project_task_due_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'section', 'due_on'], condition=models.Q(section__isnull=False),
+                name='project_task_due_counts_sect_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['project', 'due_on'], condition=models.Q(section__isnull=True),
+                name='project_task_due_counts_proj_uniq'
+            ),
+        ]
 
 
 class TaskFollower(models.Model):
@@ -262,6 +404,10 @@ class TaskFollower(models.Model):
     class Meta:
         db_table = 'task_followers'
         unique_together = ['task', 'user']
+        indexes = [
+            # Tasks a user follows (task search followers.any join)
+            models.Index(fields=['user', 'task'], name='task_followers_user_task_idx'),
+        ]
 
 
 class TaskTag(models.Model):
@@ -283,6 +429,10 @@ class TaskTag(models.Model):
     class Meta:
         db_table = 'task_tags'
         unique_together = ['task', 'tag']
+        indexes = [
+            # Tasks with a tag (task search tags.any join)
+            models.Index(fields=['tag', 'task'], name='task_tags_tag_task_idx'),
+        ]
 
 
 class TaskLike(models.Model):
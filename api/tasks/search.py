@@ -0,0 +1,212 @@
+"""
+Filter engine behind GET /workspaces/{workspace_gid}/tasks/search.
+
+Asana-style search parameters are compiled into one Task queryset. Each
+`.any` filter on a related resource (projects, sections, tags) becomes a
+join on its through table, matched on the referenced gid, instead of an
+`id IN (subquery)`; `.all` adds one join per value and `.not` an
+anti-join. The joins are served by the composite indexes declared on
+Task, TaskProject and TaskTag.
+
+Usage:
+    try:
+        queryset = TaskSearch(request.query_params).queryset(workspace)
+    except TaskSearchError as error:
+        return asana_validation_error(str(error))
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from api.custom_fields.filters import CustomFieldQuery, CustomFieldQueryError
+from .models import Task
+
+
+# sort_by value -> Task column
+SORT_FIELDS = {
+    'modified_at': 'modified_at',
+    'created_at': 'created_at',
+    'completed_at': 'completed_at',
+    'due_date': 'due_on',
+    'likes': 'num_likes',
+}
+
+# Multi-valued filters: parameter prefix -> lookup matched against a gid
+RELATED_FILTERS = {
+    'assignee': 'assignee__gid',
+    'projects': 'task_projects__project__gid',
+    'sections': 'task_projects__section__gid',
+    'tags': 'task_tags__tag__gid',
+    'followers': 'task_followers__user__gid',
+    'created_by': 'created_by__gid',
+}
+
+# Relations that can match a task more than once
+MULTI_ROW_RELATIONS = {'projects', 'sections', 'tags', 'followers'}
+
+# Date filters: parameter prefix -> (Task column, column is a datetime)
+DATE_FILTERS = {
+    'due_on': ('due_on', False),
+    'due_at': ('due_at', True),
+    'start_on': ('start_on', False),
+    'created_on': ('created_at', False),
+    'created_at': ('created_at', True),
+    'modified_on': ('modified_at', False),
+    'modified_at': ('modified_at', True),
+    'completed_on': ('completed_at', False),
+    'completed_at': ('completed_at', True),
+}
+
+
+class TaskSearchError(ValueError):
+    """An invalid search parameter."""
+
+
+class TaskSearch:
+    """
+    Compile search query parameters into a Task queryset.
+
+    Supported parameters:
+    - text: substring of the task name or notes
+    - resource_subtype: default_task, milestone or approval
+    - completed, is_subtask: true/false
+    - {assignee,projects,sections,tags,followers,created_by}.any / .not:
+      comma-separated gids; projects, sections and tags also take .all
+    - {due_on,start_on,created_on,modified_on,completed_on}[.before|.after]:
+      YYYY-MM-DD
+    - {due_at,created_at,modified_at,completed_at}.before / .after: ISO 8601
+    - custom_fields.{gid}.{is_set,value,less_than,greater_than,contains,
+      starts_with,ends_with}: see api.custom_fields.filters
+    - sort_by: modified_at (default), created_at, completed_at, due_date,
+      likes, or custom_fields.{gid}
+    - sort_ascending: true/false (default false)
+    """
+
+    def __init__(self, params):
+        self.params = params
+
+    def queryset(self, workspace) -> QuerySet:
+        queryset = Task.objects.filter(workspace=workspace)
+        distinct = False
+        try:
+            custom_fields = CustomFieldQuery(self.params, workspace)
+            queryset = custom_fields.filter(queryset)
+        except CustomFieldQueryError as error:
+            raise TaskSearchError(str(error))
+
+        text = self.params.get('text')
+        if text:
+            queryset = queryset.filter(Q(name__icontains=text) | Q(notes__icontains=text))
+
+        subtype = self.params.get('resource_subtype')
+        if subtype:
+            if subtype not in dict(Task.RESOURCE_SUBTYPE_CHOICES):
+                raise TaskSearchError('resource_subtype must be one of default_task, milestone, approval')
+            queryset = queryset.filter(resource_subtype=subtype)
+
+        completed = self._bool('completed')
+        if completed is not None:
+            queryset = queryset.filter(completed=completed)
+
+        is_subtask = self._bool('is_subtask')
+        if is_subtask is not None:
+            queryset = queryset.filter(parent__isnull=not is_subtask)
+
+        for name, lookup in RELATED_FILTERS.items():
+            any_gids = self._gids(f'{name}.any')
+            if any_gids:
+                queryset = queryset.filter(**{f'{lookup}__in': any_gids})
+                distinct |= name in MULTI_ROW_RELATIONS and len(any_gids) > 1
+            if name in MULTI_ROW_RELATIONS:
+                # One join per value; the through tables are unique per
+                # (task, value) so these cannot duplicate rows
+                for gid in self._gids(f'{name}.all'):
+                    queryset = queryset.filter(**{lookup: gid})
+            not_gids = self._gids(f'{name}.not')
+            if not_gids:
+                queryset = queryset.exclude(**{f'{lookup}__in': not_gids})
+
+        for name, (column, is_datetime) in DATE_FILTERS.items():
+            queryset = self._date_filter(queryset, name, column, is_datetime)
+
+        if distinct:
+            queryset = queryset.distinct()
+        if custom_fields.sort_field is not None:
+            return custom_fields.order_by(queryset, self._bool('sort_ascending') or False)
+        return queryset.order_by(*self._ordering())
+
+    def _ordering(self) -> List:
+        sort_by = self.params.get('sort_by') or 'modified_at'
+        if sort_by not in SORT_FIELDS:
+            raise TaskSearchError(f"sort_by must be one of {', '.join(SORT_FIELDS)} or custom_fields.{{gid}}")
+        column = SORT_FIELDS[sort_by]
+        ascending = self._bool('sort_ascending') or False
+
+        if Task._meta.get_field(column).null:
+            # Tasks without a value sort last in either direction
+            key = F(column).asc(nulls_last=True) if ascending else F(column).desc(nulls_last=True)
+            return [key, 'id' if ascending else '-id']
+        return [column if ascending else f'-{column}']
+
+    def _bool(self, name: str) -> Optional[bool]:
+        value = self.params.get(name)
+        if value is None or value == '':
+            return None
+        value = value.lower()
+        if value not in ('true', 'false'):
+            raise TaskSearchError(f'{name} must be true or false')
+        return value == 'true'
+
+    def _gids(self, name: str) -> List[str]:
+        value = self.params.get(name) or ''
+        return [gid.strip() for gid in value.split(',') if gid.strip()]
+
+    def _date_filter(self, queryset: QuerySet, name: str, column: str, is_datetime: bool) -> QuerySet:
+        for suffix, lookup in (('', ''), ('.before', '__lt'), ('.after', '__gt')):
+            value = self.params.get(f'{name}{suffix}')
+            if not value:
+                continue
+            if is_datetime:
+                if not suffix:
+                    raise TaskSearchError(f'{name} takes .before or .after')
+                queryset = queryset.filter(**{f'{column}{lookup}': self._datetime(name + suffix, value)})
+            else:
+                day = self._date(name + suffix, value)
+                if column in ('due_on', 'start_on'):
+                    queryset = queryset.filter(**{f'{column}{lookup}': day})
+                else:
+                    queryset = queryset.filter(**self._day_range(column, lookup, day))
+        return queryset
+
+    @staticmethod
+    def _day_range(column: str, lookup: str, day: date) -> dict:
+        """
+        Compare a datetime column with a calendar day as a range on the
+        column itself, so its index can be used (unlike __date).
+        """
+        start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        end = start + timedelta(days=1)
+        if lookup == '__lt':
+            return {f'{column}__lt': start}
+        if lookup == '__gt':
+            return {f'{column}__gte': end}
+        return {f'{column}__gte': start, f'{column}__lt': end}
+
+    @staticmethod
+    def _date(name: str, value: str) -> date:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise TaskSearchError(f'{name} must be a date in YYYY-MM-DD format')
+
+    @staticmethod
+    def _datetime(name: str, value: str) -> datetime:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            raise TaskSearchError(f'{name} must be an ISO 8601 date-time')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -4,6 +4,7 @@ Task serializers matching FastAPI/Pydantic models exactly.
 from rest_framework import serializers
 from common.serializers import AsanaNamedResourceSerializer
 from .models import Task
+from .loaders import TaskRelationLoader
 from api.users.serializers import UserCompactSerializer
 from api.projects.serializers import ProjectCompactSerializer
 from api.tags.serializers import TagCompactSerializer
@@ -20,10 +21,74 @@ class TaskCompactSerializer(serializers.ModelSerializer):
         read_only_fields = ['gid', 'resource_type']
 
 
+class TaskListItemListSerializer(serializers.ListSerializer):
+    """Loads the custom field values of a whole page at once when they are rendered."""
+    def to_representation(self, data):
+        tasks = list(data.all() if hasattr(data, 'all') else data)
+        if 'custom_fields' in self.child.fields:
+            self.context['task_relations'] = TaskRelationLoader(tasks, fields=['custom_fields'])
+        return super().to_representation(tasks)
+
+
+class TaskListItemSerializer(TaskCompactSerializer):
+    """
+    Compact task for GET /tasks and task search results, with its custom
+    field values when requested (opt_fields=custom_fields).
+    """
+    custom_fields = serializers.SerializerMethodField()
+
+    class Meta(TaskCompactSerializer.Meta):
+        list_serializer_class = TaskListItemListSerializer
+        fields = ['gid', 'resource_type', 'name', 'custom_fields']
+        opt_field_sources = {'custom_fields': []}
+        opt_in_fields = ['custom_fields']
+
+    def get_custom_fields(self, obj):
+        """Get custom field values for this task."""
+        relations = self.context.get('task_relations')
+        if relations is None or not relations.covers(obj):
+            relations = TaskRelationLoader([obj], fields=['custom_fields'])
+        return relations.custom_fields_for(obj)
+
+
+class SubtaskCompactSerializer(TaskCompactSerializer):
+    """
+    Compact task with its parent, for subtrees returned by
+    GET /tasks/{task_gid}/subtasks?depth=...
+    """
+    parent = serializers.SerializerMethodField()
+
+    class Meta(TaskCompactSerializer.Meta):
+        fields = ['gid', 'resource_type', 'name', 'parent']
+        opt_field_sources = {'parent': ['parent']}
+
+    def get_parent(self, obj):
+        """Get parent task."""
+        if obj.parent_id is None:
+            return None
+        return {'gid': obj.parent.gid, 'resource_type': 'task', 'name': obj.parent.name}
+
+
+class TaskResponseListSerializer(serializers.ListSerializer):
+    """
+    List serializer for full task responses.
+    Loads relations for the whole page up front so that each relation
+    type costs one query instead of one query per task.
+    """
+    def to_representation(self, data):
+        tasks = list(data.all() if hasattr(data, 'all') else data)
+        self.context['task_relations'] = TaskRelationLoader(tasks, fields=self.child.fields.keys())
+        return super().to_representation(tasks)
+
+
 class TaskResponseSerializer(serializers.ModelSerializer):
     """
     Task full response serializer.
     Matches TaskResponse Pydantic model.
+
+    Relations are read from a TaskRelationLoader. Pass one in the
+    `task_relations` context key to share it across serializers; otherwise
+    one is built for the instance being serialized.
     """
     assignee = UserCompactSerializer(read_only=True)
     created_by = UserCompactSerializer(read_only=True)
@@ -36,9 +101,11 @@ class TaskResponseSerializer(serializers.ModelSerializer):
     dependencies = serializers.SerializerMethodField()
     dependents = serializers.SerializerMethodField()
     parent = serializers.SerializerMethodField()
+    custom_fields = serializers.SerializerMethodField()
     
     class Meta:
         model = Task
+        list_serializer_class = TaskResponseListSerializer
         fields = [
             'gid', 'resource_type', 'name', 'resource_subtype',
             'approval_status', 'assignee_status', 'completed',
@@ -48,12 +115,31 @@ class TaskResponseSerializer(serializers.ModelSerializer):
             'actual_time_minutes', 'permalink_url',
             'assignee', 'created_by', 'completed_by', 'assigned_by',
             'workspace', 'projects', 'tags', 'followers',
-            'dependencies', 'dependents', 'parent'
+            'dependencies', 'dependents', 'parent', 'custom_fields'
         ]
         read_only_fields = [
             'gid', 'resource_type', 'created_at', 'modified_at',
             'completed_at', 'num_likes', 'num_subtasks'
         ]
+        # Columns read by SerializerMethodFields, for opt_fields projection
+        opt_field_sources = {
+            'workspace': ['workspace'],
+            'parent': ['parent'],
+            'projects': [],
+            'tags': [],
+            'followers': [],
+            'dependencies': [],
+            'dependents': [],
+            'custom_fields': [],
+        }
+    
+    def to_representation(self, instance):
+        """Make sure relations for this task are loaded before serializing."""
+        relations = self.context.get('task_relations')
+        if relations is None or not relations.covers(instance):
+            relations = TaskRelationLoader([instance], fields=self.fields.keys())
+        self._relations = relations
+        return super().to_representation(instance)
     
     def get_workspace(self, obj):
         """Get workspace compact representation."""
@@ -67,39 +153,27 @@ class TaskResponseSerializer(serializers.ModelSerializer):
     
     def get_projects(self, obj):
         """Get projects for this task."""
-        from .models import TaskProject
-        from api.projects.models import Project
-        project_ids = TaskProject.objects.filter(task=obj).values_list('project_id', flat=True)
-        projects = Project.objects.filter(id__in=project_ids)
-        return ProjectCompactSerializer(projects, many=True).data
+        return ProjectCompactSerializer(self._relations.projects_for(obj), many=True).data
     
     def get_tags(self, obj):
         """Get tags for this task."""
-        from .models import TaskTag
-        from api.tags.models import Tag
-        tag_ids = TaskTag.objects.filter(task=obj).values_list('tag_id', flat=True)
-        tags = Tag.objects.filter(id__in=tag_ids)
-        return TagCompactSerializer(tags, many=True).data
+        return TagCompactSerializer(self._relations.tags_for(obj), many=True).data
     
     def get_followers(self, obj):
         """Get followers for this task."""
-        from .models import TaskFollower
-        from api.users.models import User
-        user_ids = TaskFollower.objects.filter(task=obj).values_list('user_id', flat=True)
-        users = User.objects.filter(id__in=user_ids)
-        return UserCompactSerializer(users, many=True).data
+        return UserCompactSerializer(self._relations.followers_for(obj), many=True).data
     
     def get_dependencies(self, obj):
-        """Get dependencies as compact resources."""
-        from .models import TaskDependency
-        dependencies = TaskDependency.objects.filter(depends_on=obj)
-        return [{'gid': dep.task.gid, 'resource_type': 'task'} for dep in dependencies]
+        """Get dependencies (tasks this task is blocked by) as compact resources."""
+        return [{'gid': dep.gid, 'resource_type': 'task'} for dep in self._relations.dependencies_for(obj)]
     
     def get_dependents(self, obj):
-        """Get dependents as compact resources."""
-        from .models import TaskDependency
-        dependents = TaskDependency.objects.filter(depends_on=obj)
-        return [{'gid': dep.task.gid, 'resource_type': 'task'} for dep in dependents]
+        """Get dependents (tasks blocked by this task) as compact resources."""
+        return [{'gid': dep.gid, 'resource_type': 'task'} for dep in self._relations.dependents_for(obj)]
+    
+    def get_custom_fields(self, obj):
+        """Get custom field values for this task."""
+        return self._relations.custom_fields_for(obj)
     
     def get_parent(self, obj):
         """Get parent task."""
@@ -129,3 +203,47 @@ class CreateTaskRequestSerializer(serializers.Serializer):
     assignee = serializers.CharField(required=False, allow_null=True)
     due_on = serializers.DateField(required=False, allow_null=True)
     notes = serializers.CharField(required=False, allow_null=True)
+    custom_fields = serializers.DictField(required=False, allow_null=True)
+
+
+class BulkUpdateTaskItemSerializer(serializers.Serializer):
+    """
+    One item of a PUT /tasks/bulk request.
+    Only the fields present are updated, as with PUT /tasks/{task_gid}.
+    """
+    gid = serializers.CharField()
+    name = serializers.CharField(required=False)
+    notes = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    completed = serializers.BooleanField(required=False)
+    due_on = serializers.DateField(required=False, allow_null=True)
+    assignee = serializers.CharField(required=False, allow_null=True)
+    custom_fields = serializers.DictField(required=False, allow_null=True)
+
+
+class SetParentForTaskRequestSerializer(serializers.Serializer):
+    """
+    Set parent for task request serializer.
+    Matches TaskSetParentRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    parent = serializers.CharField(required=False, allow_null=True)
+    insert_after = serializers.CharField(required=False, allow_null=True)
+    insert_before = serializers.CharField(required=False, allow_null=True)
+
+
+class ModifyDependenciesForTaskRequestSerializer(serializers.Serializer):
+    """
+    Add/remove dependencies for task request serializer.
+    Matches ModifyDependenciesRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    dependencies = serializers.ListField(child=serializers.CharField(), required=False, allow_null=True)
+
+
+class ModifyDependentsForTaskRequestSerializer(serializers.Serializer):
+    """
+    Add/remove dependents for task request serializer.
+    Matches ModifyDependentsRequest Pydantic model.
+    """
+    data = serializers.DictField(required=False, allow_null=True)
+    dependents = serializers.ListField(child=serializers.CharField(), required=False, allow_null=True)
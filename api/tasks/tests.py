@@ -0,0 +1,202 @@
+"""
+Tests for bulk task writes, the maintained project counts and subtask
+closure, and the fractional rank keys tasks and sections are ordered by.
+
+Usage:
+    python manage.py test api.tasks
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.ranking import key_between, keys_between, place
+from api.projects.models import Project
+from api.sections.models import Section
+from api.workspaces.models import Workspace
+from .counts import rebuild_counts, task_counts
+from .hierarchy import rebuild_closure
+from .models import ProjectTaskCount, ProjectTaskDueCount, Task, TaskClosure, TaskProject
+
+
+class APITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer test')
+        self.workspace = Workspace.objects.create(name='Acme')
+        self.project = Project.objects.create(name='Roadmap', workspace=self.workspace)
+
+
+class BulkTaskTests(APITestCase):
+    def test_create_reports_each_item(self):
+        response = self.client.post('/tasks/bulk', {'data': [
+            {'name': 'Draft budget', 'projects': [self.project.gid]},
+            {'name': 'No container'},
+            'not an object',
+            {'name': 'Lost', 'projects': ['missing']},
+            {'data': {'name': 'Review budget', 'workspace': self.workspace.gid}},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['data']
+        self.assertEqual([result['status_code'] for result in results], [201, 400, 400, 404, 201])
+        self.assertEqual(results[0]['body']['data']['name'], 'Draft budget')
+        self.assertEqual(results[1]['body']['errors'][0]['message'], 'Workspace or project is required')
+        self.assertEqual(results[3]['body']['errors'][0]['message'], 'Project not found')
+        created = set(Task.objects.values_list('gid', flat=True))
+        self.assertEqual(created, {results[0]['body']['data']['gid'], results[4]['body']['data']['gid']})
+        self.assertEqual(task_counts(self.project)['num_tasks'], 1)
+
+    def test_update_reports_each_item(self):
+        task = Task.objects.create(name='Draft budget', workspace=self.workspace)
+        response = self.client.put('/tasks/bulk', {'data': [
+            {'gid': task.gid, 'name': 'Final budget', 'completed': True},
+            {'gid': 'missing', 'name': 'Nothing'},
+            {'name': 'No gid'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['data']
+        self.assertEqual([result['status_code'] for result in results], [200, 404, 400])
+        self.assertEqual(results[0]['body']['data']['name'], 'Final budget')
+        self.assertEqual(results[1]['body']['errors'][0]['message'], 'Task not found')
+        task.refresh_from_db()
+        self.assertEqual((task.name, task.completed), ('Final budget', True))
+
+    def test_rejects_empty_requests(self):
+        self.assertEqual(self.client.post('/tasks/bulk', {'data': []}, format='json').status_code, 400)
+        self.assertEqual(self.client.put('/tasks/bulk', {}, format='json').status_code, 400)
+
+
+class MaintainedStateTests(APITestCase):
+    """Counts and closure rows kept up to date by writes match a rebuild."""
+
+    def assertConsistent(self):
+        def snapshot():
+            return (
+                set(ProjectTaskCount.objects.values_list(
+                    'project_id', 'section_id', 'num_tasks', 'num_completed_tasks',
+                    'num_milestones', 'num_completed_milestones',
+                )),
+                set(ProjectTaskDueCount.objects.exclude(num_incomplete_tasks=0).values_list(
+                    'project_id', 'section_id', 'due_on', 'num_incomplete_tasks',
+                )),
+                set(TaskClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth')),
+                set(Task.objects.values_list('id', 'num_subtasks')),
+            )
+
+        maintained = snapshot()
+        rebuild_counts()
+        rebuild_closure()
+        self.assertEqual(maintained, snapshot())
+
+    def create(self, name, **data):
+        response = self.client.post('/tasks', {'data': {'name': name, 'projects': [self.project.gid], **data}},
+                                    format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return Task.objects.get(gid=response.json()['data']['gid'])
+
+    def test_create_set_parent_and_delete(self):
+        root = self.create('Launch plan', due_on='2020-01-01')
+        child = self.create('Draft budget', parent=root.gid)
+        grandchild = self.create('Hire designer', parent=child.gid)
+        other = self.create('Quarterly report')
+        self.assertEqual(task_counts(self.project)['num_tasks'], 4)
+        self.assertEqual(task_counts(self.project)['num_overdue_tasks'], 1)
+        self.assertEqual(
+            set(TaskClosure.objects.filter(descendant=grandchild).values_list('ancestor_id', 'depth')),
+            {(child.id, 1), (root.id, 2)},
+        )
+        self.assertConsistent()
+
+        response = self.client.post(f'/tasks/{child.gid}/setParent', {'data': {'parent': other.gid}}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            set(TaskClosure.objects.filter(descendant=grandchild).values_list('ancestor_id', 'depth')),
+            {(child.id, 1), (other.id, 2)},
+        )
+        root.refresh_from_db()
+        self.assertEqual(root.num_subtasks, 0)
+        self.assertConsistent()
+
+        response = self.client.post(f'/tasks/{other.gid}/setParent', {'data': {'parent': grandchild.gid}},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.client.delete(f'/tasks/{other.gid}').status_code, 200)
+        self.assertFalse(Task.objects.filter(pk__in=[other.pk, child.pk, grandchild.pk]).exists())
+        self.assertEqual(task_counts(self.project)['num_tasks'], 1)
+        self.assertConsistent()
+
+    def test_completing_in_bulk_moves_counts(self):
+        section = Section.objects.create(name='Now', project=self.project)
+        task = self.create('Launch plan', due_on='2020-01-01')
+        TaskProject.objects.filter(task=task).update(section=section)
+        rebuild_counts()
+
+        self.client.put('/tasks/bulk', {'data': [{'gid': task.gid, 'completed': True}]}, format='json')
+        counts = task_counts(self.project, section)
+        self.assertEqual((counts['num_completed_tasks'], counts['num_overdue_tasks']), (1, 0))
+        self.assertConsistent()
+
+
+class RankTests(TestCase):
+    def test_key_between_adjacent_keys(self):
+        self.assertEqual(key_between(None, None), 'a0')
+        for lower, upper in [('a0', 'a1'), ('a0', 'a0V'), ('a0V', 'a1'), ('Zz', 'a0'), ('a0', 'a00001')]:
+            key = key_between(lower, upper)
+            self.assertTrue(lower < key < upper, (lower, key, upper))
+
+    def test_key_between_ends(self):
+        first = 'a0'
+        for _ in range(100):
+            key = key_between(None, first)
+            self.assertLess(key, first)
+            first = key
+        last = 'a0'
+        for _ in range(100):
+            key = key_between(last, None)
+            self.assertGreater(key, last)
+            last = key
+
+    def test_key_between_rejects_bad_order(self):
+        with self.assertRaises(ValueError):
+            key_between('a1', 'a0')
+        with self.assertRaises(ValueError):
+            key_between('a0', 'a0')
+
+    def test_keys_between_are_ordered(self):
+        for lower, upper in [(None, None), ('a0', 'a1'), (None, 'a0'), ('a0', None)]:
+            keys = keys_between(lower, upper, 25)
+            self.assertEqual(keys, sorted(set(keys)))
+            self.assertTrue(all((lower is None or lower < key) and (upper is None or key < upper) for key in keys))
+
+    def test_place(self):
+        workspace = Workspace.objects.create(name='Acme')
+        project = Project.objects.create(name='Roadmap', workspace=workspace)
+        sections = Section.objects.filter(project=project)
+
+        def add(name, **kwargs):
+            return Section.objects.create(name=name, project=project, rank=place(sections, **kwargs))
+
+        middle = add('Middle')
+        last = add('Last')
+        first = add('First', before=True)
+        after_first = add('After first', anchor_pk=first.pk)
+        add('Before last', anchor_pk=last.pk, before=True)
+        self.assertEqual(
+            list(sections.order_by('rank').values_list('name', flat=True)),
+            ['First', 'After first', 'Middle', 'Before last', 'Last'],
+        )
+
+        # Moving a row places it relative to its siblings, not itself
+        first.rank = place(sections, pk=first.pk)
+        first.save()
+        self.assertEqual(sections.order_by('rank').last(), first)
+
+        # Unranked siblings next to the position are rebalanced first
+        sections.filter(pk__in=[middle.pk, after_first.pk]).update(rank='')
+        key = place(sections, before=True)
+        self.assertNotIn('', sections.values_list('rank', flat=True))
+        self.assertLess(key, min(sections.values_list('rank', flat=True)))
+
+        with self.assertRaises(ValueError):
+            place(sections, anchor_pk=0)
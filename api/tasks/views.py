@@ -6,20 +6,42 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
-from django.utils import timezone
+from django.db import transaction
 from datetime import datetime, date
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Task, TaskDependency, TaskProject, TaskFollower, TaskTag, TaskLike
 from .serializers import (
     TaskCompactSerializer,
+    TaskListItemSerializer,
     TaskResponseSerializer,
     CreateTaskRequestSerializer,
+    SetParentForTaskRequestSerializer,
+    SubtaskCompactSerializer,
+    ModifyDependenciesForTaskRequestSerializer,
+    ModifyDependentsForTaskRequestSerializer,
 )
-from api.projects.models import Project
-from api.workspaces.models import Workspace
+from .counts import task_state, tasks_changed
+from .dependencies import DependencyCycleError, add_dependency_edges, remove_dependency_edges, workspace_graph
+from .hierarchy import TaskHierarchyError, delete_task_tree, set_parent
+from .loaders import TaskRelationLoader
+from .writes import (
+    BULK_TASK_LIMIT,
+    TaskWriteError,
+    announce_changes,
+    apply_task_changes,
+    bulk_create_tasks,
+    bulk_update_tasks,
+    clean_task_changes,
+    create_task,
+    field_values,
+    task_input,
+)
+from api.custom_fields.filters import CustomFieldQuery, CustomFieldQueryError
+from api.custom_fields.values import CustomFieldValueError, set_task_values
 from api.users.models import User
 from api.tags.models import Tag
 from api.sections.models import Section
@@ -38,9 +60,10 @@ class TasksViewSet(viewsets.ViewSet):
         GET /tasks
         Returns the compact task records for some filtered set of tasks.
         Query params: assignee, project, section, workspace, completed_since, modified_since, opt_fields, limit, offset
+        Custom field filters (custom_fields.{gid}.value, ...) and
+        sort_by=custom_fields.{gid} with sort_ascending, as in task search.
         """
         # Get query parameters
-        opt_pretty = request.query_params.get('opt_pretty', 'false').lower() == 'true'
         limit = request.query_params.get('limit')
         offset = request.query_params.get('offset')
         assignee = request.query_params.get('assignee')
@@ -67,8 +90,9 @@ class TasksViewSet(viewsets.ViewSet):
             queryset = queryset.filter(id__in=task_ids)
         
         if section:
-            task_ids = TaskProject.objects.filter(section__gid=section).values_list('task_id', flat=True)
-            queryset = queryset.filter(id__in=task_ids)
+            # A task is in at most one section of a project, so the join
+            # cannot duplicate rows; it supplies the section's rank order
+            queryset = queryset.filter(task_projects__section__gid=section)
         
         if workspace:
             queryset = queryset.filter(workspace__gid=workspace)
@@ -87,8 +111,24 @@ class TasksViewSet(viewsets.ViewSet):
             except (ValueError, AttributeError):
                 pass
         
-        # Order by modified_at descending
-        queryset = queryset.order_by('-modified_at')
+        try:
+            custom_fields = CustomFieldQuery(request.query_params)
+            queryset = custom_fields.filter(queryset)
+        except CustomFieldQueryError as error:
+            return asana_validation_error(str(error))
+        
+        # Tasks of a section are listed in board order, others by
+        # modified_at descending, unless sorted by a custom field
+        if custom_fields.sort_field is not None:
+            ascending = request.query_params.get('sort_ascending', 'false').lower() == 'true'
+            queryset = custom_fields.order_by(queryset, ascending)
+        elif section:
+            queryset = queryset.order_by('task_projects__rank', 'task_projects__id')
+        else:
+            queryset = queryset.order_by('-modified_at')
+        
+        projection = compile_opt_fields(TaskListItemSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -96,7 +136,7 @@ class TasksViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TaskCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -104,7 +144,7 @@ class TasksViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TaskCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -129,80 +169,69 @@ class TasksViewSet(viewsets.ViewSet):
         if not serializer.is_valid():
             return asana_validation_error('Invalid request body')
         
-        request_data = serializer.validated_data
-        data_dict = request_data.get('data', {})
-        
-        # Extract fields
-        name = data_dict.get('name') or request_data.get('name')
-        workspace_gid = data_dict.get('workspace') or request_data.get('workspace')
-        project_gids = data_dict.get('projects') or request_data.get('projects', [])
-        parent_gid = data_dict.get('parent') or request_data.get('parent')
-        assignee_gid = data_dict.get('assignee') or request_data.get('assignee')
-        due_on = data_dict.get('due_on') or request_data.get('due_on')
-        notes = data_dict.get('notes') or request_data.get('notes')
-        
-        if not name:
-            return asana_validation_error('Task name is required')
+        # Resolve references, insert the task and its project memberships
+        # in one transaction
+        try:
+            task_values = task_input(serializer.validated_data)
+            task, projects = create_task(task_values)
+        except TaskWriteError as error:
+            return error.response()
+        
+        # Serialize and return; the new task's relations are already known
+        relations = TaskRelationLoader.for_created(
+            [task], {task.id: projects}, custom_fields=bool(task_values.get('custom_fields'))
+        )
+        response_serializer = TaskResponseSerializer(task, context={'task_relations': relations})
+        data = response_serializer.data
         
-        # Get workspace (required)
-        if not workspace_gid and not project_gids:
-            return asana_validation_error('Workspace or project is required')
+        if opt_fields:
+            data = apply_opt_fields(data, opt_fields)
         
-        if workspace_gid:
-            try:
-                workspace = Workspace.objects.get(gid=workspace_gid)
-            except Workspace.DoesNotExist:
-                return asana_not_found_error('Workspace')
-        else:
-            # Get workspace from first project
-            try:
-                first_project = Project.objects.get(gid=project_gids[0])
-                workspace = first_project.workspace
-            except (Project.DoesNotExist, IndexError):
-                return asana_not_found_error('Project')
-        
-        # Create task
-        task = Task.objects.create(
-            name=name,
-            workspace=workspace,
-            notes=notes,
-            due_on=due_on
-        )
+        return Response(wrap_single_response(data), status=201)
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request: Request) -> Response:
+        """
+        POST /tasks/bulk
+        Creates up to BULK_TASK_LIMIT tasks in one request.
         
-        # Set parent if provided
-        if parent_gid:
-            try:
-                parent = Task.objects.get(gid=parent_gid)
-                task.parent = parent
-                task.save()
-            except Task.DoesNotExist:
-                pass
+        Body:
+        - data: array of task payloads, each with the fields accepted by POST /tasks
         
-        # Set assignee if provided
-        if assignee_gid:
-            try:
-                assignee = User.objects.get(gid=assignee_gid)
-                task.assignee = assignee
-                task.save()
-            except User.DoesNotExist:
-                pass
+        Returns one {status_code, body} result per payload, in the same order.
+        """
+        items = self._bulk_items(request)
+        if not isinstance(items, list):
+            return items
         
-        # Add to projects
-        for project_gid in project_gids:
-            try:
-                project = Project.objects.get(gid=project_gid)
-                TaskProject.objects.get_or_create(task=task, project=project)
-            except Project.DoesNotExist:
-                pass
+        return Response({'data': bulk_create_tasks(items)})
+    
+    @bulk_create.mapping.put
+    def bulk_update(self, request: Request) -> Response:
+        """
+        PUT /tasks/bulk
+        Updates up to BULK_TASK_LIMIT tasks in one request.
         
-        # Serialize and return
-        response_serializer = TaskResponseSerializer(task)
-        data = response_serializer.data
+        Body:
+        - data: array of {gid, name, notes, completed, due_on, assignee};
+          only the fields provided are updated
         
-        if opt_fields:
-            data = apply_opt_fields(data, opt_fields)
+        Returns one {status_code, body} result per payload, in the same order.
+        """
+        items = self._bulk_items(request)
+        if not isinstance(items, list):
+            return items
         
-        return Response(wrap_single_response(data), status=201)
+        return Response({'data': bulk_update_tasks(items)})
+    
+    def _bulk_items(self, request: Request):
+        """Return the payload list of a bulk request, or an error response."""
+        items = request.data.get('data') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return asana_validation_error('data must be a non-empty array of tasks')
+        if len(items) > BULK_TASK_LIMIT:
+            return asana_validation_error(f'A bulk request may contain at most {BULK_TASK_LIMIT} tasks')
+        return items
     
     def retrieve(self, request: Request, pk: str = None) -> Response:
         """
@@ -213,19 +242,19 @@ class TasksViewSet(viewsets.ViewSet):
         if not task_gid:
             return asana_not_found_error('Task')
         
-        opt_pretty = request.query_params.get('opt_pretty', 'false').lower() == 'true'
         opt_fields = request.query_params.getlist('opt_fields')
         if not opt_fields:
             opt_fields_str = request.query_params.get('opt_fields')
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TaskResponseSerializer, opt_fields)
         try:
-            task = Task.objects.get(gid=task_gid)
+            task = projection.apply(Task.objects).get(gid=task_gid)
         except Task.DoesNotExist:
             return asana_not_found_error('Task')
         
-        serializer = TaskResponseSerializer(task)
+        serializer = projection.serializer(task)
         data = serializer.data
         
         if opt_fields:
@@ -261,29 +290,29 @@ class TasksViewSet(viewsets.ViewSet):
         
         # Update task fields
         request_data = serializer.validated_data
-        data_dict = request_data.get('data', {})
-        
-        if 'name' in data_dict:
-            task.name = data_dict['name']
-        if 'notes' in data_dict:
-            task.notes = data_dict['notes']
-        if 'completed' in data_dict:
-            task.completed = data_dict['completed']
-            if data_dict['completed']:
-                task.completed_at = timezone.now()
-        if 'due_on' in data_dict:
-            task.due_on = data_dict['due_on']
-        if 'assignee' in data_dict:
-            assignee_gid = data_dict['assignee']
-            if assignee_gid:
-                try:
-                    task.assignee = User.objects.get(gid=assignee_gid)
-                except User.DoesNotExist:
-                    pass
-            else:
-                task.assignee = None
+        try:
+            data_dict = clean_task_changes(request_data.get('data') or {})
+        except TaskWriteError as error:
+            return asana_validation_error(str(error))
+        
+        users = {}
+        if data_dict.get('assignee'):
+            users = {user.gid: user for user in User.objects.filter(gid=data_dict['assignee'])}
+        old_state = task_state(task)
+        old_values = field_values(task)
+        fields = apply_task_changes(task, data_dict, users)
         
-        task.save()
+        try:
+            with transaction.atomic():
+                # Write only the changed columns so counters maintained with F()
+                # updates (num_subtasks) are never overwritten
+                task.save(update_fields=fields + ['modified_at'])
+                tasks_changed([(task, old_state)])
+                announce_changes([(task, old_values)])
+                if data_dict.get('custom_fields') is not None:
+                    set_task_values([(task, data_dict['custom_fields'])])
+        except CustomFieldValueError as error:
+            return asana_validation_error(str(error))
         
         response_serializer = TaskResponseSerializer(task)
         data = response_serializer.data
@@ -306,9 +335,262 @@ class TasksViewSet(viewsets.ViewSet):
         
         try:
             task = Task.objects.get(gid=task_gid)
-            task.delete()
         except Task.DoesNotExist:
             return asana_not_found_error('Task')
         
+        # Delete the task with its whole subtree
+        delete_task_tree(task)
+        
         # Returns empty data record
         return Response({'data': {}})
+    
+    @action(detail=True, methods=['get'], url_path='subtasks')
+    def subtasks(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /tasks/{task_gid}/subtasks
+        Returns the compact records for the subtasks of a task.
+        
+        Query params:
+        - depth: int or 'all' (optional, default 1) - levels of subtasks to
+          return; with more than one level each record includes its parent
+        - opt_fields, limit, offset
+        
+        Subtasks are ordered shallowest first, then by creation.
+        """
+        task_gid = pk
+        if not task_gid:
+            return asana_not_found_error('Task')
+        
+        limit = request.query_params.get('limit')
+        depth = request.query_params.get('depth', '1')
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        if depth != 'all' and not (depth.isdigit() and int(depth) >= 1):
+            return asana_validation_error("depth must be a positive integer or 'all'")
+        
+        task_id = Task.objects.filter(gid=task_gid).values_list('id', flat=True).first()
+        if task_id is None:
+            return asana_not_found_error('Task')
+        
+        # One range scan on the closure table's (ancestor, depth) index;
+        # both conditions go in one filter() so they apply to the same join
+        links = {'ancestor_links__ancestor_id': task_id}
+        if depth != 'all':
+            links['ancestor_links__depth__lte'] = int(depth)
+        queryset = Task.objects.filter(**links).order_by('ancestor_links__depth', 'id')
+        
+        if depth == '1':
+            projection = compile_opt_fields(TaskCompactSerializer, opt_fields)
+        else:
+            projection = compile_opt_fields(SubtaskCompactSerializer, opt_fields)
+            queryset = queryset.select_related('parent')
+        queryset = projection.apply(queryset)
+        
+        # Apply pagination
+        paginator = AsanaPagination()
+        paginator.page_size = int(limit) if limit else 50
+        
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = projection.serializer(page, many=True)
+        data = serializer.data
+        
+        if opt_fields:
+            data = [apply_opt_fields(item, opt_fields) for item in data]
+        
+        return paginator.get_paginated_response(data)
+    
+    @action(detail=True, methods=['get'], url_path='dependencies')
+    def dependencies(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /tasks/{task_gid}/dependencies
+        Returns the compact representations of all of the dependencies of a task.
+        
+        Query params:
+        - transitive: bool (optional) - return the whole blocked-by chain,
+          nearest dependencies first
+        - opt_fields, limit, offset
+        """
+        return self._dependency_list(request, pk, 'dependencies')
+    
+    @action(detail=True, methods=['get'], url_path='dependents')
+    def dependents(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /tasks/{task_gid}/dependents
+        Returns the compact representations of all of the dependents of a task.
+        """
+        return self._dependency_list(request, pk, 'dependents')
+    
+    def _dependency_list(self, request: Request, task_gid: str, direction: str) -> Response:
+        if not task_gid:
+            return asana_not_found_error('Task')
+        
+        limit = request.query_params.get('limit')
+        transitive = request.query_params.get('transitive', 'false').lower() == 'true'
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        task = Task.objects.filter(gid=task_gid).only('id', 'workspace_id').first()
+        if task is None:
+            return asana_not_found_error('Task')
+        
+        projection = compile_opt_fields(TaskCompactSerializer, opt_fields)
+        if direction == 'dependencies' and transitive:
+            # Walk the cached dependency graph instead of querying per level
+            chain = [task_id for task_id, _ in workspace_graph(task.workspace_id).blocked_by(task.id)]
+            tasks = projection.apply(Task.objects.filter(id__in=chain)).in_bulk()
+            queryset = [tasks[task_id] for task_id in chain if task_id in tasks]
+        elif direction == 'dependencies':
+            queryset = projection.apply(Task.objects.filter(dependents__task=task).order_by('dependents__id'))
+        else:
+            queryset = projection.apply(Task.objects.filter(dependencies__depends_on=task).order_by('dependencies__id'))
+        
+        # Apply pagination
+        paginator = AsanaPagination()
+        paginator.page_size = int(limit) if limit else 50
+        
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = projection.serializer(page, many=True)
+        data = serializer.data
+        
+        if opt_fields:
+            data = [apply_opt_fields(item, opt_fields) for item in data]
+        
+        return paginator.get_paginated_response(data)
+    
+    @action(detail=True, methods=['post'], url_path='addDependencies')
+    def add_dependencies(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /tasks/{task_gid}/addDependencies
+        Marks a set of tasks as dependencies of this task. Rejected if it
+        would create a dependency cycle.
+        """
+        return self._modify_dependencies(request, pk, 'dependencies', add=True)
+    
+    @action(detail=True, methods=['post'], url_path='removeDependencies')
+    def remove_dependencies(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /tasks/{task_gid}/removeDependencies
+        Unlinks a set of dependencies from this task.
+        """
+        return self._modify_dependencies(request, pk, 'dependencies', add=False)
+    
+    @action(detail=True, methods=['post'], url_path='addDependents')
+    def add_dependents(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /tasks/{task_gid}/addDependents
+        Marks a set of tasks as dependents of this task. Rejected if it
+        would create a dependency cycle.
+        """
+        return self._modify_dependencies(request, pk, 'dependents', add=True)
+    
+    @action(detail=True, methods=['post'], url_path='removeDependents')
+    def remove_dependents(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /tasks/{task_gid}/removeDependents
+        Unlinks a set of dependents from this task.
+        """
+        return self._modify_dependencies(request, pk, 'dependents', add=False)
+    
+    def _modify_dependencies(self, request: Request, task_gid: str, direction: str, add: bool) -> Response:
+        if not task_gid:
+            return asana_not_found_error('Task')
+        
+        # Validate request body
+        if direction == 'dependencies':
+            serializer = ModifyDependenciesForTaskRequestSerializer(data=request.data)
+        else:
+            serializer = ModifyDependentsForTaskRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        gids = data_dict.get(direction) or request_data.get(direction)
+        if not isinstance(gids, list) or not gids:
+            return asana_validation_error(f'{direction} must be a non-empty array of task gids')
+        
+        try:
+            task = Task.objects.get(gid=task_gid)
+        except Task.DoesNotExist:
+            return asana_not_found_error('Task')
+        
+        others = dict(Task.objects.filter(gid__in=gids, workspace_id=task.workspace_id).values_list('gid', 'id'))
+        if len(others) < len(set(gids)):
+            return asana_not_found_error('Task')
+        
+        if direction == 'dependencies':
+            edges = [(task.id, other_id) for other_id in others.values()]
+        else:
+            edges = [(other_id, task.id) for other_id in others.values()]
+        
+        with transaction.atomic():
+            if add:
+                try:
+                    add_dependency_edges(task.workspace_id, edges)
+                except DependencyCycleError as error:
+                    return asana_validation_error(str(error))
+            else:
+                remove_dependency_edges(task.workspace_id, edges)
+        
+        # Returns empty data record
+        return Response({'data': {}})
+    
+    @action(detail=True, methods=['post'], url_path='setParent')
+    def set_parent(self, request: Request, pk: str = None) -> Response:
+        """
+        POST /tasks/{task_gid}/setParent
+        Changes the parent of a task; a null parent makes it a top-level task.
+        Its subtasks move with it.
+        """
+        task_gid = pk
+        if not task_gid:
+            return asana_not_found_error('Task')
+        
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        # Validate request body
+        serializer = SetParentForTaskRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return asana_validation_error('Invalid request body')
+        
+        request_data = serializer.validated_data
+        data_dict = request_data.get('data') or {}
+        if 'parent' not in data_dict and 'parent' not in request_data:
+            return asana_validation_error('parent is required')
+        parent_gid = data_dict.get('parent') or request_data.get('parent')
+        
+        try:
+            task = Task.objects.get(gid=task_gid)
+        except Task.DoesNotExist:
+            return asana_not_found_error('Task')
+        
+        parent = None
+        if parent_gid:
+            try:
+                parent = Task.objects.get(gid=parent_gid)
+            except Task.DoesNotExist:
+                return asana_not_found_error('Task')
+        
+        try:
+            set_parent(task, parent)
+        except TaskHierarchyError as error:
+            return asana_validation_error(str(error))
+        
+        response_serializer = TaskResponseSerializer(task)
+        data = response_serializer.data
+        
+        if opt_fields:
+            data = apply_opt_fields(data, opt_fields)
+        
+        return Response(wrap_single_response(data))
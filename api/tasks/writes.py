@@ -0,0 +1,436 @@
+"""
+Batched write path for task creation and updates.
+
+Every gid referenced by the task payloads (workspace, parent, assignee,
+projects) is resolved with one query per resource type. Each task is then
+built with its final field values and inserted in a single statement,
+followed by one bulk_create for its TaskProject rows, all inside one
+transaction.
+
+The bulk endpoints run the same pipeline over many payloads: references
+for the whole request are resolved with one query per type, and rows are
+written with bulk_create/bulk_update in chunks. Results are positional,
+with per-item errors.
+
+Usage:
+    values = task_input(serializer.validated_data)
+    try:
+        task, projects = create_task(values)
+    except TaskWriteError as error:
+        return error.response()
+
+    results = bulk_create_tasks(items)  # [{'status_code': 201, 'body': {...}}, ...]
+
+Updates announce the task fields they changed with task_fields_changed
+(`changes`: (task_id, project_id, field, new value) tuples, project_id set
+for per-project fields such as section and None for the task's own), sent
+inside the writing transaction.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from rest_framework import serializers
+
+from common.errors import asana_not_found_error, asana_validation_error
+from common.ranking import keys_between, place
+from .counts import add_memberships, task_state, tasks_changed
+from .hierarchy import link_new_tasks
+from .models import Task, TaskProject
+
+
+# Payload fields read by task creation (from `data` or the top level)
+TASK_INPUT_FIELDS = ('name', 'workspace', 'projects', 'parent', 'assignee', 'due_on', 'notes', 'custom_fields')
+
+# Maximum number of task payloads accepted by one bulk request
+BULK_TASK_LIMIT = 1000
+
+# Rows per bulk_create/bulk_update statement group
+BULK_CHUNK_SIZE = 500
+
+# Task fields announced by task_fields_changed, with the attribute holding
+# each one's value
+ANNOUNCED_FIELDS = {
+    'name': 'name', 'notes': 'notes', 'due_on': 'due_on', 'completed': 'completed', 'assignee': 'assignee_id',
+}
+
+task_fields_changed = Signal()
+
+
+class TaskWriteError(Exception):
+    """
+    A task payload that cannot be written.
+    `resource` is set when a required referenced resource does not exist.
+    """
+
+    def __init__(self, message: str, resource: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.resource = resource
+
+    def response(self):
+        """Asana-formatted error response for this error."""
+        if self.resource:
+            return asana_not_found_error(self.resource)
+        return asana_validation_error(self.message)
+
+
+def task_input(validated_data: dict) -> dict:
+    """
+    Flatten a validated CreateTaskRequestSerializer payload. Values in the
+    `data` block take precedence over top-level ones.
+    """
+    data_dict = validated_data.get('data') or {}
+    values = {name: data_dict.get(name) or validated_data.get(name) for name in TASK_INPUT_FIELDS}
+    values['projects'] = values['projects'] or []
+    return values
+
+
+def _by_gid(queryset, gids: Iterable[str]) -> Dict[str, models.Model]:
+    """Load objects by gid, in chunks that fit the backend's parameter limit."""
+    gids = list(gids)
+    chunk = connection.features.max_query_params or len(gids) or 1
+    found = {}
+    for start in range(0, len(gids), chunk):
+        found.update((obj.gid, obj) for obj in queryset.filter(gid__in=gids[start:start + chunk]))
+    return found
+
+
+class TaskReferences:
+    """
+    gid -> instance maps for every resource referenced by a set of task
+    inputs, loaded with one query per resource type.
+    """
+
+    def __init__(self, inputs: Iterable[dict]):
+        from api.projects.models import Project
+        from api.users.models import User
+        from api.workspaces.models import Workspace
+
+        workspace_gids, project_gids, parent_gids, user_gids = set(), set(), set(), set()
+        for values in inputs:
+            if values.get('workspace'):
+                workspace_gids.add(values['workspace'])
+            project_gids.update(gid for gid in values.get('projects') or [] if gid)
+            if values.get('parent'):
+                parent_gids.add(values['parent'])
+            if values.get('assignee'):
+                user_gids.add(values['assignee'])
+
+        self.workspaces = _by_gid(Workspace.objects.all(), workspace_gids)
+        # Tasks without a workspace take the first project's workspace
+        self.projects = _by_gid(Project.objects.select_related('workspace'), project_gids)
+        self.parents = _by_gid(Task.objects.only('id', 'gid', 'name', 'workspace_id'), parent_gids)
+        self.users = _by_gid(User.objects.all(), user_gids)
+
+
+def clean_task_input(values: dict) -> dict:
+    """
+    Check the parts of a task input that need no database access and
+    normalize due_on to a date. Raises TaskWriteError.
+    """
+    if not values.get('name'):
+        raise TaskWriteError('Task name is required')
+    if not values.get('workspace') and not values.get('projects'):
+        raise TaskWriteError('Workspace or project is required')
+
+    return dict(values, due_on=_due_on(values.get('due_on')))
+
+
+def clean_task_changes(changes: dict) -> dict:
+    """
+    Normalize the due_on of a PUT /tasks changes dict to a date, as
+    BulkUpdateTaskItemSerializer does for bulk items. Raises TaskWriteError.
+    """
+    if 'due_on' not in changes:
+        return changes
+    return dict(changes, due_on=_due_on(changes['due_on']))
+
+
+def _due_on(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return Task._meta.get_field('due_on').to_python(value)
+    except (TypeError, ValidationError):
+        raise TaskWriteError('due_on must be a date in YYYY-MM-DD format')
+
+
+def build_task(values: dict, refs: TaskReferences) -> Tuple[Task, List]:
+    """
+    Build an unsaved Task from a cleaned input with its final field values,
+    and the projects it belongs to. Unknown parent, assignee and project
+    gids are ignored.
+    """
+    project_gids = values.get('projects') or []
+    if values.get('workspace'):
+        workspace = refs.workspaces.get(values['workspace'])
+        if workspace is None:
+            raise TaskWriteError('Workspace not found', resource='Workspace')
+    else:
+        first_project = refs.projects.get(project_gids[0])
+        if first_project is None:
+            raise TaskWriteError('Project not found', resource='Project')
+        workspace = first_project.workspace
+
+    task = Task(
+        name=values['name'],
+        workspace=workspace,
+        notes=values.get('notes'),
+        due_on=values.get('due_on'),
+        parent=refs.parents.get(values.get('parent')),
+        assignee=refs.users.get(values.get('assignee')),
+    )
+
+    projects = []
+    seen = set()
+    for gid in project_gids:
+        project = refs.projects.get(gid)
+        if project is not None and project.id not in seen:
+            seen.add(project.id)
+            projects.append(project)
+    return task, projects
+
+
+def create_task(values: dict) -> Tuple[Task, List]:
+    """
+    Create one task and its project memberships in a single transaction.
+    Raises TaskWriteError if the payload is invalid.
+    """
+    from api.custom_fields.values import CustomFieldValueError, ValueWriter
+
+    values = clean_task_input(values)
+    with transaction.atomic():
+        refs = TaskReferences([values])
+        task, projects = build_task(values, refs)
+        task.save()
+        if values.get('custom_fields'):
+            writer = ValueWriter([values['custom_fields']])
+            try:
+                writer.write([(task.pk, writer.clean(task.workspace_id, values['custom_fields']))])
+            except CustomFieldValueError as error:
+                raise TaskWriteError(str(error))
+        if projects:
+            memberships = TaskProject.objects.bulk_create(_ranked_memberships([(task, project) for project in projects]))
+            add_memberships(memberships)
+        link_new_tasks([task])
+    return task, projects
+
+
+def _ranked_memberships(pairs: List[Tuple[Task, Any]]) -> List[TaskProject]:
+    """
+    Build TaskProject rows for (task, project) pairs, ranked at the end of
+    each project's unsectioned tasks in the given order. Reads one key per
+    project.
+    """
+    memberships = [TaskProject(task=task, project=project) for task, project in pairs]
+    by_project: Dict[int, List[TaskProject]] = {}
+    for membership in memberships:
+        by_project.setdefault(membership.project_id, []).append(membership)
+    for rows in by_project.values():
+        first = place(rows[0].group())
+        for membership, key in zip(rows, [first] + keys_between(first, None, len(rows) - 1)):
+            membership.rank = key
+    return memberships
+
+
+def apply_task_changes(task: Task, changes: dict, users: Dict[str, models.Model]) -> List[str]:
+    """
+    Apply PUT /tasks changes to a task, resolving assignee gids from
+    `users`. An unknown assignee gid is ignored; a null one unassigns.
+    Returns the names of the fields that were set.
+    """
+    fields = []
+    for name in ('name', 'notes', 'due_on'):
+        if name in changes:
+            setattr(task, name, changes[name])
+            fields.append(name)
+    if 'completed' in changes:
+        task.completed = changes['completed']
+        fields.append('completed')
+        if changes['completed']:
+            task.completed_at = timezone.now()
+            fields.append('completed_at')
+    if 'assignee' in changes:
+        assignee_gid = changes['assignee']
+        if not assignee_gid:
+            task.assignee = None
+            fields.append('assignee')
+        elif assignee_gid in users:
+            task.assignee = users[assignee_gid]
+            fields.append('assignee')
+    return fields
+
+
+def field_values(task: Task) -> Dict[str, Any]:
+    """Current values of a task's announced fields."""
+    return {field: getattr(task, attname) for field, attname in ANNOUNCED_FIELDS.items()}
+
+
+def announce_changes(changes: Iterable[Tuple[Task, Dict[str, Any]]]) -> None:
+    """
+    Send task_fields_changed for the fields of tasks that differ from their
+    field_values() before the change, given (task, values before) pairs.
+    """
+    announced = [
+        (task.pk, None, field, value)
+        for task, before in changes
+        for field, value in field_values(task).items()
+        if value != before[field]
+    ]
+    if announced:
+        task_fields_changed.send(sender=Task, changes=announced)
+
+
+def _task_result(task: Task, status_code: int) -> Dict[str, Any]:
+    return {
+        'status_code': status_code,
+        'body': {'data': {'gid': task.gid, 'resource_type': task.resource_type, 'name': task.name}},
+    }
+
+
+def _error_result(error: TaskWriteError) -> Dict[str, Any]:
+    response = error.response()
+    return {'status_code': response.status_code, 'body': response.data}
+
+
+def _validate_items(serializer, items: List[Any], results: List) -> Iterable[Tuple[int, dict]]:
+    """
+    Validate payloads with one serializer instance, as ListSerializer does,
+    so its fields are built once rather than once per item. Invalid items
+    get an error result; (index, validated_data) is yielded for the others.
+    """
+    for i, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise serializers.ValidationError('Expected an object')
+            yield i, serializer.run_validation(item)
+        except serializers.ValidationError:
+            results[i] = _error_result(TaskWriteError('Invalid request body'))
+
+
+def bulk_create_tasks(items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Create tasks from a list of payloads with CreateTaskRequestSerializer
+    semantics. Returns one {status_code, body} result per payload, in order.
+    """
+    from api.custom_fields.values import CustomFieldValueError, ValueWriter
+    from api.events.capture import emit_many
+    from api.typeahead.index import index_resources
+    from .serializers import CreateTaskRequestSerializer
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    cleaned = {}
+    for i, validated_data in _validate_items(CreateTaskRequestSerializer(), items, results):
+        try:
+            cleaned[i] = clean_task_input(task_input(validated_data))
+        except TaskWriteError as error:
+            results[i] = _error_result(error)
+
+    with transaction.atomic():
+        refs = TaskReferences(cleaned.values())
+        writer = ValueWriter(values['custom_fields'] for values in cleaned.values() if values.get('custom_fields'))
+        built = {}
+        custom_fields = {}
+        for i, values in cleaned.items():
+            try:
+                built[i] = build_task(values, refs)
+                if values.get('custom_fields'):
+                    custom_fields[i] = writer.clean(built[i][0].workspace_id, values['custom_fields'])
+            except CustomFieldValueError as error:
+                del built[i]
+                results[i] = _error_result(TaskWriteError(str(error)))
+            except TaskWriteError as error:
+                results[i] = _error_result(error)
+
+        tasks = [task for task, _ in built.values()]
+        Task.objects.bulk_create(tasks, batch_size=BULK_CHUNK_SIZE)
+        if any(task.pk is None for task in tasks):
+            # Backends that cannot return ids from a bulk insert
+            ids = {gid: pk for gid, pk in Task.objects.filter(
+                gid__in=[task.gid for task in tasks]
+            ).values_list('gid', 'id')}
+            for task in tasks:
+                task.pk = ids[task.gid]
+
+        memberships = TaskProject.objects.bulk_create(
+            _ranked_memberships([(task, project) for task, projects in built.values() for project in projects]),
+            batch_size=BULK_CHUNK_SIZE,
+        )
+        add_memberships(memberships)
+        writer.write((built[i][0].pk, cleaned_values) for i, cleaned_values in custom_fields.items())
+        link_new_tasks(tasks)
+        # bulk_create sends no post_save signals
+        emit_many('added', tasks)
+        index_resources('task', [(task.gid, task.name, [task.workspace_id]) for task in tasks], replace=False)
+
+    for i, (task, _) in built.items():
+        results[i] = _task_result(task, 201)
+    return results
+
+
+def bulk_update_tasks(items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Update tasks from a list of {gid, ...changes} payloads with PUT /tasks
+    semantics. Returns one {status_code, body} result per payload, in order.
+    """
+    from api.custom_fields.values import CustomFieldValueError, ValueWriter
+    from api.events.capture import emit_many
+    from api.typeahead.index import index_resources
+    from api.users.models import User
+    from .serializers import BulkUpdateTaskItemSerializer
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    changes = dict(_validate_items(BulkUpdateTaskItemSerializer(), items, results))
+
+    with transaction.atomic():
+        tasks = _by_gid(Task.objects.all(), {values['gid'] for values in changes.values()})
+        users = _by_gid(User.objects.all(), {
+            values['assignee'] for values in changes.values() if values.get('assignee')
+        })
+
+        writer = ValueWriter(values['custom_fields'] for values in changes.values() if values.get('custom_fields'))
+        custom_fields = []
+
+        updated = {}
+        fields = set()
+        # State and field values of each task before its first change, for
+        # the project counts and the change announcement
+        before = {}
+        before_values = {}
+        for i, values in changes.items():
+            task = tasks.get(values['gid'])
+            if task is None:
+                results[i] = _error_result(TaskWriteError('Task not found', resource='Task'))
+                continue
+            if values.get('custom_fields') is not None:
+                try:
+                    custom_fields.append((task.pk, writer.clean(task.workspace_id, values['custom_fields'])))
+                except CustomFieldValueError as error:
+                    results[i] = _error_result(TaskWriteError(str(error)))
+                    continue
+            before.setdefault(task.pk, task_state(task))
+            before_values.setdefault(task.pk, field_values(task))
+            fields.update(apply_task_changes(task, values, users))
+            updated[i] = task
+
+        if updated and fields:
+            # bulk_update does not apply auto_now
+            now = timezone.now()
+            for task in updated.values():
+                task.modified_at = now
+            unique_tasks = list({task.pk: task for task in updated.values()}.values())
+            Task.objects.bulk_update(unique_tasks, sorted(fields) + ['modified_at'], batch_size=BULK_CHUNK_SIZE)
+            tasks_changed((task, before[task.pk]) for task in unique_tasks)
+            announce_changes((task, before_values[task.pk]) for task in unique_tasks)
+            emit_many('changed', unique_tasks)
+            if 'name' in fields:
+                index_resources('task', [(task.gid, task.name, [task.workspace_id]) for task in unique_tasks])
+        writer.write(custom_fields)
+
+    for i, task in updated.items():
+        results[i] = _task_result(task, 200)
+    return results
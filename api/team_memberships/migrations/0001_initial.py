@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='team_membership', help_text='The base type of this resource.', max_length=50)),
+                ('is_admin', models.BooleanField(default=False, help_text='Whether the user is an admin of the team.')),
+                ('is_guest', models.BooleanField(default=False, help_text='Whether the user is a guest of the team.')),
+                ('is_limited_access', models.BooleanField(default=False, help_text='Whether the user has limited access to the team.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'team_memberships',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
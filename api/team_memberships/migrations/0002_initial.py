@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('team_memberships', '0001_initial'),
+        ('users', '0001_initial'),
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammembership',
+            name='team',
+            field=models.ForeignKey(help_text='The team in the membership.', on_delete=django.db.models.deletion.CASCADE, related_name='team_memberships', to='teams.team'),
+        ),
+        migrations.AddField(
+            model_name='teammembership',
+            name='user',
+            field=models.ForeignKey(help_text='The user in the team membership.', on_delete=django.db.models.deletion.CASCADE, related_name='team_memberships', to='users.user'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='teammembership',
+            unique_together={('user', 'team')},
+        ),
+    ]
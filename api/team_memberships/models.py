@@ -52,6 +52,10 @@ class TeamMembership(models.Model):
         db_table = 'team_memberships'
         unique_together = ['user', 'team']
         ordering = ['-created_at']
+        indexes = [
+            # GET /users?team=... (the unique index leads with user)
+            models.Index(fields=['team', 'user'], name='team_memberships_team_user_idx'),
+        ]
 
     def __str__(self):
         return f"Team Membership {self.gid}"
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('workspaces', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='team', help_text='The base type of this resource.', max_length=50)),
+                ('name', models.CharField(help_text='The name of the team.', max_length=255)),
+                ('description', models.TextField(blank=True, help_text='The description of the team.', null=True)),
+                ('html_description', models.TextField(blank=True, help_text='The description of the team with formatting as HTML.', null=True)),
+                ('permalink_url', models.URLField(blank=True, help_text='A url that points directly to the object within Asana.', null=True)),
+                ('visibility', models.CharField(choices=[('secret', 'Secret'), ('request_to_join', 'Request To Join'), ('public_to_organization', 'Public To Organization')], default='secret', help_text='The visibility of the team.', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(help_text='The organization/workspace this team belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'teams',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Team
 from .serializers import (
@@ -100,12 +101,13 @@ class TeamsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TeamResponseSerializer, opt_fields)
         try:
-            team = Team.objects.get(gid=team_gid)
+            team = projection.apply(Team.objects).get(gid=team_gid)
         except Team.DoesNotExist:
             return asana_not_found_error('Team')
         
-        serializer = TeamResponseSerializer(team)
+        serializer = projection.serializer(team)
         data = serializer.data
         
         if opt_fields:
@@ -185,13 +187,16 @@ class TeamsViewSet(viewsets.ViewSet):
         # Query teams for this workspace
         queryset = Team.objects.filter(organization=workspace).order_by('name')
         
+        projection = compile_opt_fields(TeamCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TeamCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -199,7 +204,7 @@ class TeamsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TeamCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
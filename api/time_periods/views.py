@@ -8,6 +8,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import TimePeriod
 from .serializers import (
@@ -39,6 +40,8 @@ class TimePeriodsViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = TimePeriod.objects.all()
+        projection = compile_opt_fields(TimePeriodCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +49,7 @@ class TimePeriodsViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TimePeriodCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +57,7 @@ class TimePeriodsViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TimePeriodCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,12 +81,13 @@ class TimePeriodsViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TimePeriodResponseSerializer, opt_fields)
         try:
-            resource = TimePeriod.objects.get(gid=resource_gid)
+            resource = projection.apply(TimePeriod.objects).get(gid=resource_gid)
         except TimePeriod.DoesNotExist:
             return asana_not_found_error('TimePeriod')
         
-        serializer = TimePeriodResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TimeTrackingEntriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.time_tracking_entries'
+
+    def ready(self):
+        from .totals import connect_signals
+        connect_signals()
@@ -0,0 +1,17 @@
+"""
+Recompute tracked time totals of tasks from their time tracking entries.
+"""
+from django.core.management.base import BaseCommand
+
+from api.time_tracking_entries.totals import rebuild_totals
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Task.actual_time_minutes from the time tracking entries. '
+        'Run rebuild_task_counts afterwards to refresh the project and section totals.'
+    )
+
+    def handle(self, *args, **options):
+        tracked = rebuild_totals()
+        self.stdout.write(f'Recomputed tracked time of {tracked:,} tasks')
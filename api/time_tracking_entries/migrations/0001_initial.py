@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        ('users', '0001_initial'),
+        ('workspaces', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeTrackingEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='time_tracking_entry', help_text='The base type of this resource.', max_length=50)),
+                ('duration_minutes', models.IntegerField(help_text='Time in minutes tracked by the entry.', validators=[django.core.validators.MinValueValidator(0)])),
+                ('entered_on', models.DateField(help_text='The date on which this entry is entered.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task', models.ForeignKey(help_text='The task this time tracking entry belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='time_tracking_entries', to='tasks.task')),
+                ('user', models.ForeignKey(help_text='The user who created this time tracking entry.', on_delete=django.db.models.deletion.CASCADE, related_name='time_tracking_entries', to='users.user')),
+                ('workspace', models.ForeignKey(help_text='The workspace this time tracking entry belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='time_tracking_entries', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'time_tracking_entries',
+                'ordering': ['-entered_on', '-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('time_tracking_entries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timetrackingentry',
+            index=models.Index(fields=['workspace', 'entered_on', 'user', 'task', 'duration_minutes'], name='time_entries_report_idx'),
+        ),
+    ]
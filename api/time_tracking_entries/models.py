@@ -55,6 +55,15 @@ class TimeTrackingEntry(models.Model):
     class Meta:
         db_table = 'time_tracking_entries'
         ordering = ['-entered_on', '-created_at']
+        indexes = [
+            # GET /time_tracking_entries/report: a workspace's entries in a date
+            # range, covering the columns reports group and sum so the range
+            # scan never reads the table
+            models.Index(
+                fields=['workspace', 'entered_on', 'user', 'task', 'duration_minutes'],
+                name='time_entries_report_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Time Entry {self.gid} - {self.duration_minutes} min"
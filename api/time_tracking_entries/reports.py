@@ -0,0 +1,220 @@
+"""
+Time tracking report engine behind GET /time_tracking_entries/report.
+
+Entries in a workspace and date range are first summed by the database
+over the one key column the requested dimensions need (user_id or
+task_id), and those partial sums read straight from the DB cursor into
+NumPy arrays; reports needing both keys read the entries unsummed, as
+few entries share a (task, user) pair. Reports by week sum each week of the range with its own
+query, an index range scan on (workspace, entered_on) grouped by the
+other key, so the database collapses a user's or task's entries of a
+week without per-row date functions and only (key, week) sums are
+transferred. The rest of the grouping happens in NumPy: each dimension is
+factorized with np.unique and the minutes summed per (row, column) cell
+with np.bincount. Projects, which the database would group with a
+membership join, are derived there from the partial sums.
+
+Pivoted reports read close to one row per entry, so their range is
+limited to MAX_PIVOT_DAYS; a year of a busy workspace is only reported
+by one dimension.
+
+Dimensions:
+- user, task: the entry's user and task,
+- project: each project of the entry's task (an entry on a task in two
+  projects counts in both), joined in NumPy from one TaskProject query,
+- week: the Monday of the week the entry was entered on.
+
+Usage:
+    report = TimeReport(workspace, start_on, end_on, 'user', columns='week')
+    data = report.run()
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.db import connection
+from django.db.models import Sum
+
+from common.columns import read_columns
+from .models import TimeTrackingEntry
+
+
+DIMENSIONS = ('user', 'task', 'project', 'week')
+
+# Largest rows x columns pivot a report may return
+MAX_PIVOT_CELLS = 2_000_000
+
+# Longest date range of a pivoted report (a quarter)
+MAX_PIVOT_DAYS = 92
+
+EPOCH = date(1970, 1, 1)
+
+
+class TimeReportError(ValueError):
+    """Invalid report parameters."""
+
+
+def week_starts(start_on: date, end_on: date) -> List[date]:
+    """Mondays of the weeks overlapping start_on..end_on."""
+    monday = start_on - timedelta(days=start_on.weekday())
+    return [monday + timedelta(weeks=week) for week in range((end_on - monday).days // 7 + 1)]
+
+
+def expand_by_project(workspace, task_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Join rows to the projects of their tasks, reading the workspace's task
+    memberships as columns. Returns (row index, project id) arrays with one
+    element per (row, project) pair; rows of tasks in no project are
+    dropped.
+    """
+    from api.tasks.models import TaskProject
+
+    links = read_columns(TaskProject.objects.filter(task__workspace=workspace), ('task_id', 'project_id'))
+    order = np.argsort(links['task_id'], kind='stable')
+    link_tasks, link_projects = links['task_id'][order], links['project_id'][order]
+
+    first = np.searchsorted(link_tasks, task_ids, side='left')
+    counts = np.searchsorted(link_tasks, task_ids, side='right') - first
+    entry_index = np.repeat(np.arange(len(task_ids)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return entry_index, link_projects[np.repeat(first, counts) + offsets]
+
+
+class TimeReport:
+    """
+    Total minutes of a workspace's time tracking entries between start_on
+    and end_on (inclusive), grouped by one dimension and optionally
+    pivoted by a second one.
+    """
+
+    def __init__(self, workspace, start_on: date, end_on: date, rows: str, columns: Optional[str] = None):
+        if rows not in DIMENSIONS:
+            raise TimeReportError(f"group_by must be one of {', '.join(DIMENSIONS)}")
+        if columns is not None and (columns not in DIMENSIONS or columns == rows):
+            raise TimeReportError(f"pivot must be one of {', '.join(DIMENSIONS)} and differ from group_by")
+        if start_on > end_on:
+            raise TimeReportError('start_on must not be after end_on')
+        if columns is not None and (end_on - start_on).days >= MAX_PIVOT_DAYS:
+            raise TimeReportError(f'A pivoted report may span at most {MAX_PIVOT_DAYS} days')
+        self.workspace = workspace
+        self.start_on = start_on
+        self.end_on = end_on
+        self.rows = rows
+        self.columns = columns
+
+    def entries(self) -> Dict[str, np.ndarray]:
+        """
+        Minutes per distinct combination of the key columns the report's
+        dimensions need, summed by the database so only those combinations
+        are transferred. Week reports get one query per week, and a 'week'
+        column of Mondays as days since the epoch.
+        """
+        needed = {'user': 'user_id', 'task': 'task_id', 'project': 'task_id'}
+        dimensions = (self.rows, self.columns)
+        # A week report with no other dimension groups each week by its
+        # (single) workspace
+        keys = tuple(dict.fromkeys(needed[name] for name in dimensions if name in needed)) or ('workspace_id',)
+        if 'week' not in dimensions:
+            return self._minutes(self.start_on, self.end_on, keys)
+
+        weeks = []
+        for monday in week_starts(self.start_on, self.end_on):
+            entries = self._minutes(max(monday, self.start_on), min(monday + timedelta(days=6), self.end_on), keys)
+            entries['week'] = np.full(len(entries['minutes']), (monday - EPOCH).days, dtype=np.int64)
+            weeks.append(entries)
+        return {name: np.concatenate([entries[name] for entries in weeks]) for name in weeks[0]}
+
+    def _minutes(self, start_on: date, end_on: date, keys: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+        queryset = TimeTrackingEntry.objects.filter(
+            workspace=self.workspace, entered_on__gte=start_on, entered_on__lte=end_on
+        )
+        if len(keys) > 1:
+            # Few entries share both a task and a user, so summing them in
+            # the database sorts every row for almost no fewer rows: read
+            # the entries as they are
+            entries = read_columns(queryset, keys + ('duration_minutes',))
+            entries['minutes'] = entries.pop('duration_minutes')
+            return entries
+        queryset = queryset.values(*keys).annotate(minutes=Sum('duration_minutes'))
+        return read_columns(queryset, keys + ('minutes',))
+
+    def run(self) -> dict:
+        entries = self.entries()
+        minutes = entries['minutes']
+        keys = {
+            'user': lambda: entries['user_id'],
+            'task': lambda: entries['task_id'],
+            'week': lambda: entries['week'],
+        }
+        total_minutes = int(minutes.sum())
+
+        if 'project' in (self.rows, self.columns):
+            entry_index, projects = expand_by_project(self.workspace, entries['task_id'])
+            dimension_keys = {'project': projects}
+            for name in (self.rows, self.columns):
+                if name in keys:
+                    dimension_keys[name] = keys[name]()[entry_index]
+            minutes = minutes[entry_index]
+        else:
+            dimension_keys = {name: keys[name]() for name in (self.rows, self.columns) if name}
+
+        row_keys, row_index = np.unique(dimension_keys[self.rows], return_inverse=True)
+        if self.columns is None:
+            totals = np.bincount(row_index, weights=minutes, minlength=len(row_keys))
+            order = np.argsort(-totals, kind='stable')
+            labels = self._labels(self.rows, row_keys)
+            return {
+                'start_on': self.start_on, 'end_on': self.end_on, 'total_minutes': total_minutes,
+                'group_by': self.rows,
+                'rows': [
+                    {self.rows: labels[i], 'total_minutes': int(totals[i])}
+                    for i in order
+                ],
+            }
+
+        column_keys, column_index = np.unique(dimension_keys[self.columns], return_inverse=True)
+        cells = len(row_keys) * len(column_keys)
+        if cells > MAX_PIVOT_CELLS:
+            raise TimeReportError('Report too large to pivot; narrow the date range or choose other dimensions')
+        pivot = np.bincount(
+            row_index * len(column_keys) + column_index, weights=minutes, minlength=cells
+        ).reshape(len(row_keys), len(column_keys)).astype(np.int64)
+        totals = pivot.sum(axis=1)
+        order = np.argsort(-totals, kind='stable')
+        row_labels = self._labels(self.rows, row_keys)
+        return {
+            'start_on': self.start_on, 'end_on': self.end_on, 'total_minutes': total_minutes,
+            'group_by': self.rows,
+            'pivot': self.columns,
+            'columns': self._labels(self.columns, column_keys),
+            'column_totals': pivot.sum(axis=0).tolist(),
+            'rows': [
+                {self.rows: row_labels[i], 'total_minutes': int(totals[i]), 'minutes': pivot[i].tolist()}
+                for i in order
+            ],
+        }
+
+    @staticmethod
+    def _labels(dimension: str, keys: np.ndarray) -> List:
+        """Compact resources (or week start dates) for a dimension's keys, one query per resource type."""
+        if dimension == 'week':
+            return [EPOCH + timedelta(days=int(day)) for day in keys]
+        if dimension == 'user':
+            from api.users.models import User as model
+        elif dimension == 'task':
+            from api.tasks.models import Task as model
+        else:
+            from api.projects.models import Project as model
+        ids = keys.tolist()
+        chunk = connection.features.max_query_params or len(ids) or 1
+        names = {}
+        for start in range(0, len(ids), chunk):
+            names.update(
+                (pk, (gid, name)) for pk, gid, name in
+                model.objects.filter(pk__in=ids[start:start + chunk]).values_list('pk', 'gid', 'name')
+            )
+        resource_type = dimension
+        return [
+            {'gid': names[pk][0], 'resource_type': resource_type, 'name': names[pk][1]} if pk in names else None
+            for pk in ids
+        ]
@@ -0,0 +1,109 @@
+"""
+Maintained tracked time totals.
+
+Task.actual_time_minutes is the sum of the task's time tracking entries,
+and the actual_time_minutes of ProjectTaskCount rows the sum over the
+tasks of a project or section (api.tasks.counts). Both are adjusted with
+F() updates, in the same transaction, whenever an entry is saved or
+deleted, so reading a task's or project's tracked time needs no SUM over
+its entries:
+- creating an entry adds its minutes to its task,
+- updating one moves the old minutes off the old task and the new
+  minutes onto the new task (one query reads the stored row first),
+- deleting one subtracts its minutes. Entries deleted along with their
+  task are skipped: the task's counts were already removed in full.
+
+bulk_create() and QuerySet.update() send no signals; run
+rebuild_time_totals after writing entries that way.
+
+Usage:
+    entry_minutes_changed({task.pk: 30})   # 30 more minutes on the task
+    rebuild_totals()                       # recompute every task's total
+"""
+from collections import Counter
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import TimeTrackingEntry
+
+
+def entry_minutes_changed(deltas: Dict[int, float]) -> None:
+    """Add changes of tracked minutes ({task_id: minutes}) to tasks and their project totals."""
+    from api.tasks.counts import time_changed
+    from api.tasks.models import Task
+
+    deltas = {task_id: minutes for task_id, minutes in deltas.items() if minutes}
+    if not deltas:
+        return
+    with transaction.atomic():
+        for task_id, minutes in deltas.items():
+            Task.objects.filter(pk=task_id).update(
+                actual_time_minutes=Coalesce(F('actual_time_minutes'), Value(0.0)) + minutes
+            )
+        time_changed(deltas)
+
+
+def rebuild_totals() -> int:
+    """
+    Recompute Task.actual_time_minutes from the time tracking entries.
+    Tasks without entries keep no total (or 0 if they had one). Returns
+    the number of tasks with entries.
+    """
+    from api.tasks.models import Task
+
+    with transaction.atomic():
+        tracked = Task.objects.filter(pk__in=TimeTrackingEntry.objects.values('task_id'))
+        count = tracked.update(actual_time_minutes=Subquery(
+            TimeTrackingEntry.objects.filter(task=OuterRef('pk')).order_by().values('task').annotate(
+                total=Sum('duration_minutes')
+            ).values('total')[:1]
+        ))
+        Task.objects.filter(actual_time_minutes__isnull=False).exclude(pk__in=tracked.values('pk')).update(
+            actual_time_minutes=0
+        )
+    return count
+
+
+def stored_entry(instance):
+    """
+    The entry's row as it was before the save in progress: (task_id,
+    user_id, entered_on, duration_minutes), or None for a new entry.
+    Read once per save by a pre_save receiver.
+    """
+    return getattr(instance, '_stored', None)
+
+
+def _on_entry_pre_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._stored = None if instance.pk is None else TimeTrackingEntry.objects.filter(
+            pk=instance.pk
+        ).values_list('task_id', 'user_id', 'entered_on', 'duration_minutes').first()
+
+
+def _on_entry_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = Counter({instance.task_id: instance.duration_minutes})
+    previous = stored_entry(instance)
+    if not created and previous is not None:
+        deltas[previous[0]] -= previous[3]
+    entry_minutes_changed(deltas)
+
+
+def _on_entry_delete(sender, instance, origin=None, **kwargs):
+    from api.tasks.models import Task
+
+    if isinstance(origin, Task) or getattr(origin, 'model', None) is Task:
+        return
+    entry_minutes_changed({instance.task_id: -instance.duration_minutes})
+
+
+def connect_signals() -> None:
+    """Adjust tracked time totals as time tracking entries change."""
+    pre_save.connect(_on_entry_pre_save, sender=TimeTrackingEntry, dispatch_uid='time_tracking_entries.totals.pre_save')
+    post_save.connect(_on_entry_save, sender=TimeTrackingEntry, dispatch_uid='time_tracking_entries.totals.save')
+    post_delete.connect(_on_entry_delete, sender=TimeTrackingEntry, dispatch_uid='time_tracking_entries.totals.delete')
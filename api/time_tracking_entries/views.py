@@ -2,12 +2,17 @@
 TimeTrackingEntries views matching FastAPI behavior exactly.
 Implements all time_tracking_entries endpoints from FastAPI time_tracking_entries_api.py
 """
+from datetime import date, timedelta
+
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import TimeTrackingEntry
 from .serializers import (
@@ -39,6 +44,8 @@ class TimeTrackingEntriesViewSet(viewsets.ViewSet):
         
         # Query from database
         queryset = TimeTrackingEntry.objects.all()
+        projection = compile_opt_fields(TimeTrackingEntryCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +53,7 @@ class TimeTrackingEntriesViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TimeTrackingEntryCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +61,7 @@ class TimeTrackingEntriesViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TimeTrackingEntrieCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -78,15 +85,61 @@ class TimeTrackingEntriesViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TimeTrackingEntryResponseSerializer, opt_fields)
         try:
-            resource = TimeTrackingEntry.objects.get(gid=resource_gid)
+            resource = projection.apply(TimeTrackingEntry.objects).get(gid=resource_gid)
         except TimeTrackingEntry.DoesNotExist:
             return asana_not_found_error('TimeTrackingEntry')
         
-        serializer = TimeTrackingEntryResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
             data = apply_opt_fields(data, opt_fields)
         
         return Response(wrap_single_response(data))
+    
+    @action(detail=False, methods=['get'], url_path='report')
+    def report(self, request: Request) -> Response:
+        """
+        GET /time_tracking_entries/report
+        Returns total tracked minutes of a workspace's entries between
+        start_on and end_on (default: the year up to today), grouped by
+        user, task, project or week and optionally pivoted by a second
+        dimension. Pivoted reports span at most MAX_PIVOT_DAYS (default:
+        that many days up to end_on).
+        Query params: workspace (required), start_on, end_on, group_by, pivot, limit
+        """
+        from .reports import MAX_PIVOT_DAYS, TimeReport, TimeReportError
+        from api.workspaces.models import Workspace
+        
+        workspace_gid = request.query_params.get('workspace')
+        try:
+            workspace = Workspace.objects.only('id').get(gid=workspace_gid)
+        except Workspace.DoesNotExist:
+            return asana_not_found_error('Workspace')
+        
+        pivot = request.query_params.get('pivot') or None
+        try:
+            end_on = date.fromisoformat(request.query_params['end_on']) if request.query_params.get('end_on') \
+                else timezone.localdate()
+            start_on = date.fromisoformat(request.query_params['start_on']) if request.query_params.get('start_on') \
+                else end_on - timedelta(days=MAX_PIVOT_DAYS - 1 if pivot else 364)
+        except ValueError:
+            return asana_validation_error('start_on and end_on must be dates (YYYY-MM-DD)')
+        limit = request.query_params.get('limit')
+        if limit is not None and not (limit.isdigit() and int(limit) > 0):
+            return asana_validation_error('limit must be a positive integer')
+        
+        try:
+            data = TimeReport(
+                workspace, start_on, end_on,
+                request.query_params.get('group_by', 'user'),
+                columns=pivot,
+            ).run()
+        except TimeReportError as e:
+            return asana_validation_error(str(e))
+        
+        if limit is not None:
+            data['rows'] = data['rows'][:int(limit)]
+        return Response(wrap_single_response(data))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TypeaheadConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.typeahead'
+
+    def ready(self):
+        from .index import connect_signals
+        connect_signals()
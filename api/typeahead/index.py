@@ -0,0 +1,314 @@
+"""
+Prefix index behind GET /typeahead.
+
+Names of tasks, projects, users, tags, portfolios and goals are split into
+normalized words, and each distinct prefix of those words (up to
+MAX_PREFIX_LENGTH characters) and of the whole normalized name (the words
+joined by spaces, up to MAX_NAME_PREFIX_LENGTH characters) stored in
+TypeaheadPrefix, one row per prefix, resource and workspace: a trie of the
+workspace's names whose nodes list their resources in rank order, through
+the (workspace, resource_type, prefix, starts, length, name, gid, words)
+index.
+
+A keystroke query reads the names starting with it from the node of the
+whole query, then the other matches from the node of its longest word.
+The other query words are matched against the normalized words stored in
+the index, so the database stops at the first `count` matches of each
+node and only those rows are read. A query with a word no name has
+stops there; one whose words each occur but rarely together still walks
+its node's index entries to the end.
+
+The index is kept up to date by save/delete signals (connected in
+TypeaheadConfig.ready), by explicit calls from bulk write paths, and can be
+rebuilt from scratch with `python manage.py rebuild_typeahead_index`.
+"""
+import heapq
+import itertools
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Length, Lower
+from django.db.models.signals import post_delete, post_save
+
+from common.transactions import defer_to_commit
+from .models import TypeaheadPrefix
+
+
+# Indexed models by the resource_type they are searched as
+INDEXED_MODELS = {
+    'task': 'tasks.Task',
+    'project': 'projects.Project',
+    'user': 'users.User',
+    'tag': 'tags.Tag',
+    'portfolio': 'portfolios.Portfolio',
+    'goal': 'goals.Goal',
+}
+
+# Words of a name that are indexed, and the maximum normalized word length
+MAX_WORDS = 32
+MAX_TERM_LENGTH = 64
+
+# Longest indexed prefix; longer query words read the node of their first
+# MAX_PREFIX_LENGTH characters and are matched in full against the words
+MAX_PREFIX_LENGTH = 6
+
+# Longest indexed prefix of a whole normalized name; longer queries read
+# the node of their first MAX_NAME_PREFIX_LENGTH characters
+MAX_NAME_PREFIX_LENGTH = 16
+
+_WORD_RE = re.compile(r'\w+')
+
+# (gid, name, workspace ids) of one resource to index
+IndexEntry = Tuple[str, str, Sequence[int]]
+
+
+def normalize_words(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase words with accents removed.
+    """
+    if not text:
+        return []
+    if not text.isascii():
+        decomposed = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return [word[:MAX_TERM_LENGTH] for word in _WORD_RE.findall(text.lower())]
+
+
+def _chunks(values: List, size: Optional[int] = None) -> Iterable[List]:
+    size = size or connection.features.max_query_params or len(values) or 1
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _prefixes(words: List[str]) -> Dict[str, bool]:
+    """
+    Distinct prefixes of a name's indexed words and of the whole normalized
+    name, each with whether the name starts with it; the empty prefix lists
+    every name with a word.
+    """
+    if not words:
+        return {}
+    phrase = ' '.join(words)[:MAX_NAME_PREFIX_LENGTH]
+    # No query normalizes to a trailing space
+    prefixes = {phrase[:length]: True for length in range(len(phrase) + 1) if phrase[length - 1:length] != ' '}
+    for word in words[1:]:
+        for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1):
+            prefixes.setdefault(word[:length], False)
+    return prefixes
+
+
+def _prefix_rows(resource_type: str, entries: Iterable[IndexEntry]) -> List[TypeaheadPrefix]:
+    rows = []
+    for gid, name, workspace_ids in entries:
+        words = normalize_words(name)[:MAX_WORDS]
+        prefixes = _prefixes(words)
+        display_name = (name or '')[:500]
+        joined = ' '.join(words)[:500]
+        for workspace_id in workspace_ids:
+            for prefix, starts in prefixes.items():
+                rows.append(TypeaheadPrefix(
+                    workspace_id=workspace_id, resource_type=resource_type, resource_gid=gid,
+                    name=display_name, prefix=prefix, starts=starts, words=joined,
+                ))
+    return rows
+
+
+def index_resources(resource_type: str, entries: Iterable[IndexEntry], replace: bool = True) -> None:
+    """
+    (Re)index resources of one type. Pass replace=False for resources that
+    were just created and have no index rows yet.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    with transaction.atomic():
+        if replace:
+            for gids in _chunks([gid for gid, _, _ in entries]):
+                TypeaheadPrefix.objects.filter(resource_gid__in=gids).delete()
+        TypeaheadPrefix.objects.bulk_create(_prefix_rows(resource_type, entries), batch_size=2000)
+
+
+def remove_resources(gids: Iterable[str], workspace_id: Optional[int] = None) -> None:
+    """Remove resources from the index (optionally only in one workspace)."""
+    for chunk in _chunks(list(gids)):
+        queryset = TypeaheadPrefix.objects.filter(resource_gid__in=chunk)
+        if workspace_id is not None:
+            queryset = queryset.filter(workspace_id=workspace_id)
+        queryset.delete()
+
+
+def _has_word(word: str) -> Q:
+    """Index rows with a word starting with `word`."""
+    return Q(words__startswith=word) | Q(words__contains=' ' + word)
+
+
+def _node(workspace_id: int, resource_type: str, prefix: str, starts: bool, match: Q,
+          count: int) -> List[Tuple[int, str, str, str]]:
+    """
+    The first `count` resources of one trie node matching `match`, in rank
+    order, as (name length, lowercase name, gid, name).
+    """
+    # starts is matched with IN: Django renders `starts = True` as a bare
+    # column, which SQLite does not look up in the index
+    return list(
+        TypeaheadPrefix.objects
+        .filter(match, workspace_id=workspace_id, resource_type=resource_type, prefix=prefix, starts__in=[starts])
+        .annotate(name_length=Length('name'), name_lower=Lower('name'))
+        .order_by('name_length', 'name_lower', 'resource_gid')
+        .values_list('name_length', 'name_lower', 'resource_gid', 'name')[:count]
+    )
+
+
+def _node_exists(workspace_id: int, resource_type: str, word: str) -> bool:
+    """Whether any resource has a word starting with `word`."""
+    return TypeaheadPrefix.objects.filter(
+        _has_word(word), workspace_id=workspace_id, resource_type=resource_type, prefix=word[:MAX_PREFIX_LENGTH],
+    ).exists()
+
+
+def search(workspace_id: int, resource_type: str, query: str, count: int) -> List[Dict[str, str]]:
+    """
+    Return up to `count` compact resources whose name has a word starting
+    with each word of the query.
+
+    Ranking: names that start with the query first, then shorter names,
+    then alphabetical.
+
+    Names starting with the query are read from the starting half of the
+    whole query's node; the others from both halves (starting or not) of
+    the longest query word's node, merged in rank order. Either way the database matches every query word against the
+    indexed words before a row is returned, so the first `count` rows are
+    the top ones.
+    """
+    if count <= 0:
+        return []
+    words = normalize_words(query)
+    phrase = ' '.join(words)
+    starts_with_query = Q(words__startswith=phrase)
+    results: Dict[str, str] = {}
+
+    # Nodes hold whole-name prefixes up to MAX_NAME_PREFIX_LENGTH characters
+    # that do not end in a space
+    prefix = phrase[:MAX_NAME_PREFIX_LENGTH].rstrip(' ')
+    match = starts_with_query if len(prefix) < len(phrase) else Q()
+    for *_, gid, name in _node(workspace_id, resource_type, prefix, True, match, count):
+        results[gid] = name
+
+    if words and len(results) < count:
+        scan = max(words, key=len)
+        others = {word for word in words if word != scan}
+        # The scan would otherwise walk its whole node for a word no name has
+        if all(_node_exists(workspace_id, resource_type, word) for word in others):
+            match = ~starts_with_query
+            for word in others | ({scan} if len(scan) > MAX_PREFIX_LENGTH else set()):
+                match &= _has_word(word)
+            remaining = count - len(results)
+            nodes = [
+                _node(workspace_id, resource_type, scan[:MAX_PREFIX_LENGTH], starts, match, remaining)
+                for starts in (True, False)
+            ]
+            for *_, gid, name in itertools.islice(heapq.merge(*nodes), remaining):
+                results[gid] = name
+    return [{'gid': gid, 'resource_type': resource_type, 'name': name} for gid, name in results.items()]
+
+
+def _workspace_ids(resource_type: str, instance) -> List[int]:
+    if resource_type == 'user':
+        from api.users.models import UserWorkspace
+        return list(UserWorkspace.objects.filter(user_id=instance.pk).values_list('workspace_id', flat=True))
+    return [instance.workspace_id] if instance.workspace_id is not None else []
+
+
+def index_instance(resource_type: str, instance, created: bool = False) -> None:
+    """Index one saved instance, skipping the write if its name is unchanged."""
+    if not created:
+        indexed_name = (
+            TypeaheadPrefix.objects.filter(resource_gid=instance.gid)
+            .values_list('name', flat=True).first()
+        )
+        if indexed_name is not None and indexed_name == (instance.name or '')[:500]:
+            return
+    workspace_ids = _workspace_ids(resource_type, instance)
+    if workspace_ids or not created:
+        index_resources(resource_type, [(instance.gid, instance.name, workspace_ids)], replace=not created)
+
+
+def _on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'name' not in update_fields):
+        return
+    index_instance(_RESOURCE_TYPES[sender._meta.label], instance, created=created)
+
+
+def _on_delete(sender, instance, **kwargs):
+    # Cascades delete many resources in one transaction; drop their index
+    # rows together at commit
+    defer_to_commit('typeahead.remove', [instance.gid], remove_resources)
+
+
+def _on_membership_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    user = instance.user
+    remove_resources([user.gid], workspace_id=instance.workspace_id)
+    index_resources('user', [(user.gid, user.name, [instance.workspace_id])], replace=False)
+
+
+def _on_membership_delete(sender, instance, **kwargs):
+    from api.users.models import User
+    gid = User.objects.filter(pk=instance.user_id).values_list('gid', flat=True).first()
+    if gid:
+        remove_resources([gid], workspace_id=instance.workspace_id)
+
+
+_RESOURCE_TYPES = {label: resource_type for resource_type, label in INDEXED_MODELS.items()}
+
+
+def connect_signals() -> None:
+    """Keep the index up to date on saves and deletes of indexed models."""
+    for label in INDEXED_MODELS.values():
+        post_save.connect(_on_save, sender=label, dispatch_uid=f'typeahead.index.save.{label}')
+        post_delete.connect(_on_delete, sender=label, dispatch_uid=f'typeahead.index.delete.{label}')
+    post_save.connect(_on_membership_save, sender='users.UserWorkspace', dispatch_uid='typeahead.index.membership.save')
+    post_delete.connect(_on_membership_delete, sender='users.UserWorkspace',
+                        dispatch_uid='typeahead.index.membership.delete')
+
+
+def rebuild_index(chunk_size: int = 5000) -> int:
+    """
+    Rebuild the whole index from the indexed tables.
+    Returns the number of index rows written.
+    """
+    from api.users.models import UserWorkspace
+
+    written = 0
+    with transaction.atomic():
+        TypeaheadPrefix.objects.all().delete()
+        for resource_type, label in INDEXED_MODELS.items():
+            model = apps.get_model(label)
+            if resource_type == 'user':
+                rows = (
+                    UserWorkspace.objects.order_by('id')
+                    .values_list('user__gid', 'user__name', 'workspace_id').iterator(chunk_size=chunk_size)
+                )
+            else:
+                rows = model.objects.order_by('id').values_list('gid', 'name', 'workspace_id').iterator(chunk_size=chunk_size)
+
+            batch = []
+            for gid, name, workspace_id in rows:
+                if workspace_id is not None:
+                    batch.append((gid, name, [workspace_id]))
+                if len(batch) >= chunk_size:
+                    written += _write_batch(resource_type, batch)
+                    batch = []
+            written += _write_batch(resource_type, batch)
+    return written
+
+
+def _write_batch(resource_type: str, entries: List[IndexEntry]) -> int:
+    rows = _prefix_rows(resource_type, entries)
+    TypeaheadPrefix.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
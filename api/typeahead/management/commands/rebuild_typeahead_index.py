@@ -0,0 +1,17 @@
+"""
+Rebuild the typeahead prefix index from the indexed tables.
+"""
+from django.core.management.base import BaseCommand
+
+from api.typeahead.index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the typeahead prefix index for tasks, projects, users, tags, portfolios and goals.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Resources read per batch')
+
+    def handle(self, *args, **options):
+        written = rebuild_index(chunk_size=options['chunk_size'])
+        self.stdout.write(f'Indexed {written:,} terms')
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+def build_index(apps, schema_editor):
+    # Index the names of existing resources
+    from api.typeahead.index import rebuild_index
+    rebuild_index()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0002_goal_progress'),
+        ('portfolios', '0003_portfoliorollup_portfoliorollupproject_and_more'),
+        ('projects', '0002_project_projects_ws_name_idx'),
+        ('tags', '0001_initial'),
+        ('tasks', '0001_initial'),
+        ('users', '0002_userworkspace_user_workspaces_ws_user_idx'),
+        ('workspaces', '0001_initial'),
+        ('typeahead', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TypeaheadPrefix',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource_type', models.CharField(help_text='The base type of the indexed resource.', max_length=50)),
+                ('resource_gid', models.CharField(help_text='Globally unique identifier of the indexed resource.', max_length=255)),
+                ('name', models.CharField(help_text='The name of the indexed resource, as displayed.', max_length=500)),
+                ('prefix', models.CharField(help_text='A prefix of a normalized word of the name, or of the whole normalized name.', max_length=16)),
+                ('starts', models.BooleanField(default=False, help_text='Whether the normalized name starts with the prefix.')),
+                ('words', models.CharField(default='', help_text='The normalized words of the name, joined by spaces.', max_length=500)),
+                ('workspace', models.ForeignKey(help_text='The workspace the indexed resource belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='typeahead_prefixes', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'typeahead_prefixes',
+                'indexes': [models.Index(models.F('workspace'), models.F('resource_type'), models.F('prefix'), models.F('starts'), django.db.models.functions.text.Length('name'), django.db.models.functions.text.Lower('name'), models.F('resource_gid'), models.F('words'), name='typeahead_prefixes_rank_idx'), models.Index(fields=['resource_gid'], name='typeahead_prefix_resource_idx')],
+            },
+        ),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@
 Typeahead models matching FastAPI Pydantic models.
 """
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Length, Lower
 import uuid
 from common.models import generate_gid
 
@@ -45,3 +47,64 @@ class Typeahead(models.Model):
 
     def __str__(self):
         return self.name or self.gid
+
+
+class TypeaheadPrefix(models.Model):
+    """
+    Prefix index entry: one row per distinct prefix (up to
+    MAX_PREFIX_LENGTH characters) of the words of an indexed resource's
+    name and of the whole normalized name (up to MAX_NAME_PREFIX_LENGTH),
+    plus an empty prefix listing every named resource. Maintained by
+    api/typeahead/index.py; the prefix index lists each prefix's resources
+    in rank order with their normalized words, so a search reads them from
+    its start and matches the other query words within the index.
+    """
+    workspace = models.ForeignKey(
+        'workspaces.Workspace',
+        on_delete=models.CASCADE,
+        related_name='typeahead_prefixes',
+        help_text="The workspace the indexed resource belongs to."
+    )
+    resource_type = models.CharField(
+        max_length=50,
+        help_text="The base type of the indexed resource."
+    )
+    resource_gid = models.CharField(
+        max_length=255,
+        help_text="Globally unique identifier of the indexed resource."
+    )
+    name = models.CharField(
+        max_length=500,
+        help_text="The name of the indexed resource, as displayed."
+    )
+    prefix = models.CharField(
+        max_length=16,
+        help_text="A prefix of a normalized word of the name, or of the whole normalized name."
+    )
+    starts = models.BooleanField(
+        default=False,
+        help_text="Whether the normalized name starts with the prefix."
+    )
+    words = models.CharField(
+        max_length=500,
+        default='',
+        help_text="The normalized words of the name, joined by spaces."
+    )
+
+    class Meta:
+        db_table = 'typeahead_prefixes'
+        indexes = [
+            # WHERE workspace_id = ? AND resource_type = ? AND prefix = ? AND starts = ?
+            # ORDER BY LENGTH(name), LOWER(name), resource_gid, with the other
+            # query words matched against words without reading the row
+            models.Index(
+                F('workspace'), F('resource_type'), F('prefix'), F('starts'),
+                Length('name'), Lower('name'), F('resource_gid'), F('words'),
+                name='typeahead_prefixes_rank_idx',
+            ),
+            # Reindexing and removing a resource
+            models.Index(fields=['resource_gid'], name='typeahead_prefix_resource_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.prefix} -> {self.resource_gid}"
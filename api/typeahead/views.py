@@ -8,12 +8,19 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Typeahead
+from .index import INDEXED_MODELS, search
 from .serializers import (
     TypeaheadCompactSerializer,
     TypeaheadResponseSerializer,
 )
+from api.workspaces.models import Workspace
+
+
+DEFAULT_TYPEAHEAD_COUNT = 20
+MAX_TYPEAHEAD_COUNT = 100
 
 
 class TypeaheadViewSet(viewsets.ViewSet):
@@ -27,6 +34,14 @@ class TypeaheadViewSet(viewsets.ViewSet):
         """
         GET /typeahead
         Returns the compact records for all typeahead.
+        With a workspace, returns the resources whose name matches the query,
+        ranked, from the typeahead prefix index.
+        
+        Query params:
+        - workspace: str (optional) - workspace to search in
+        - resource_type: str (optional) - task (default), project, user, tag, portfolio or goal
+        - query: str (optional) - words to match as name prefixes
+        - count: int (optional) - number of results, 1-100 (default 20)
         """
         opt_pretty = request.query_params.get('opt_pretty', 'false').lower() == 'true'
         limit = request.query_params.get('limit')
@@ -37,8 +52,14 @@ class TypeaheadViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        workspace_gid = request.query_params.get('workspace')
+        if workspace_gid:
+            return self._typeahead(request, workspace_gid, opt_fields)
+        
         # Query from database
         queryset = Typeahead.objects.all()
+        projection = compile_opt_fields(TypeaheadCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
         
         # Apply pagination
         paginator = AsanaPagination()
@@ -46,7 +67,7 @@ class TypeaheadViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = TypeaheadCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -54,7 +75,7 @@ class TypeaheadViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = TypeaheadCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -62,6 +83,31 @@ class TypeaheadViewSet(viewsets.ViewSet):
         
         return Response(wrap_list_response(data, next_page=None))
     
+    def _typeahead(self, request: Request, workspace_gid: str, opt_fields) -> Response:
+        """Search the typeahead prefix index of a workspace."""
+        resource_type = request.query_params.get('resource_type', 'task')
+        if resource_type not in INDEXED_MODELS:
+            return asana_validation_error(
+                f"resource_type must be one of {', '.join(INDEXED_MODELS)}"
+            )
+        try:
+            count = int(request.query_params.get('count', DEFAULT_TYPEAHEAD_COUNT))
+        except ValueError:
+            return asana_validation_error('count must be an integer')
+        if not 1 <= count <= MAX_TYPEAHEAD_COUNT:
+            return asana_validation_error(f'count must be between 1 and {MAX_TYPEAHEAD_COUNT}')
+        
+        workspace_id = Workspace.objects.filter(gid=workspace_gid).values_list('id', flat=True).first()
+        if workspace_id is None:
+            return asana_not_found_error('Workspace')
+        
+        data = search(workspace_id, resource_type, request.query_params.get('query', ''), count)
+        
+        if opt_fields:
+            data = [apply_opt_fields(item, opt_fields) for item in data]
+        
+        return Response(wrap_list_response(data, next_page=None))
+    
     def retrieve(self, request: Request, pk: str = None) -> Response:
         """
         GET /typeahead/{id}
@@ -78,12 +124,13 @@ class TypeaheadViewSet(viewsets.ViewSet):
             if opt_fields_str:
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
+        projection = compile_opt_fields(TypeaheadResponseSerializer, opt_fields)
         try:
-            resource = Typeahead.objects.get(gid=resource_gid)
+            resource = projection.apply(Typeahead.objects).get(gid=resource_gid)
         except Typeahead.DoesNotExist:
             return asana_not_found_error('Typeahead')
         
-        serializer = TypeaheadResponseSerializer(resource)
+        serializer = projection.serializer(resource)
         data = serializer.data
         
         if opt_fields:
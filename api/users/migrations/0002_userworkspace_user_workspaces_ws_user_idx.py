@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userworkspace',
+            index=models.Index(fields=['workspace', 'user'], name='user_workspaces_ws_user_idx'),
+        ),
+    ]
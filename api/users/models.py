@@ -88,3 +88,7 @@ class UserWorkspace(models.Model):
     class Meta:
         db_table = 'user_workspaces'
         unique_together = ['user', 'workspace']
+        indexes = [
+            # GET /users?workspace=... (the unique index leads with user)
+            models.Index(fields=['workspace', 'user'], name='user_workspaces_ws_user_idx'),
+        ]
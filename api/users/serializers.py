@@ -29,6 +29,8 @@ class UserResponseSerializer(serializers.ModelSerializer):
         model = User
         fields = ['gid', 'resource_type', 'name', 'email', 'photo_url', 'workspaces']
         read_only_fields = ['gid', 'resource_type', 'email', 'workspaces']
+        # Columns read by SerializerMethodFields, for opt_fields projection
+        opt_field_sources = {'workspaces': []}
     
     def get_workspaces(self, obj):
         """Get workspaces for this user."""
@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from common.errors import asana_not_found_error, asana_validation_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import User
 from .serializers import (
@@ -68,13 +69,16 @@ class UsersViewSet(viewsets.ViewSet):
             except Team.DoesNotExist:
                 pass
         
+        projection = compile_opt_fields(UserCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = UserCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             if opt_fields:
@@ -82,7 +86,7 @@ class UsersViewSet(viewsets.ViewSet):
             
             return paginator.get_paginated_response(data)
         
-        serializer = UserCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -115,11 +119,12 @@ class UsersViewSet(viewsets.ViewSet):
             return asana_not_found_error('User')
         
         # Find user by gid or email
+        projection = compile_opt_fields(UserResponseSerializer, opt_fields)
         try:
             if '@' in user_gid:
-                user = User.objects.get(email=user_gid)
+                user = projection.apply(User.objects).get(email=user_gid)
             else:
-                user = User.objects.get(gid=user_gid)
+                user = projection.apply(User.objects).get(gid=user_gid)
         except User.DoesNotExist:
             return asana_not_found_error('User')
         
@@ -128,7 +133,7 @@ class UsersViewSet(viewsets.ViewSet):
             # TODO: Filter workspaces in serializer
             pass
         
-        serializer = UserResponseSerializer(user)
+        serializer = projection.serializer(user)
         data = serializer.data
         
         if opt_fields:
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class WebhooksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.webhooks'
+
+    def ready(self):
+        if getattr(settings, 'WEBHOOK_DELIVERY_IN_PROCESS', False):
+            from api.events.capture import events_written
+            from .delivery import on_events_written
+            events_written.connect(on_events_written, dispatch_uid='webhooks.delivery.wake')
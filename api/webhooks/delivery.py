@@ -0,0 +1,487 @@
+"""
+Webhook delivery engine.
+
+Reads new Event rows, matches them to active webhooks and POSTs them to the
+webhooks' targets:
+- events for the same webhook are coalesced into one {"events": [...]}
+  payload (up to `max_events_per_delivery` per request),
+- deliveries run on a bounded thread pool; each worker keeps one keep-alive
+  connection per target host and reuses it across deliveries,
+- failed deliveries are retried with exponential backoff without holding a
+  worker while they wait,
+- last_success_at / last_failure_at are recorded on the dispatcher thread,
+  one UPDATE per outcome group.
+
+Events are read per workspace in sequence order (`sequence > position`).
+Sequence numbers are reserved inside the writing transaction, so a
+workspace's events become visible in sequence order. The position of each
+workspace is persisted in WebhookCursor once every delivery of the events
+up to it has finished (delivered, given up on, or its webhook was
+removed), and the engine resumes from there on start: events written
+while it is down are delivered, at least once. Events without a workspace
+have no sequence and are tracked by event id. On the very first start the
+cursors are set to the current end of every stream.
+
+A webhook matches an event when its resource gid is the event's resource,
+the event's parent, or the event's workspace.
+
+Delivery never runs on the request path. Either run the worker process:
+    python manage.py deliver_webhooks
+or set WEBHOOK_DELIVERY_IN_PROCESS = True to run the engine on a background
+thread that is woken whenever captured events are committed.
+"""
+import heapq
+import http.client
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Delivery:
+    """One coalesced POST of events to a webhook target."""
+    webhook_id: int
+    target: str
+    event_ids: List[int]
+    body: bytes
+    attempt: int = 0
+    # (stream, position) of each event: stream is the workspace id (None
+    # for events without one), position its sequence (or id)
+    positions: List[Tuple[Optional[int], int]] = field(default_factory=list)
+
+
+@dataclass(order=True)
+class _ScheduledRetry:
+    due: float
+    seq: int
+    delivery: Delivery = field(compare=False)
+
+
+@dataclass
+class DeliveryResult:
+    delivery: Delivery
+    status: Optional[int]
+    content: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+def _stream_position(event) -> Tuple[Optional[int], int]:
+    """The (stream, position) of an event, as tracked by WebhookCursor."""
+    if event.workspace_id is None:
+        return None, event.id
+    return event.workspace_id, event.sequence
+
+
+class HostConnections(threading.local):
+    """
+    Per-thread keep-alive connections, one per (scheme, host, port).
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.connections: Dict[Tuple[str, str, int], http.client.HTTPConnection] = {}
+
+    def post(self, target: str, body: bytes) -> Tuple[int, bytes]:
+        """
+        POST a JSON body over the cached connection for the target's host.
+        A reused connection that was closed by the server is reopened once.
+        """
+        parts = urlsplit(target)
+        https = parts.scheme == 'https'
+        port = parts.port or (443 if https else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+
+        while True:
+            conn = self.connections.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn_class = http.client.HTTPSConnection if https else http.client.HTTPConnection
+                conn = conn_class(parts.hostname, port, timeout=self.timeout)
+                self.connections[key] = conn
+            try:
+                conn.request('POST', path, body=body, headers=headers)
+                response = conn.getresponse()
+                content = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                del self.connections[key]
+                if reused:
+                    # Stale keep-alive connection: retry once on a fresh one
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+                del self.connections[key]
+            return response.status, content
+
+
+class WebhookDeliveryEngine:
+    """
+    Match events to webhooks and deliver them on a bounded worker pool.
+
+    Usage:
+        engine = WebhookDeliveryEngine()
+        engine.process_once()      # one dispatch round (polling loop body)
+        engine.drain()             # wait for in-flight deliveries and retries
+        engine.close()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_events_per_delivery: int = 100,
+        batch_size: int = 1000,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        timeout: float = 10.0,
+    ):
+        self.max_events_per_delivery = max_events_per_delivery
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='webhook-delivery')
+        self.connections = HostConnections(timeout)
+        # Stream -> position read up to, and position persisted
+        self.read_positions: Dict[Optional[int], int] = self._load_cursors()
+        self._saved_positions = dict(self.read_positions)
+        # Stream -> {position: unfinished deliveries of that event}
+        self._pending: Dict[Optional[int], Counter] = defaultdict(Counter)
+
+        self._in_flight = set()
+        self._retries: List[_ScheduledRetry] = []
+        self._retry_seq = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Cursors
+
+    @staticmethod
+    def _load_cursors() -> Dict[Optional[int], int]:
+        """
+        Persisted stream positions. Without any cursor yet (first start),
+        cursors are created at the current end of every stream so that
+        only new events are delivered.
+        """
+        from api.events.models import Event, EventSequence
+        from .models import WebhookCursor
+
+        positions = dict(WebhookCursor.objects.values_list('workspace_id', 'position'))
+        if positions:
+            return positions
+        positions = dict(EventSequence.objects.values_list('workspace_id', 'last_sequence'))
+        positions[None] = Event.objects.filter(workspace__isnull=True).order_by('-id').values_list(
+            'id', flat=True).first() or 0
+        WebhookCursor.objects.bulk_create([
+            WebhookCursor(workspace_id=workspace_id, position=position)
+            for workspace_id, position in positions.items()
+        ], batch_size=1000)
+        return positions
+
+    def save_cursors(self) -> None:
+        """
+        Persist, for each stream, the position before its oldest event with
+        an unfinished delivery (or the read position when none is left).
+        One write per stream whose position moved.
+        """
+        from .models import WebhookCursor
+
+        for stream, read in self.read_positions.items():
+            pending = self._pending.get(stream)
+            position = min(pending) - 1 if pending else read
+            if self._saved_positions.get(stream) == position:
+                continue
+            if not WebhookCursor.objects.filter(workspace_id=stream).update(position=position):
+                WebhookCursor.objects.create(workspace_id=stream, position=position)
+            self._saved_positions[stream] = position
+
+    def _track(self, delivery: 'Delivery') -> None:
+        for stream, position in delivery.positions:
+            self._pending[stream][position] += 1
+
+    def _settle(self, delivery: 'Delivery') -> None:
+        """A delivery finished for good: its events no longer hold back their cursors."""
+        for stream, position in delivery.positions:
+            pending = self._pending[stream]
+            pending[position] -= 1
+            if pending[position] <= 0:
+                del pending[position]
+            if not pending:
+                del self._pending[stream]
+
+    # Matching
+
+    def _webhook_index(self) -> Dict[str, List[Tuple[int, str]]]:
+        """Map watched resource gid -> [(webhook id, target)] for active webhooks."""
+        from .models import Webhook
+
+        index = defaultdict(list)
+        for webhook_id, resource, target in Webhook.objects.filter(active=True).values_list('id', 'resource', 'target'):
+            gid = resource.get('gid') if isinstance(resource, dict) else resource
+            if gid:
+                index[str(gid)].append((webhook_id, target))
+        return index
+
+    def match(self, events) -> Dict[Tuple[int, str], List]:
+        """
+        Group events by the (webhook id, target) they must be delivered to.
+        """
+        from api.workspaces.models import Workspace
+
+        index = self._webhook_index()
+        if not index:
+            return {}
+        workspace_ids = {event.workspace_id for event in events if event.workspace_id is not None}
+        workspace_gids = dict(Workspace.objects.filter(id__in=workspace_ids).values_list('id', 'gid'))
+
+        matched = defaultdict(list)
+        for event in events:
+            keys = {
+                (event.resource or {}).get('gid'),
+                (event.parent or {}).get('gid'),
+                workspace_gids.get(event.workspace_id),
+            }
+            keys.discard(None)
+            webhooks = {webhook for key in keys for webhook in index.get(key, ())}
+            for webhook in webhooks:
+                matched[webhook].append(event)
+        return matched
+
+    # Dispatch
+
+    def build_deliveries(self, events) -> List[Delivery]:
+        """
+        Coalesce matched events into payloads. Each event is serialized once,
+        however many webhooks it fans out to.
+        """
+        from api.events.serializers import EventResponseSerializer
+
+        matched = self.match(events)
+        if not matched:
+            return []
+        encoded = {}
+        for event, data in zip(events, EventResponseSerializer(events, many=True).data):
+            encoded[event.id] = json.dumps(data, separators=(',', ':')).encode()
+
+        deliveries = []
+        for (webhook_id, target), webhook_events in matched.items():
+            for start in range(0, len(webhook_events), self.max_events_per_delivery):
+                chunk = webhook_events[start:start + self.max_events_per_delivery]
+                body = b'{"events":[' + b','.join(encoded[event.id] for event in chunk) + b']}'
+                deliveries.append(Delivery(
+                    webhook_id, target, [event.id for event in chunk], body,
+                    positions=[_stream_position(event) for event in chunk],
+                ))
+        return deliveries
+
+    def _post(self, delivery: Delivery) -> DeliveryResult:
+        try:
+            status, content = self.connections.post(delivery.target, delivery.body)
+            return DeliveryResult(delivery, status, content[:1000].decode('utf-8', 'replace'))
+        except Exception as exc:  # noqa: BLE001 - any transport error is a failed attempt
+            return DeliveryResult(delivery, None, str(exc))
+
+    def submit(self, delivery: Delivery) -> None:
+        future = self.executor.submit(self._post, delivery)
+        # Finished deliveries wake the dispatcher so results are recorded promptly
+        future.add_done_callback(lambda _: self._wake.set())
+        self._in_flight.add(future)
+
+    def fetch_new_events(self):
+        """
+        Read up to batch_size events past the read positions: per workspace
+        with new sequence numbers, `sequence > position` in sequence order,
+        then events without a workspace by id.
+        """
+        from api.events.models import Event, EventSequence
+
+        events = []
+        for workspace_id, last_sequence in EventSequence.objects.values_list('workspace_id', 'last_sequence'):
+            read = self.read_positions.get(workspace_id, 0)
+            if last_sequence <= read:
+                continue
+            batch = list(Event.objects.filter(
+                workspace_id=workspace_id, sequence__gt=read,
+            ).order_by('sequence')[:self.batch_size - len(events)])
+            if batch:
+                self.read_positions[workspace_id] = batch[-1].sequence
+                events.extend(batch)
+            if len(events) >= self.batch_size:
+                return events
+
+        batch = list(Event.objects.filter(
+            workspace__isnull=True, id__gt=self.read_positions.get(None, 0),
+        ).order_by('id')[:self.batch_size - len(events)])
+        if batch:
+            self.read_positions[None] = batch[-1].id
+            events.extend(batch)
+        return events
+
+    def process_once(self) -> int:
+        """
+        Run one dispatch round: collect finished deliveries, resubmit due
+        retries and submit deliveries for new events.
+        Returns the number of new events read.
+        """
+        self.collect()
+        now = time.monotonic()
+        while self._retries and self._retries[0].due <= now:
+            self.submit(heapq.heappop(self._retries).delivery)
+
+        events = self.fetch_new_events()
+        for delivery in self.build_deliveries(events) if events else ():
+            self._track(delivery)
+            self.submit(delivery)
+        self.save_cursors()
+        return len(events)
+
+    # Results
+
+    def collect(self) -> None:
+        """Record finished deliveries and schedule retries for failures."""
+        done = [future for future in self._in_flight if future.done()]
+        if not done:
+            return
+        self._in_flight.difference_update(done)
+        self.record([future.result() for future in done])
+
+    def record(self, results: List[DeliveryResult]) -> None:
+        from .models import Webhook
+
+        now = timezone.now()
+        succeeded = set()
+        gone = set()
+        for result in results:
+            delivery = result.delivery
+            if result.ok:
+                succeeded.add(delivery.webhook_id)
+                self._settle(delivery)
+                continue
+            Webhook.objects.filter(id=delivery.webhook_id).update(
+                last_failure_at=now,
+                last_failure_content=result.content or f'HTTP {result.status}',
+            )
+            if result.status == 410:
+                # The target asked for the webhook to be removed
+                gone.add(delivery.webhook_id)
+                self._settle(delivery)
+                continue
+            delivery.attempt += 1
+            if delivery.attempt < self.max_attempts:
+                self._schedule_retry(delivery)
+            else:
+                logger.warning('Dropping webhook delivery %s after %s attempts', delivery.webhook_id, delivery.attempt)
+                self._settle(delivery)
+
+        if succeeded:
+            Webhook.objects.filter(id__in=succeeded).update(last_success_at=now)
+        if gone:
+            Webhook.objects.filter(id__in=gone).update(active=False)
+            # Queued retries to a removed webhook are not resubmitted
+            dropped = [retry for retry in self._retries if retry.delivery.webhook_id in gone]
+            if dropped:
+                self._retries = [retry for retry in self._retries if retry.delivery.webhook_id not in gone]
+                heapq.heapify(self._retries)
+                for retry in dropped:
+                    self._settle(retry.delivery)
+
+    def _schedule_retry(self, delivery: Delivery) -> None:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (delivery.attempt - 1)))
+        self._retry_seq += 1
+        heapq.heappush(self._retries, _ScheduledRetry(time.monotonic() + delay, self._retry_seq, delivery))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Process until every delivery (including retries) has finished.
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            read = self.process_once()
+            if not read and not self._in_flight and not self._retries:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if not read:
+                self._wait_for_work(0.1)
+
+    def _wait_for_work(self, max_wait: float) -> None:
+        if self._retries:
+            max_wait = min(max_wait, max(0.0, self._retries[0].due - time.monotonic()))
+        self._wake.wait(max_wait)
+        self._wake.clear()
+
+    # Background loop
+
+    def wake(self) -> None:
+        """Signal that new events may be available."""
+        self._wake.set()
+
+    def run(self, poll_interval: float = 1.0) -> None:
+        """Dispatch until stop() is called."""
+        while not self._stop.is_set():
+            try:
+                read = self.process_once()
+            except Exception:  # noqa: BLE001 - keep the loop alive, retry next round
+                logger.exception('Webhook dispatch round failed')
+                read = 0
+                close_old_connections()
+            if read < self.batch_size:
+                self._wait_for_work(poll_interval)
+
+    def start(self, poll_interval: float = 1.0) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, args=(poll_interval,), name='webhook-dispatcher', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self.executor.shutdown(wait=True)
+
+
+_engine: Optional[WebhookDeliveryEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> WebhookDeliveryEngine:
+    """Return the process-wide engine, starting its background thread."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = WebhookDeliveryEngine()
+            _engine.start()
+    return _engine
+
+
+def on_events_written(sender, events, **kwargs) -> None:
+    """Wake the in-process engine when captured events are committed."""
+    get_engine().wake()
@@ -0,0 +1,24 @@
+"""
+Run the webhook delivery engine in the foreground.
+"""
+from django.core.management.base import BaseCommand
+
+from api.webhooks.delivery import WebhookDeliveryEngine
+
+
+class Command(BaseCommand):
+    help = 'Deliver new events to active webhooks until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent deliveries')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between event polls when idle')
+
+    def handle(self, *args, **options):
+        engine = WebhookDeliveryEngine(max_workers=options['workers'])
+        self.stdout.write(f'Delivering webhooks from {len(engine.read_positions):,} saved event stream positions')
+        try:
+            engine.run(poll_interval=options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            engine.close()
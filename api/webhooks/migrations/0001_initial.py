@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:52
+
+import common.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Webhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gid', models.CharField(default=common.models.generate_gid, help_text='Globally unique identifier of the resource, as a string.', max_length=255, unique=True)),
+                ('resource_type', models.CharField(default='webhook', help_text='The base type of this resource.', max_length=50)),
+                ('active', models.BooleanField(default=True, help_text='Whether the webhook is active.')),
+                ('resource', models.JSONField(help_text='The resource that triggers the webhook.')),
+                ('target', models.URLField(help_text='The URL to receive the webhook.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The time at which this resource was created.')),
+                ('last_failure_at', models.DateTimeField(blank=True, help_text='The timestamp when the webhook last received an error.', null=True)),
+                ('last_failure_content', models.TextField(blank=True, help_text='The contents of the last error response.', null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, help_text='The timestamp when the webhook last successfully received an event.', null=True)),
+            ],
+            options={
+                'db_table': 'webhooks',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0001_initial'),
+        ('webhooks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.BigIntegerField(default=0, help_text='The last delivered event sequence (event id for events without a workspace).')),
+                ('workspace', models.OneToOneField(blank=True, help_text='The workspace whose event stream this cursor tracks.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='webhook_cursor', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'webhook_cursors',
+            },
+        ),
+    ]
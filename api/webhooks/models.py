@@ -57,3 +57,29 @@ class Webhook(models.Model):
 
     def __str__(self):
         return f"Webhook {self.gid}"
+
+
+class WebhookCursor(models.Model):
+    """
+    Delivery position of the webhook engine in one workspace's event
+    stream: the last event sequence whose deliveries have all finished.
+    The row without a workspace tracks events that have no workspace (and
+    so no sequence) by event id.
+    """
+    workspace = models.OneToOneField(
+        'workspaces.Workspace',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='webhook_cursor',
+        help_text="The workspace whose event stream this cursor tracks."
+    )
+    position = models.BigIntegerField(
+        default=0,
+        help_text="The last delivered event sequence (event id for events without a workspace)."
+    )
+    class Meta:
+        db_table = 'webhook_cursors'
+
+    def __str__(self):
+        return f"Webhook cursor {self.workspace_id} @ {self.position}"
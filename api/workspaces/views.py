@@ -10,9 +10,10 @@ from django.views.decorators.csrf import csrf_exempt
 from typing import Optional, List
 import json
 
-from common.errors import asana_not_found_error, asana_validation_error
+from common.errors import asana_not_found_error, asana_validation_error, asana_sync_token_error
 from common.serializers import wrap_single_response, wrap_list_response, apply_opt_fields
 from common.pagination import AsanaPagination
+from common.projection import compile_opt_fields
 from common.auth import OAuth2ScopePermission
 from .models import Workspace
 from .serializers import (
@@ -26,6 +27,10 @@ from api.users.models import User, UserWorkspace
 from api.users.serializers import UserResponseSerializer
 
 
+# Maximum number of events returned by one GET /workspaces/{gid}/events call
+EVENTS_PAGE_LIMIT = 1000
+
+
 class WorkspacesViewSet(viewsets.ViewSet):
     """
     Workspace viewset matching FastAPI workspaces_api.py behavior.
@@ -59,6 +64,9 @@ class WorkspacesViewSet(viewsets.ViewSet):
         # Query workspaces from database
         queryset = Workspace.objects.all().order_by('name')
         
+        projection = compile_opt_fields(WorkspaceCompactSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
         # Apply pagination
         paginator = AsanaPagination()
         paginator.page_size = int(limit) if limit else 50
@@ -66,7 +74,7 @@ class WorkspacesViewSet(viewsets.ViewSet):
         
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = WorkspaceCompactSerializer(page, many=True)
+            serializer = projection.serializer(page, many=True)
             data = serializer.data
             
             # Apply opt_fields if specified
@@ -76,7 +84,7 @@ class WorkspacesViewSet(viewsets.ViewSet):
             return paginator.get_paginated_response(data)
         
         # Fallback if pagination not applied
-        serializer = WorkspaceCompactSerializer(queryset, many=True)
+        serializer = projection.serializer(queryset, many=True)
         data = serializer.data
         
         if opt_fields:
@@ -110,13 +118,14 @@ class WorkspacesViewSet(viewsets.ViewSet):
                 opt_fields = [f.strip() for f in opt_fields_str.split(',')]
         
         # Query workspace from database
+        projection = compile_opt_fields(WorkspaceResponseSerializer, opt_fields)
         try:
-            workspace = Workspace.objects.get(gid=workspace_gid)
+            workspace = projection.apply(Workspace.objects).get(gid=workspace_gid)
         except Workspace.DoesNotExist:
             return asana_not_found_error('Workspace')
         
         # Serialize workspace
-        serializer = WorkspaceResponseSerializer(workspace)
+        serializer = projection.serializer(workspace)
         data = serializer.data
         
         # Apply opt_fields if specified
@@ -307,6 +316,7 @@ class WorkspacesViewSet(viewsets.ViewSet):
         """
         GET /workspaces/{workspace_gid}/events
         Returns the full record for all events that have occurred since the sync token was created.
+        A missing or invalid sync token returns 412 with a fresh token to sync from.
         
         Path params:
         - workspace_gid: str (required)
@@ -330,29 +340,107 @@ class WorkspacesViewSet(viewsets.ViewSet):
         except Workspace.DoesNotExist:
             return asana_not_found_error('Workspace')
         
-        # Query events for this workspace
-        from api.events.models import Event
-        queryset = Event.objects.filter(
-            resource__contains={'workspace': workspace_gid}
-        ).order_by('-created_at')
-        
-        # TODO: Implement sync token logic for incremental updates
-        # For now, return all events (limited to 1000 as per Asana spec)
+        # Resume from the sequence recorded in the sync token. Without a
+        # valid token for this workspace, hand out one positioned at the
+        # current end of the stream (Asana responds 412 in that case).
+        from api.events.models import Event, EventSequence
         from api.events.serializers import EventResponseSerializer
-        events = queryset[:1000]
+        from api.events.sync import encode_sync_token, decode_sync_token
+        
+        decoded = decode_sync_token(sync)
+        if decoded is None or decoded[0] != workspace_gid:
+            last_sequence = EventSequence.objects.filter(
+                workspace=workspace
+            ).values_list('last_sequence', flat=True).first() or 0
+            return asana_sync_token_error(encode_sync_token(workspace_gid, last_sequence))
+        since = decoded[1]
+        
+        # Range scan on (workspace_id, sequence); fetch one extra row for has_more
+        events = list(
+            Event.objects.filter(workspace=workspace, sequence__gt=since)
+            .order_by('sequence')[:EVENTS_PAGE_LIMIT + 1]
+        )
+        has_more = len(events) > EVENTS_PAGE_LIMIT
+        events = events[:EVENTS_PAGE_LIMIT]
+        
         serializer = EventResponseSerializer(events, many=True)
         data = serializer.data
         
-        # Determine if there are more events
-        has_more = queryset.count() > 1000
-        
-        # Generate sync token (simplified - in production use proper token generation)
-        import base64
-        import json
-        sync_token = base64.b64encode(json.dumps({'workspace': workspace_gid, 'count': len(events)}).encode()).decode() if not sync else sync
+        # The next poll starts after the last event returned
+        if events:
+            since = events[-1].sequence
+        sync_token = encode_sync_token(workspace_gid, since)
         
         return Response({
             'data': data,
             'has_more': has_more,
             'sync': sync_token
         })
+    
+    @action(detail=True, methods=['get'], url_path='tasks/search')
+    def search_tasks(self, request: Request, pk: str = None) -> Response:
+        """
+        GET /workspaces/{workspace_gid}/tasks/search
+        Returns the compact task records matching the search filters, most
+        recently modified first unless sort_by is given.
+        
+        Path params:
+        - workspace_gid: str (required)
+        
+        Query params:
+        - text, resource_subtype, completed, is_subtask
+        - assignee.any/.not, projects.any/.all/.not, sections.any/.all/.not,
+          tags.any/.all/.not, followers.any/.all/.not, created_by.any/.not
+        - due_on, due_on.before, due_on.after (and start_on, created_on,
+          modified_on, completed_on); due_at.before/.after (and created_at,
+          modified_at, completed_at)
+        - sort_by: modified_at, created_at, completed_at, due_date, likes
+        - sort_ascending: bool
+        - opt_fields, limit, offset
+        """
+        workspace_gid = pk
+        
+        if not workspace_gid:
+            return asana_not_found_error('Workspace')
+        
+        # Get query parameters
+        limit = request.query_params.get('limit')
+        opt_fields = request.query_params.getlist('opt_fields')
+        if not opt_fields:
+            opt_fields_str = request.query_params.get('opt_fields')
+            if opt_fields_str:
+                opt_fields = [f.strip() for f in opt_fields_str.split(',')]
+        
+        # Verify workspace exists
+        try:
+            workspace = Workspace.objects.get(gid=workspace_gid)
+        except Workspace.DoesNotExist:
+            return asana_not_found_error('Workspace')
+        
+        from api.tasks.search import TaskSearch, TaskSearchError
+        from api.tasks.serializers import TaskListItemSerializer
+        
+        # All filters compile into a single joined query
+        try:
+            queryset = TaskSearch(request.query_params).queryset(workspace)
+        except TaskSearchError as error:
+            return asana_validation_error(str(error))
+        
+        projection = compile_opt_fields(TaskListItemSerializer, opt_fields)
+        queryset = projection.apply(queryset)
+        
+        # Apply pagination
+        paginator = AsanaPagination()
+        try:
+            paginator.page_size = int(limit) if limit else 50
+        except ValueError:
+            return asana_validation_error('limit must be an integer')
+        
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = projection.serializer(page, many=True)
+        data = serializer.data
+        
+        if opt_fields:
+            data = [apply_opt_fields(item, opt_fields) for item in data]
+        
+        return paginator.get_paginated_response(data)
@@ -89,6 +89,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.events.middleware.EventCaptureMiddleware',
 ]
 
 ROOT_URLCONF = 'asana_django.urls'
@@ -190,3 +191,11 @@ CORS_ALLOW_ALL_ORIGINS = True  # Change in production
 # Disable APPEND_SLASH for REST API - trailing slashes not required
 # This prevents 500 errors on POST requests to URLs without trailing slashes
 APPEND_SLASH = False
+
+# Record added/changed/deleted events for tasks, projects, sections, stories
+# and tags (see api/events/capture.py)
+EVENT_CAPTURE_ENABLED = True
+
+# Deliver webhooks from a background thread in this process instead of the
+# `manage.py deliver_webhooks` worker (see api/webhooks/delivery.py)
+WEBHOOK_DELIVERY_IN_PROCESS = False
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Bulk Task Write Benchmark
+
+Creates and updates tasks through the API, first one request per task
+(POST /tasks, PUT /tasks/{gid}) and then through the bulk endpoints
+(POST/PUT /tasks/bulk), against a throw-away SQLite database.
+
+The single-task path is timed on --single tasks and extrapolated to
+--tasks, since running it on 10k tasks takes minutes.
+
+Usage:
+    python benchmarks/bulk_tasks.py [--tasks 10000] [--single 1000] [--batch 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Single vs bulk task writes')
+    parser.add_argument('--tasks', type=int, default=10_000, help='Tasks written through the bulk endpoints')
+    parser.add_argument('--single', type=int, default=1_000, help='Tasks written one request at a time')
+    parser.add_argument('--batch', type=int, default=1_000, help='Tasks per bulk request')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.projects.models import Project  # noqa: E402
+from api.tasks.models import Task  # noqa: E402
+from api.users.models import User  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+
+def payload(i, workspace, projects, users):
+    return {
+        'name': f'Imported task {i}',
+        'workspace': workspace.gid,
+        'projects': [projects[i % len(projects)].gid],
+        'assignee': users[i % len(users)].gid,
+        'notes': 'Imported from upstream',
+        'due_on': '2026-06-01',
+    }
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count:>7,} tasks  {elapsed:8.2f}s  {count / elapsed:9,.0f} tasks/s  "
+          f"(10k: {elapsed / count * 10_000:7.1f}s)")
+    return elapsed
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+
+    workspace = Workspace.objects.create(name='Benchmark')
+    projects = [Project.objects.create(name=f'Project {i}', workspace=workspace) for i in range(10)]
+    users = [User.objects.create(name=f'User {i}', email=f'user{i}@example.com') for i in range(50)]
+
+    def single_create():
+        for i in range(ARGS.single):
+            response = client.post('/tasks', {'data': payload(i, workspace, projects, users)}, format='json')
+            assert response.status_code == 201, response.content
+
+    def bulk_create():
+        for start in range(0, ARGS.tasks, ARGS.batch):
+            items = [payload(i, workspace, projects, users) for i in range(start, min(start + ARGS.batch, ARGS.tasks))]
+            response = client.post('/tasks/bulk', {'data': items}, format='json')
+            assert all(result['status_code'] == 201 for result in response.json()['data'])
+
+    single = timed('POST /tasks (one per task)', ARGS.single, single_create)
+    bulk = timed('POST /tasks/bulk', ARGS.tasks, bulk_create)
+    print(f"  -> {single / ARGS.single / (bulk / ARGS.tasks):.0f}x faster per task\n")
+
+    gids = list(Task.objects.order_by('id').values_list('gid', flat=True))
+
+    def single_update():
+        for i, gid in enumerate(gids[:ARGS.single]):
+            response = client.put(f'/tasks/{gid}', {'data': {'name': f'Renamed {i}', 'completed': True}}, format='json')
+            assert response.status_code == 200, response.content
+
+    def bulk_update():
+        for start in range(0, ARGS.tasks, ARGS.batch):
+            items = [{'gid': gid, 'name': f'Renamed {start + i}', 'completed': True}
+                     for i, gid in enumerate(gids[start:start + ARGS.batch])]
+            response = client.put('/tasks/bulk', {'data': items}, format='json')
+            assert all(result['status_code'] == 200 for result in response.json()['data'])
+
+    single = timed('PUT /tasks/{gid} (one per task)', ARGS.single, single_update)
+    bulk = timed('PUT /tasks/bulk', min(ARGS.tasks, len(gids)), bulk_update)
+    print(f"  -> {single / ARGS.single / (bulk / min(ARGS.tasks, len(gids))):.0f}x faster per task")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Capacity Plan Benchmark
+
+Seeds one workspace with --users users, --weeks weekly time periods (plus
+the months covering them) and --allocations allocations per user, then
+times GET /allocations/capacity on a cold and a warm cache against the ORM
+`values('user', 'time_period').annotate(Sum(...))` query it replaces,
+which still leaves the grid to be assembled in Python.
+
+Usage:
+    python benchmarks/capacity_plan.py [--users 2000] [--weeks 52] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='NumPy capacity plan vs ORM aggregation')
+    parser.add_argument('--users', type=int, default=2000, help='Users in the workspace')
+    parser.add_argument('--weeks', type=int, default=52, help='Weekly time periods in the plan')
+    parser.add_argument('--allocations', type=int, default=30, help='Allocations per user')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.allocations.models import Allocation  # noqa: E402
+from api.tasks.models import Task  # noqa: E402
+from api.time_periods.models import TimePeriod  # noqa: E402
+from api.users.models import User, UserWorkspace  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+START_ON = date(2026, 1, 5)
+
+
+def seed(workspace):
+    rng = random.Random(21)
+    users = User.objects.bulk_create([
+        User(name=f'User {i}', email=f'user{i}@example.com') for i in range(ARGS.users)
+    ])
+    UserWorkspace.objects.bulk_create([UserWorkspace(user=user, workspace=workspace) for user in users])
+    tasks = Task.objects.bulk_create([
+        Task(name=f'Task {i}', workspace=workspace) for i in range(ARGS.users * 2)
+    ], batch_size=10_000)
+    weeks = TimePeriod.objects.bulk_create([
+        TimePeriod(
+            display_name=f'W{i + 1}', period='week',
+            start_on=START_ON + timedelta(weeks=i), end_on=START_ON + timedelta(weeks=i, days=6),
+        )
+        for i in range(ARGS.weeks)
+    ])
+    months = TimePeriod.objects.bulk_create([
+        TimePeriod(
+            display_name=f'M{month}', period='month', start_on=date(2026, month, 1),
+            end_on=(date(2026, month + 1, 1) if month < 12 else date(2027, 1, 1)) - timedelta(days=1),
+        )
+        for month in range(1, 13)
+    ])
+
+    allocations = []
+    for user in users:
+        for task, period in zip(rng.sample(tasks, ARGS.allocations), rng.sample(weeks + months, ARGS.allocations)):
+            allocations.append(Allocation(
+                task=task, user=user, time_period=period, effort_allocation=rng.choice([4, 8, 16, 24]),
+            ))
+    Allocation.objects.bulk_create(allocations, batch_size=10_000)
+    return len(allocations)
+
+
+def timed(func, before=None):
+    func()
+    total = 0.0
+    for _ in range(ARGS.repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / ARGS.repeat * 1000
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+    workspace = Workspace.objects.create(name='Benchmark')
+
+    start = time.perf_counter()
+    allocations = seed(workspace)
+    print(f"Seeded {ARGS.users:,} users and {allocations:,} allocations in {time.perf_counter() - start:.1f}s\n")
+
+    end_on = START_ON + timedelta(weeks=ARGS.weeks, days=-1)
+    params = {'workspace': workspace.gid, 'start_on': START_ON, 'end_on': end_on}
+
+    def plan():
+        response = client.get('/allocations/capacity', params)
+        assert response.status_code == 200, response.content
+
+    def orm_sum():
+        grid = list(TimePeriod.objects.filter(period='week', start_on__lte=end_on, end_on__gte=START_ON))
+        load = {}
+        rows = Allocation.objects.filter(
+            task__workspace=workspace, time_period__start_on__lte=end_on, time_period__end_on__gte=START_ON,
+        ).values('user_id', 'time_period__start_on', 'time_period__end_on').annotate(hours=Sum('effort_allocation'))
+        for row in rows:
+            days = (row['time_period__end_on'] - row['time_period__start_on']).days + 1
+            cells = load.setdefault(row['user_id'], [0.0] * len(grid))
+            for i, period in enumerate(grid):
+                overlap = (min(row['time_period__end_on'], period.end_on)
+                           - max(row['time_period__start_on'], period.start_on)).days + 1
+                if overlap > 0:
+                    cells[i] += row['hours'] * overlap / days
+
+    print(f"{'GET capacity, cold cache':<28} {timed(plan, before=cache.clear):9.1f} ms")
+    print(f"{'GET capacity, warm cache':<28} {timed(plan):9.1f} ms")
+    print(f"{'ORM Sum + Python grid':<28} {timed(orm_sum):9.1f} ms")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
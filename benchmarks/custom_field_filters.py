@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Custom Field Filters Benchmark
+
+Seeds one workspace with --tasks tasks (500k by default) carrying a value
+of an enum field (--options options) and a number field, then times
+GET /workspaces/{gid}/tasks/search filtered by an enum option, by a number
+range and sorted by the number field, first with the composite
+(custom_field, column, task) value indexes and then with them dropped.
+
+Usage:
+    python benchmarks/custom_field_filters.py [--tasks 500000] [--options 20] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Custom field filters with and without value indexes')
+    parser.add_argument('--tasks', type=int, default=500_000, help='Tasks in the workspace')
+    parser.add_argument('--options', type=int, default=20, help='Options of the enum field')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.custom_fields.models import CustomField, CustomFieldEnumOption, CustomFieldValue  # noqa: E402
+from api.tasks.models import Task  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+VALUE_INDEXES = ('cf_value_number_idx', 'cf_value_enum_idx')
+
+
+def seed(workspace):
+    rng = random.Random(24)
+    status = CustomField.objects.create(name='Status', type='enum', workspace=workspace)
+    estimate = CustomField.objects.create(name='Estimate', type='number', workspace=workspace)
+    options = CustomFieldEnumOption.objects.bulk_create([
+        CustomFieldEnumOption(custom_field=status, name=f'Option {i}') for i in range(ARGS.options)
+    ])
+    for start in range(0, ARGS.tasks, 10_000):
+        tasks = Task.objects.bulk_create([
+            Task(name=f'Task {i}', workspace=workspace) for i in range(start, min(start + 10_000, ARGS.tasks))
+        ])
+        values = []
+        for task in tasks:
+            values.append(CustomFieldValue(task=task, custom_field=status, enum_value=rng.choice(options)))
+            values.append(CustomFieldValue(task=task, custom_field=estimate, number_value=rng.randint(0, 1000)))
+        CustomFieldValue.objects.bulk_create(values)
+    return status, estimate, options
+
+
+def timed(func):
+    func()
+    start = time.perf_counter()
+    for _ in range(ARGS.repeat):
+        func()
+    return (time.perf_counter() - start) / ARGS.repeat * 1000
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+    workspace = Workspace.objects.create(name='Benchmark')
+    status, estimate, options = seed(workspace)
+    print(f"Seeded {ARGS.tasks:,} tasks, {CustomFieldValue.objects.count():,} values\n")
+
+    queries = {
+        'enum = option': {f'custom_fields.{status.gid}.value': options[-1].gid},
+        'number < 10': {f'custom_fields.{estimate.gid}.less_than': '10'},
+        'sort by number': {'sort_by': f'custom_fields.{estimate.gid}', 'sort_ascending': 'true'},
+    }
+
+    def search(params):
+        def run():
+            response = client.get(f'/workspaces/{workspace.gid}/tasks/search', dict(params, limit=100))
+            assert response.status_code == 200, response.content
+        return run
+
+    indexed = {name: timed(search(params)) for name, params in queries.items()}
+    with connection.cursor() as cursor:
+        for name in VALUE_INDEXES:
+            cursor.execute(f'DROP INDEX {name}')
+        cursor.execute('ANALYZE')
+    print(f"{'Query':<16} {'indexed':>12} {'no index':>12}")
+    for name, params in queries.items():
+        print(f"{name:<16} {indexed[name]:9.2f} ms {timed(search(params)):9.2f} ms")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
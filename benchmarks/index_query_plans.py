@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Index Query Plan Benchmark
+
+Seeds a throw-away SQLite database (1M tasks by default) and prints the
+EXPLAIN QUERY PLAN and median latency of the hot list queries, first without
+and then with the composite indexes declared in the models' Meta.indexes.
+
+The queries are built with the same ORM filters and ORDER BY as the viewsets
+(including the id tie-breaker added by keyset pagination).
+
+Usage:
+    python benchmarks/index_query_plans.py [--tasks 1000000] [--db /tmp/bench.sqlite3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='EXPLAIN QUERY PLAN before/after composite indexes')
+    parser.add_argument('--tasks', type=int, default=1_000_000, help='Number of tasks to seed')
+    parser.add_argument('--db', default=None, help='SQLite file to create (default: temp file)')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per query')
+    parser.add_argument('--keep', action='store_true', help='Keep the database file afterwards')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = ARGS.db or os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+
+import django  # noqa: E402
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+
+from api.attachments.models import Attachment  # noqa: E402
+from api.events.models import Event  # noqa: E402
+from api.projects.models import Project  # noqa: E402
+from api.sections.models import Section  # noqa: E402
+from api.stories.models import Story  # noqa: E402
+from api.tasks.models import Task, TaskProject  # noqa: E402
+from api.team_memberships.models import TeamMembership  # noqa: E402
+from api.teams.models import Team  # noqa: E402
+from api.users.models import User, UserWorkspace  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+
+BATCH_SIZE = 20_000
+PAGE = 51  # limit + 1 rows, as fetched by AsanaPagination
+
+
+def bulk_insert(model, rows):
+    """
+    Insert pre-adapted row dicts with executemany.
+    Columns that are not provided get the field's default.
+    """
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    defaults = {}
+    for field in fields:
+        value = field.get_default()
+        defaults[field.attname] = field.get_db_prep_save(value, connection) if value is not None else None
+    columns = ', '.join(f'"{f.column}"' for f in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f'INSERT INTO "{model._meta.db_table}" ({columns}) VALUES ({placeholders})'
+
+    batch = []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append([row.get(f.attname, defaults[f.attname]) for f in fields])
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+def ts(dt):
+    return dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def gid():
+    return str(uuid.uuid4())
+
+
+def seed(num_tasks):
+    """
+    Seed workspaces, users, teams, projects, sections, tasks and the
+    per-task relation tables.
+    """
+    rng = random.Random(42)
+    now = datetime(2026, 1, 1)
+    num_workspaces = 20
+    num_users = max(num_tasks // 200, 100)
+    num_projects = max(num_tasks // 500, 20)
+    num_teams = max(num_projects // 10, 2)
+
+    with transaction.atomic():
+        bulk_insert(Workspace, ({'gid': gid(), 'name': f'Workspace {i}', 'created_at': ts(now), 'updated_at': ts(now)}
+                                for i in range(num_workspaces)))
+        bulk_insert(User, ({'gid': gid(), 'name': f'User {i}', 'email': f'user{i}@example.com',
+                            'created_at': ts(now), 'updated_at': ts(now)} for i in range(num_users)))
+        bulk_insert(UserWorkspace, ({'user_id': u, 'workspace_id': 1 + u % num_workspaces, 'created_at': ts(now)}
+                                    for u in range(1, num_users + 1)))
+        bulk_insert(Team, ({'gid': gid(), 'name': f'Team {i}', 'organization_id': 1 + i % num_workspaces,
+                            'created_at': ts(now), 'updated_at': ts(now)} for i in range(num_teams)))
+        bulk_insert(TeamMembership, ({'gid': gid(), 'user_id': u, 'team_id': 1 + u % num_teams,
+                                      'created_at': ts(now), 'updated_at': ts(now)} for u in range(1, num_users + 1)))
+        bulk_insert(Project, ({'gid': gid(), 'name': f'Project {i:06d}', 'workspace_id': 1 + i % num_workspaces,
+                               'created_at': ts(now), 'modified_at': ts(now)} for i in range(num_projects)))
+        bulk_insert(Section, ({'gid': gid(), 'name': f'Section {i % 5}', 'project_id': 1 + i // 5,
+                               'created_at': ts(now)} for i in range(num_projects * 5)))
+
+        def tasks():
+            for i in range(num_tasks):
+                created = now - timedelta(minutes=num_tasks - i)
+                modified = created + timedelta(minutes=rng.randint(0, 10_000))
+                yield {
+                    'gid': gid(), 'name': f'Task {i}', 'workspace_id': 1 + i % num_workspaces,
+                    'assignee_id': rng.randint(1, num_users), 'completed': rng.random() < 0.5,
+                    'created_at': ts(created), 'modified_at': ts(modified),
+                }
+        bulk_insert(Task, tasks())
+
+        def task_projects():
+            for task_id in range(1, num_tasks + 1):
+                project_id = rng.randint(1, num_projects)
+                yield {'task_id': task_id, 'project_id': project_id,
+                       'section_id': (project_id - 1) * 5 + rng.randint(1, 5), 'created_at': ts(now)}
+        bulk_insert(TaskProject, task_projects())
+
+        bulk_insert(Story, ({'gid': gid(), 'task_id': rng.randint(1, num_tasks), 'text': 'comment',
+                             'created_at': ts(now - timedelta(seconds=i))} for i in range(num_tasks // 2)))
+        bulk_insert(Attachment, ({'gid': gid(), 'parent_id': rng.randint(1, num_tasks), 'name': 'file.png',
+                                  'created_at': ts(now - timedelta(seconds=i))} for i in range(num_tasks // 10)))
+        bulk_insert(Event, ({'gid': gid(), 'action': 'changed', 'resource': '{}',
+                             'created_at': ts(now - timedelta(seconds=i))} for i in range(num_tasks // 5)))
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def hot_queries():
+    """
+    The list queries issued by the viewsets, keyed by endpoint.
+    """
+    workspace = Workspace.objects.order_by('id').first()
+    user = User.objects.order_by('id').first()
+    team = Team.objects.order_by('id').first()
+    project = Project.objects.order_by('id').first()
+    section = Section.objects.filter(project=project).order_by('id').first()
+    task = Story.objects.order_by('id').first().task
+    attachment_task = Attachment.objects.order_by('id').first().parent
+
+    task_order = ('-modified_at', '-id')
+    return [
+        ('GET /tasks?workspace', Task.objects.filter(workspace__gid=workspace.gid).order_by(*task_order)),
+        ('GET /tasks?assignee', Task.objects.filter(assignee__gid=user.gid).order_by(*task_order)),
+        ('GET /tasks?project', Task.objects.filter(
+            id__in=TaskProject.objects.filter(project__gid=project.gid).values_list('task_id', flat=True)
+        ).order_by(*task_order)),
+        ('GET /tasks?section', Task.objects.filter(
+            id__in=TaskProject.objects.filter(section__gid=section.gid).values_list('task_id', flat=True)
+        ).order_by(*task_order)),
+        ('My Tasks (assignee, incomplete)', Task.objects.filter(assignee=user, completed=False)),
+        ('GET /tasks/{gid}/stories', Story.objects.filter(task=task).order_by('-created_at', '-id')),
+        ('GET /tasks/{gid}/attachments', Attachment.objects.filter(parent=attachment_task).order_by('-created_at', '-id')),
+        ('GET /projects/{gid}/sections', Section.objects.filter(project=project).order_by('name', 'id')),
+        ('GET /projects?workspace', Project.objects.filter(workspace__gid=workspace.gid).order_by('name', 'id')),
+        ('GET /events', Event.objects.order_by('-created_at', '-id')),
+        ('GET /users?workspace', User.objects.filter(
+            id__in=UserWorkspace.objects.filter(workspace=workspace).values_list('user_id', flat=True)
+        ).order_by('gid')),
+        ('GET /users?team', User.objects.filter(
+            id__in=TeamMembership.objects.filter(team=team).values_list('user_id', flat=True)
+        ).order_by('gid')),
+    ]
+
+
+def explain(queryset):
+    sql, params = queryset[:PAGE].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def time_query(queryset, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        list(queryset[:PAGE])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def model_indexes():
+    """All Meta.indexes declared by the project's models."""
+    for model in apps.get_models():
+        if model.__module__.startswith('api.'):
+            for index in model._meta.indexes:
+                yield model, index
+
+
+def measure(label, queries, runs):
+    results = {}
+    for name, queryset in queries:
+        results[name] = (explain(queryset), time_query(queryset, runs))
+    return results
+
+
+def main():
+    print(f"Database: {DB_PATH}")
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+    # Seed without the composite indexes: faster inserts and a true "before"
+    indexes = list(model_indexes())
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+
+    start = time.perf_counter()
+    seed(ARGS.tasks)
+    print(f"Seeded {ARGS.tasks:,} tasks in {time.perf_counter() - start:.1f}s")
+
+    queries = hot_queries()
+    before = measure('before', queries, ARGS.runs)
+
+    start = time.perf_counter()
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print(f"Built {len(indexes)} indexes in {time.perf_counter() - start:.1f}s\n")
+
+    after = measure('after', queries, ARGS.runs)
+
+    for name, _ in queries:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(f"== {name}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print("   before: " + " | ".join(plan_before))
+        print("   after:  " + " | ".join(plan_after))
+
+    if not ARGS.keep:
+        connection.close()
+        os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
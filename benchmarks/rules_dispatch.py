@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Rules Dispatch Benchmark
+
+Seeds one project with --rules enabled rules watching different fields
+and values (one section trigger per section, name, notes and due date
+triggers) and times PUT /tasks/{gid} against the same project without
+rules, for a change no rule matches and one that runs a rule. It also
+times matching one change against the project's RuleIndex against a scan
+of every rule's trigger JSON.
+
+Usage:
+    python benchmarks/rules_dispatch.py [--rules 500] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Indexed rule dispatch vs no rules and a full scan')
+    parser.add_argument('--rules', type=int, default=500, help='Rules in the project')
+    parser.add_argument('--repeat', type=int, default=200, help='Runs per measurement')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.projects.models import Project  # noqa: E402
+from api.rules.engine import project_index  # noqa: E402
+from api.rules.models import Rule  # noqa: E402
+from api.sections.models import Section  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+
+def seed(project):
+    sections = Section.objects.bulk_create([
+        Section(name=f'Section {i}', project=project) for i in range(ARGS.rules // 2)
+    ])
+    rules = [
+        Rule(
+            name=f'Section rule {i}', project=project,
+            trigger={'event': 'changed', 'field': 'section', 'value': section.gid},
+            action={'type': 'set_field', 'field': 'due_on', 'value': '2026-12-31'},
+        )
+        for i, section in enumerate(sections)
+    ]
+    fields = ('name', 'notes', 'due_on')
+    for i in range(ARGS.rules - len(rules)):
+        field = fields[i % len(fields)]
+        value = f'2027-01-{i % 28 + 1:02d}' if field == 'due_on' else f'{field} {i}'
+        rules.append(Rule(
+            name=f'{field} rule {i}', project=project,
+            trigger={'event': 'changed', 'field': field, 'value': value},
+            action={'type': 'add_comment', 'text': f'Rule {i} ran'},
+        ))
+    # The rule the matching change runs
+    rules.append(Rule(
+        name='Completion rule', project=project,
+        trigger={'event': 'changed', 'field': 'completed', 'value': True},
+        action={'type': 'add_comment', 'text': 'Completed'},
+    ))
+    Rule.objects.bulk_create(rules)
+
+
+def timed(func, repeat=None):
+    repeat = repeat or ARGS.repeat
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+    workspace = Workspace.objects.create(name='Benchmark')
+    plain = Project.objects.create(name='Without rules', workspace=workspace)
+    ruled = Project.objects.create(name='With rules', workspace=workspace)
+    seed(ruled)
+    print(f"Seeded {Rule.objects.count():,} rules\n")
+
+    def put(project, data):
+        gid = client.post('/tasks', {'data': {'name': 'Task', 'projects': [project.gid]}}, format='json').json()['data']['gid']
+        counter = iter(range(10 ** 9))
+
+        def run():
+            payload = {name: value(next(counter)) if callable(value) else value for name, value in data.items()}
+            response = client.put(f'/tasks/{gid}', {'data': payload}, format='json')
+            assert response.status_code == 200, response.content
+        return run
+
+    unmatched = {'name': lambda n: f'Renamed {n}'}
+    matched = {'completed': lambda n: n % 2 == 0}
+    print(f"{'PUT, no rules':<34} {timed(put(plain, unmatched)):9.2f} ms")
+    print(f"{'PUT, rules, no match':<34} {timed(put(ruled, unmatched)):9.2f} ms")
+    print(f"{'PUT completed, no rules':<34} {timed(put(plain, matched)):9.2f} ms")
+    print(f"{'PUT completed, rules, one match':<34} {timed(put(ruled, matched)):9.2f} ms")
+
+    index = project_index(ruled.pk)
+    triggers = list(Rule.objects.filter(project=ruled, enabled=True).values_list('trigger', flat=True))
+
+    def scan():
+        return [
+            trigger for trigger in triggers
+            if trigger.get('event') == 'changed' and trigger.get('field') in (None, 'name')
+            and trigger.get('value', 'Renamed') == 'Renamed'
+        ]
+
+    repeat = ARGS.repeat * 100
+    match = timed(lambda: index.match('changed', 'name', 'Renamed'), repeat)
+    print(f"\n{'Match one change, RuleIndex':<34} {match * 1000:9.2f} us")
+    print(f"{'Match one change, scan':<34} {timed(scan, repeat) * 1000:9.2f} us")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Time Tracking Report Benchmark
+
+Seeds one workspace with --entries time tracking entries (1M by default)
+spread over a year, --users users and --tasks tasks in --projects
+projects, then times GET /time_tracking_entries/report against the ORM
+`values().annotate(Sum(...))` query it replaces, for each grouping.
+Reports by one dimension cover the year; pivoted reports the last
+MAX_PIVOT_DAYS of it.
+
+Usage:
+    python benchmarks/time_tracking_report.py [--entries 1000000] [--users 5000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='NumPy time tracking report vs ORM aggregation')
+    parser.add_argument('--entries', type=int, default=1_000_000, help='Time tracking entries in the workspace')
+    parser.add_argument('--users', type=int, default=5_000, help='Users entering time')
+    parser.add_argument('--tasks', type=int, default=20_000, help='Tasks time is entered on')
+    parser.add_argument('--projects', type=int, default=100, help='Projects the tasks belong to')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per report')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from django.db.models.functions import TruncWeek  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.projects.models import Project  # noqa: E402
+from api.tasks.models import Task, TaskProject  # noqa: E402
+from api.time_tracking_entries.models import TimeTrackingEntry  # noqa: E402
+from api.time_tracking_entries.reports import MAX_PIVOT_DAYS  # noqa: E402
+from api.users.models import User  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+END_ON = date(2026, 6, 30)
+START_ON = END_ON - timedelta(days=364)
+
+# (group_by, pivot, ORM grouping it replaces)
+REPORTS = [
+    ('user', None, ('user__gid', 'user__name')),
+    ('task', None, ('task__gid', 'task__name')),
+    ('project', None, ('task__task_projects__project__gid', 'task__task_projects__project__name')),
+    ('user', 'week', ('user__gid', 'user__name', 'week')),
+    ('project', 'user', ('task__task_projects__project__gid', 'user__gid')),
+]
+
+
+def seed(workspace):
+    rng = random.Random(19)
+    users = User.objects.bulk_create([
+        User(name=f'User {i}', email=f'user{i}@example.com') for i in range(ARGS.users)
+    ])
+    projects = Project.objects.bulk_create([
+        Project(name=f'Project {i}', workspace=workspace) for i in range(ARGS.projects)
+    ])
+    tasks = Task.objects.bulk_create([
+        Task(name=f'Task {i}', workspace=workspace) for i in range(ARGS.tasks)
+    ], batch_size=10_000)
+    TaskProject.objects.bulk_create([
+        TaskProject(task=task, project=rng.choice(projects)) for task in tasks
+    ], batch_size=10_000)
+
+    batch = []
+    for _ in range(ARGS.entries):
+        batch.append(TimeTrackingEntry(
+            task=rng.choice(tasks), user=rng.choice(users), workspace=workspace,
+            duration_minutes=rng.randint(5, 240), entered_on=START_ON + timedelta(days=rng.randint(0, 364)),
+        ))
+        if len(batch) == 10_000:
+            TimeTrackingEntry.objects.bulk_create(batch)
+            batch = []
+    TimeTrackingEntry.objects.bulk_create(batch)
+
+
+def timed(func):
+    func()
+    start = time.perf_counter()
+    for _ in range(ARGS.repeat):
+        func()
+    return (time.perf_counter() - start) / ARGS.repeat * 1000
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+    workspace = Workspace.objects.create(name='Benchmark')
+
+    start = time.perf_counter()
+    seed(workspace)
+    print(f"Seeded {ARGS.entries:,} entries in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'report':<16} {'GET report':>13} {'ORM Sum':>12}")
+    for group_by, pivot, grouping in REPORTS:
+        start_on = END_ON - timedelta(days=MAX_PIVOT_DAYS - 1) if pivot else START_ON
+
+        def report():
+            params = {'workspace': workspace.gid, 'start_on': start_on, 'end_on': END_ON, 'group_by': group_by}
+            if pivot:
+                params['pivot'] = pivot
+            response = client.get('/time_tracking_entries/report', params)
+            assert response.status_code == 200, response.content
+
+        def orm_sum():
+            list(TimeTrackingEntry.objects.filter(
+                workspace=workspace, entered_on__gte=start_on, entered_on__lte=END_ON
+            ).annotate(week=TruncWeek('entered_on')).values(*grouping).annotate(
+                total_minutes=Sum('duration_minutes')
+            ).order_by('-total_minutes'))
+
+        label = f'{group_by} x {pivot}' if pivot else group_by
+        print(f"{label:<16} {timed(report):10.1f} ms {timed(orm_sum):9.1f} ms")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Typeahead Index Benchmark
+
+Seeds one workspace with --tasks tasks (1M by default) and builds the
+typeahead prefix index, then times keystroke queries through
+GET /typeahead against the `name LIKE '%q%'` scan they replace. Before
+timing, it checks that a multi-word query finds a match that sorts after
+many single-word matches.
+
+Usage:
+    python benchmarks/typeahead_index.py [--tasks 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Typeahead prefix index vs LIKE scan')
+    parser.add_argument('--tasks', type=int, default=1_000_000, help='Tasks in the workspace')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.tasks.models import Task  # noqa: E402
+from api.typeahead.index import rebuild_index, search  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+WORDS = (
+    'launch plan review draft budget hiring roadmap design research onboarding '
+    'migration release marketing campaign audit invoice quarterly report customer '
+    'feedback sprint backlog bug fix performance website mobile api integration'
+).split()
+
+QUERIES = ['l', 'lau', 'launch', 'launch pl', 'quart rep', 'integr', 'zzz']
+
+
+def seed(workspace):
+    rng = random.Random(11)
+    batch = []
+    for i in range(ARGS.tasks):
+        name = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).capitalize()
+        batch.append(Task(name=f'{name} {i}', workspace=workspace))
+        if len(batch) == 10_000:
+            Task.objects.bulk_create(batch)
+            batch = []
+    Task.objects.bulk_create(batch)
+
+
+def check_multi_word():
+    """Every query word narrows the matches before they are truncated."""
+    workspace = Workspace.objects.create(name='Multi-word check')
+    Task.objects.bulk_create([Task(name=f'Design mock {i}', workspace=workspace) for i in range(120)])
+    review = Task.objects.create(name='Design review', workspace=workspace)
+    rebuild_index()
+    found = search(workspace.id, 'task', 'design rev', 5)
+    assert [item['gid'] for item in found] == [review.gid], found
+    first = search(workspace.id, 'task', 'design', 3)
+    assert [item['name'] for item in first] == ['Design mock 0', 'Design mock 1', 'Design mock 2'], first
+
+
+def timed(func):
+    func()
+    start = time.perf_counter()
+    for _ in range(ARGS.repeat):
+        func()
+    return (time.perf_counter() - start) / ARGS.repeat * 1000
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer benchmark')
+    check_multi_word()
+    workspace = Workspace.objects.create(name='Benchmark')
+
+    start = time.perf_counter()
+    seed(workspace)
+    print(f"Seeded {ARGS.tasks:,} tasks in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    terms = rebuild_index()
+    print(f"Indexed {terms:,} terms in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<12} {'GET /typeahead':>15} {'LIKE scan':>12}")
+    for query in QUERIES:
+        def indexed():
+            response = client.get('/typeahead', {
+                'workspace': workspace.gid, 'resource_type': 'task', 'query': query, 'count': 20,
+            })
+            assert response.status_code == 200, response.content
+
+        def like_scan():
+            list(Task.objects.filter(workspace=workspace, name__icontains=query)
+                 .order_by('name').values_list('gid', 'name')[:20])
+
+        print(f"{query!r:<12} {timed(indexed):12.2f} ms {timed(like_scan):9.2f} ms")
+
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
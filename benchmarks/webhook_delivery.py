@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Webhook Delivery Benchmark
+
+Starts a local stand-in HTTP receiver, registers webhooks on one workspace,
+writes a batch of events and measures how long the delivery engine takes
+to fan them out (10k events to 100 webhooks by default).
+
+The receiver speaks HTTP/1.1 keep-alive and can fail a share of requests
+(--fail-rate) to exercise the retry path.
+
+Usage:
+    python benchmarks/webhook_delivery.py [--events 10000] [--webhooks 100] [--workers 16]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Setup Django
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'asana_django.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Webhook delivery throughput')
+    parser.add_argument('--events', type=int, default=10_000, help='Number of events to deliver')
+    parser.add_argument('--webhooks', type=int, default=100, help='Number of webhooks watching the workspace')
+    parser.add_argument('--workers', type=int, default=16, help='Delivery worker threads')
+    parser.add_argument('--per-delivery', type=int, default=100, help='Max events coalesced per POST')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests the receiver answers with 500')
+    parser.add_argument('--hosts', type=int, default=1, help='Spread webhook targets over this many receiver ports')
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='asana-bench-'), 'bench.sqlite3')
+
+from django.conf import settings  # noqa: E402
+settings.DATABASES['default']['NAME'] = DB_PATH
+
+import django  # noqa: E402
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from api.events.models import Event, EventSequence  # noqa: E402
+from api.webhooks.delivery import WebhookDeliveryEngine  # noqa: E402
+from api.webhooks.models import Webhook  # noqa: E402
+from api.workspaces.models import Workspace  # noqa: E402
+
+
+class Receiver(BaseHTTPRequestHandler):
+    """Stand-in webhook target that counts requests, events and connections."""
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    stats = {'requests': 0, 'events': 0, 'failed': 0, 'connections': 0}
+    rng = random.Random(7)
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            self.stats['connections'] += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with self.lock:
+            fail = self.rng.random() < ARGS.fail_rate
+            self.stats['requests'] += 1
+            if fail:
+                self.stats['failed'] += 1
+            else:
+                self.stats['events'] += len(json.loads(body)['events'])
+        status = 500 if fail else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_receivers(count):
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Receiver)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def main():
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    servers = start_receivers(ARGS.hosts)
+
+    workspace = Workspace.objects.create(name='Benchmark')
+    Webhook.objects.bulk_create([
+        Webhook(
+            resource={'gid': workspace.gid, 'resource_type': 'workspace'},
+            target=f'http://127.0.0.1:{servers[i % len(servers)].server_port}/hook/{i}',
+        )
+        for i in range(ARGS.webhooks)
+    ])
+
+    engine = WebhookDeliveryEngine(
+        max_workers=ARGS.workers,
+        max_events_per_delivery=ARGS.per_delivery,
+        backoff_base=0.05,
+        max_attempts=10,
+    )
+    Event.objects.bulk_create([
+        Event(
+            action='changed', workspace=workspace, sequence=i + 1,
+            resource={'gid': str(i), 'resource_type': 'task', 'name': f'Task {i}'},
+        )
+        for i in range(ARGS.events)
+    ], batch_size=5000)
+    EventSequence.objects.update_or_create(workspace=workspace, defaults={'last_sequence': ARGS.events})
+
+    start = time.perf_counter()
+    engine.drain()
+    elapsed = time.perf_counter() - start
+    engine.close()
+
+    stats = Receiver.stats
+    expected = ARGS.events * ARGS.webhooks
+    print(f"Events: {ARGS.events:,}  Webhooks: {ARGS.webhooks}  Workers: {ARGS.workers}  "
+          f"Per delivery: {ARGS.per_delivery}  Fail rate: {ARGS.fail_rate}")
+    print(f"Delivered {stats['events']:,}/{expected:,} event notifications in {elapsed:.2f}s "
+          f"({stats['events'] / elapsed:,.0f} events/s)")
+    print(f"HTTP requests: {stats['requests']:,} ({stats['failed']:,} failed and retried), "
+          f"{stats['requests'] / elapsed:,.0f} req/s over {stats['connections']} connections")
+
+    for server in servers:
+        server.shutdown()
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
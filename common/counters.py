@@ -0,0 +1,23 @@
+"""
+Maintained counter rows adjusted with F() updates.
+
+A counter row is identified by a key (a dict of field values covered by a
+unique constraint) and holds numeric columns that writers add deltas to.
+The row is created on first use, so callers never read before writing.
+
+Usage:
+    adjust(ProjectTaskCount, {'project_id': 1, 'section_id': None}, {'num_tasks': 1})
+"""
+from django.db.models import F
+
+
+def adjust(model, key: dict, changes: dict) -> None:
+    """Add `changes` ({field: delta}) to the row of `model` with `key`, creating it if needed."""
+    updates = {name: F(name) + value for name, value in changes.items() if value}
+    if not updates:
+        return
+    if not model.objects.filter(**key).update(**updates):
+        # First change of this key; a concurrent insert of the same row is
+        # ignored and both updates then apply to it
+        model.objects.bulk_create([model(**key)], ignore_conflicts=True)
+        model.objects.filter(**key).update(**updates)
@@ -189,3 +189,19 @@ def asana_forbidden_error() -> Response:
         {'errors': errors},
         status=status.HTTP_403_FORBIDDEN
     )
+
+
+def asana_sync_token_error(sync_token: str) -> Response:
+    """
+    Create an Asana-formatted 412 response for a missing or expired sync token.
+    The response carries a fresh sync token to start syncing from.
+    """
+    errors = [{
+        'message': 'Sync token invalid or too old. If you are attempting to keep resources in sync, you must fetch the full dataset for this query now and use the new sync token for the next sync.',
+        'help': 'Use the sync token returned in this response for the next request.',
+        'phrase': None
+    }]
+    return Response(
+        {'errors': errors, 'sync': sync_token},
+        status=status.HTTP_412_PRECONDITION_FAILED
+    )
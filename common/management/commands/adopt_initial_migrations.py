@@ -0,0 +1,40 @@
+"""
+Record as applied the initial migrations of apps whose tables already
+exist, as `migrate --fake-initial` would.
+
+Apps that used to be created by syncdb (tasks, sections, stories, ...)
+now have migrations, and migrations of other apps that were applied long
+ago depend on them, so `migrate` refuses to run on an existing database
+("applied before its dependency") before it gets to fake anything. Run
+this once on such a database, then `migrate`.
+
+Usage:
+    python manage.py adopt_initial_migrations [--database default]
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+
+class Command(BaseCommand):
+    help = 'Record initial migrations whose tables already exist as applied, so migrate can run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to adopt')
+
+    def handle(self, *args, **options):
+        executor = MigrationExecutor(connections[options['database']])
+        applied = executor.recorder.applied_migrations()
+        adopted = 0
+        for key in executor.loader.graph.leaf_nodes():
+            for app_label, name in executor.loader.graph.forwards_plan(key):
+                migration = executor.loader.graph.nodes[(app_label, name)]
+                if (app_label, name) in applied or not migration.initial:
+                    continue
+                soft_applied, _ = executor.detect_soft_applied(None, migration)
+                if soft_applied:
+                    executor.recorder.record_applied(app_label, name)
+                    applied[(app_label, name)] = migration
+                    adopted += 1
+                    self.stdout.write(f'Adopted {app_label}.{name}')
+        self.stdout.write(f'Adopted {adopted} initial migrations')
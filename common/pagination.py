@@ -5,11 +5,23 @@ Matches FastAPI pagination format exactly:
 - Uses offset tokens (strings) instead of page numbers
 - Returns next_page object with offset, path, and uri
 - Limit must be between 1 and 100
+
+Querysets with a plain column ordering are paginated by keyset: the offset
+token encodes the sort key of the last row returned, and the next page is
+an indexed seek (WHERE (k, id) > (...)) instead of OFFSET. Whether there is
+a next page is decided by fetching limit + 1 rows, so no COUNT(*) is run.
+Numeric offset tokens and querysets that cannot be seeked (lists, ordering
+on expressions, nullable or related columns) use OFFSET slicing.
 """
+import base64
+import binascii
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple
 
 
 class AsanaPagination(BasePagination):
@@ -30,6 +42,7 @@ class AsanaPagination(BasePagination):
     page_size_query_param = 'limit'
     max_page_size = 100
     offset_query_param = 'offset'
+    use_keyset = True
     
     def paginate_queryset(self, queryset, request, view=None):
         """
@@ -47,32 +60,132 @@ class AsanaPagination(BasePagination):
         # Get offset token from query params
         offset_token = request.query_params.get(self.offset_query_param)
         
-        # Decode offset to get the actual offset value
-        if offset_token:
+        self.limit = limit
+        self.offset = 0
+        self.next_offset = None
+        
+        sort_key = self.get_sort_key(queryset) if self.use_keyset else None
+        if sort_key is not None and not (offset_token and offset_token.isdigit()):
+            rows = self._paginate_keyset(queryset, sort_key, offset_token, limit)
+        else:
+            # Decode offset to get the actual offset value
             try:
-                offset = int(offset_token)
+                offset = int(offset_token) if offset_token else 0
             except (ValueError, TypeError):
                 offset = 0
-        else:
-            offset = 0
+            self.offset = max(offset, 0)
+            rows = list(queryset[self.offset:self.offset + limit + 1])
+            if len(rows) > limit:
+                self.next_offset = str(self.offset + limit)
         
-        # Apply offset and limit
-        self.offset = offset
-        self.limit = limit
+        # The extra row only tells us whether a next page exists
+        self.has_next = len(rows) > limit
+        self.page = rows[:limit]
+        return self.page
+    
+    def _paginate_keyset(self, queryset, sort_key, offset_token, limit):
+        """
+        Fetch limit + 1 rows after the position encoded in offset_token.
+        """
+        queryset = queryset.order_by(*[
+            f"-{field.name}" if descending else field.name
+            for field, descending in sort_key
+        ])
+        
+        # Make sure the key columns are loaded when the queryset uses .only()
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            queryset = queryset.only(*loaded, *[field.name for field, _ in sort_key])
+        
+        values = self._decode_keyset_token(offset_token, sort_key)
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(sort_key, values))
         
-        # Get total count (for determining if there's a next page)
-        self.count = self.get_count(queryset)
+        rows = list(queryset[:limit + 1])
+        if len(rows) > limit:
+            self.next_offset = self._encode_keyset_token(rows[limit - 1], sort_key)
+        return rows
+    
+    def get_sort_key(self, queryset) -> Optional[List[Tuple[Any, bool]]]:
+        """
+        Return the queryset ordering as [(model_field, descending), ...] with
+        the primary key appended as a tie-breaker, or None if the ordering
+        cannot be used for a keyset seek.
+        """
+        if not isinstance(queryset, QuerySet):
+            return None
         
-        # Apply pagination
-        if offset >= self.count:
-            # Offset beyond available items, return empty
-            self.page = []
-            self.has_next = False
+        query = queryset.query
+        if query.order_by:
+            ordering = list(query.order_by)
+        elif query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
         else:
-            self.page = list(queryset[offset:offset + limit])
-            self.has_next = (offset + limit) < self.count
+            ordering = []
         
-        return self.page
+        opts = queryset.model._meta
+        sort_key = []
+        for item in ordering:
+            if not isinstance(item, str) or item == '?':
+                return None
+            descending = item.startswith('-')
+            name = item.lstrip('-+')
+            if name == 'pk':
+                name = opts.pk.name
+            if '__' in name:
+                return None
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation or field.null:
+                return None
+            sort_key.append((field, descending))
+            if field.primary_key or field.unique:
+                # A unique column already determines the position
+                return sort_key
+        
+        descending = sort_key[-1][1] if sort_key else False
+        sort_key.append((opts.pk, descending))
+        return sort_key
+    
+    def _seek_filter(self, sort_key, values) -> Q:
+        """
+        Build (k1, k2, ...) > (v1, v2, ...) as an OR of prefix-equality terms,
+        honouring the direction of each key.
+        """
+        condition = Q()
+        for i, (field, descending) in enumerate(sort_key):
+            lookup = 'lt' if descending else 'gt'
+            term = Q(**{f"{field.name}__{lookup}": values[i]})
+            for j in range(i):
+                term &= Q(**{sort_key[j][0].name: values[j]})
+            condition |= term
+        return condition
+    
+    def _encode_keyset_token(self, obj, sort_key) -> str:
+        """
+        Encode the sort key of `obj` as an opaque, URL-safe offset token.
+        """
+        values = [field.value_to_string(obj) for field, _ in sort_key]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    def _decode_keyset_token(self, token, sort_key) -> Optional[List[Any]]:
+        """
+        Decode an offset token produced by _encode_keyset_token.
+        Returns None (start from the beginning) if the token is missing or invalid.
+        """
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(sort_key):
+                return None
+            return [field.to_python(value) for (field, _), value in zip(sort_key, values)]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            return None
     
     def get_paginated_response(self, data):
         """
@@ -84,8 +197,7 @@ class AsanaPagination(BasePagination):
         
         # Add next_page if there are more results
         if self.has_next:
-            next_offset = str(self.offset + self.limit)
-            next_page = self._build_next_page(next_offset)
+            next_page = self._build_next_page(self.next_offset)
             response_data['next_page'] = next_page
         else:
             response_data['next_page'] = None
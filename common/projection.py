@@ -0,0 +1,160 @@
+"""
+opt_fields-aware query projection.
+
+Compiles the opt_fields requested by a client into:
+- the set of top-level serializer fields to render (unrequested fields,
+  including SerializerMethodFields, are never evaluated),
+- a column list for QuerySet.only(),
+- the nested foreign keys to fetch with select_related().
+
+apply_opt_fields still runs on the rendered data, so the response shape is
+unchanged; the projection only avoids loading and computing what would be
+thrown away.
+
+Usage:
+    projection = compile_opt_fields(TaskCompactSerializer, opt_fields)
+    queryset = projection.apply(queryset)
+    serializer = projection.serializer(page, many=True)
+
+Serializers whose SerializerMethodFields read model columns declare them in
+Meta.opt_field_sources, e.g. {'workspace': ['workspace']}. A requested method
+field without a declared source disables column deferral for that request,
+since deferred columns would be loaded one row at a time.
+
+Fields listed in Meta.opt_in_fields (e.g. aggregates that cost a query) are
+only rendered when named in opt_fields.
+"""
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class OptFieldsProjection:
+    """
+    Compiled projection for one serializer class and one opt_fields set.
+
+    `fields` is None when every serializer field must be rendered.
+    `columns` is None when the queryset must not be deferred.
+    """
+
+    def __init__(
+        self,
+        serializer_class,
+        fields: Optional[FrozenSet[str]] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+        select_related: Tuple[str, ...] = (),
+    ):
+        self.serializer_class = serializer_class
+        self.fields = fields
+        self.columns = columns
+        self.select_related = select_related
+
+    def apply(self, queryset):
+        """
+        Restrict a queryset (or manager) to the projected columns.
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.columns is not None:
+            queryset = queryset.only(*self.columns)
+        return queryset
+
+    def serializer(self, instance, many: bool = False, **kwargs):
+        """
+        Build a serializer for the instance(s) that only renders the
+        projected fields.
+        """
+        serializer = self.serializer_class(instance, many=many, **kwargs)
+        target = serializer.child if many else serializer
+        if self.fields is not None:
+            for name in list(target.fields):
+                if name not in self.fields:
+                    target.fields.pop(name)
+        else:
+            for name in getattr(getattr(self.serializer_class, 'Meta', None), 'opt_in_fields', ()):
+                target.fields.pop(name, None)
+        return serializer
+
+
+def parse_opt_fields(opt_fields: Optional[Iterable[str]]) -> List[str]:
+    """
+    Normalize opt_fields into a flat list of field paths.
+    Accepts a comma-separated string or a list of (possibly comma-separated) strings.
+    """
+    if not opt_fields:
+        return []
+    if isinstance(opt_fields, str):
+        opt_fields = [opt_fields]
+    paths = []
+    for value in opt_fields:
+        paths.extend(part.strip() for part in value.split(',') if part.strip())
+    return paths
+
+
+def compile_opt_fields(serializer_class, opt_fields: Optional[Iterable[str]]) -> OptFieldsProjection:
+    """
+    Compile opt_fields for a serializer class into an OptFieldsProjection.
+    """
+    top_level = frozenset(path.split('.')[0] for path in parse_opt_fields(opt_fields))
+    return _compile(serializer_class, top_level)
+
+
+@lru_cache(maxsize=512)
+def _compile(serializer_class, top_level: FrozenSet[str]) -> OptFieldsProjection:
+    full = OptFieldsProjection(serializer_class)
+    if not top_level:
+        return full
+
+    serializer = serializer_class()
+    declared = serializer.fields
+
+    # apply_opt_fields returns the full record when nothing matches and
+    # unknown names may be produced by to_representation(), so only project
+    # when every requested name is a real serializer field.
+    if not top_level.issubset(declared.keys()):
+        return full
+
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+    if model is None:
+        return OptFieldsProjection(serializer_class, fields=top_level)
+
+    sources = getattr(serializer_class.Meta, 'opt_field_sources', {})
+    columns = {model._meta.pk.name}
+    select_related = set()
+    deferrable = True
+
+    for name in top_level:
+        field = declared[name]
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in sources:
+                deferrable = False
+                continue
+            columns.update(sources[name])
+            continue
+
+        source = field.source or name
+        if source == '*':
+            deferrable = False
+            continue
+        attr = source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            deferrable = False
+            continue
+        if not model_field.concrete:
+            # Reverse and many-to-many relations are not columns
+            deferrable = False
+            continue
+        columns.add(attr)
+        if model_field.is_relation and isinstance(field, serializers.BaseSerializer):
+            select_related.add(attr)
+
+    return OptFieldsProjection(
+        serializer_class,
+        fields=top_level,
+        columns=tuple(sorted(columns)) if deferrable else None,
+        select_related=tuple(sorted(select_related)),
+    )
@@ -0,0 +1,242 @@
+"""
+Fractional rank keys for user-ordered lists (sections in a project, tasks
+in a section).
+
+A rank is a string that sorts lexicographically (byte order). A key can
+always be generated between any two existing keys, so placing or moving
+an item writes only that item's row. Listing is an index-ordered scan on
+(group, rank).
+
+Keys have an integer head, which keeps appends and prepends short
+(`a0`, `a1`, ... `az`, `b00`, ...), followed by an optional base-62
+fraction used for inserts between neighbours. Repeated inserts at the
+same spot make keys grow by roughly one character per six inserts; once
+a key exceeds REBALANCE_LENGTH its group is rewritten with short,
+evenly spaced keys after the transaction commits.
+
+Usage:
+    key_between(None, None)      # 'a0'
+    key_between('a0', 'a1')      # 'a0V'
+    section.rank = place(Section.objects.filter(project=project),
+                         pk=section.pk, anchor_pk=other.pk, before=True)
+"""
+from typing import List, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+INTEGER_ZERO = 'a0'
+SMALLEST_INTEGER = 'A' + '0' * 26
+
+# Keys longer than this trigger a rebalance of their group
+REBALANCE_LENGTH = 32
+
+# Rows per UPDATE statement group when rebalancing
+REBALANCE_CHUNK_SIZE = 500
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """
+    Fraction strictly between fractions a and b (b=None is the upper end).
+    Neither may end in the smallest digit.
+    """
+    if b is not None:
+        # Keep the common prefix, then split the remainder
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # Adjacent digits
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if 'a' <= head <= 'z':
+        return ord(head) - ord('a') + 2
+    if 'A' <= head <= 'Z':
+        return ord('Z') - ord(head) + 2
+    raise ValueError(f'Invalid rank key head: {head!r}')
+
+
+def _split(key: str):
+    """Split a key into its integer head and fraction, validating both."""
+    if not key or key == SMALLEST_INTEGER:
+        raise ValueError(f'Invalid rank key: {key!r}')
+    length = _integer_length(key[0])
+    if length > len(key) or any(char not in DIGITS for char in key[1:]):
+        raise ValueError(f'Invalid rank key: {key!r}')
+    fraction = key[length:]
+    if fraction.endswith(DIGITS[0]):
+        raise ValueError(f'Invalid rank key: {key!r}')
+    return key[:length], fraction
+
+
+def _increment_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) + 1
+        if value < len(DIGITS):
+            digits[i] = DIGITS[value]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[0]
+    # Carried past the first digit: move to the next integer length
+    if head == 'Z':
+        return INTEGER_ZERO
+    if head == 'z':
+        return None
+    head = chr(ord(head) + 1)
+    if head > 'a':
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) - 1
+        if value >= 0:
+            digits[i] = DIGITS[value]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    # Borrowed past the first digit: move to the previous integer length
+    if head == 'a':
+        return 'Z' + DIGITS[-1]
+    if head == 'A':
+        return None
+    head = chr(ord(head) - 1)
+    if head < 'Z':
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """
+    Return a key that sorts strictly between a and b. None stands for the
+    start (a) or end (b) of the list. Raises ValueError for invalid keys
+    or if a >= b.
+    """
+    if a is not None:
+        integer_a, fraction_a = _split(a)
+    if b is not None:
+        integer_b, fraction_b = _split(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f'Rank keys out of order: {a!r} >= {b!r}')
+
+    if a is None:
+        if b is None:
+            return INTEGER_ZERO
+        if integer_b == SMALLEST_INTEGER:
+            return integer_b + _midpoint('', fraction_b)
+        if integer_b < b:
+            return integer_b
+        key = _decrement_integer(integer_b)
+        if key is None:
+            raise ValueError('Cannot decrement rank key any further')
+        return key
+
+    if b is None:
+        key = _increment_integer(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if key is None else key
+
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    key = _increment_integer(integer_a)
+    if key is not None and key < b:
+        return key
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], count: int) -> List[str]:
+    """Return `count` ascending keys strictly between a and b."""
+    if count <= 0:
+        return []
+    if count == 1:
+        return [key_between(a, b)]
+    if b is None:
+        keys = [key_between(a, None)]
+        for _ in range(count - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if a is None:
+        keys = [key_between(None, b)]
+        for _ in range(count - 1):
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = count // 2
+    key = key_between(a, b)
+    return keys_between(a, key, middle) + [key] + keys_between(key, b, count - middle - 1)
+
+
+def rebalance(group: QuerySet, field: str = 'rank') -> int:
+    """
+    Rewrite the keys of an ordered group with short, evenly spaced ones,
+    keeping the current (key, pk) order. Returns the number of rows
+    changed.
+    """
+    model = group.model
+    with transaction.atomic():
+        rows = list(group.select_for_update().order_by(field, 'pk').values_list('pk', field))
+        keys = keys_between(None, None, len(rows))
+        changed = [
+            model(**{model._meta.pk.attname: pk, field: key})
+            for (pk, old), key in zip(rows, keys) if old != key
+        ]
+        model.objects.bulk_update(changed, [field], batch_size=REBALANCE_CHUNK_SIZE)
+    return len(changed)
+
+
+def place(group: QuerySet, pk=None, anchor_pk=None, before: bool = False, field: str = 'rank') -> str:
+    """
+    Return the key for row `pk` (None for a new row) placed in an ordered
+    group: directly before or after the sibling `anchor_pk`, or at the
+    start (before=True) or end of the group without an anchor.
+
+    Reads the anchor and one neighbour through the (group, rank) index.
+    Groups holding unranked ('') keys around the position are rebalanced
+    first; a key that grew past REBALANCE_LENGTH schedules a
+    rebalance of the group once the transaction commits.
+    """
+    siblings = group.exclude(pk=pk) if pk is not None else group
+    for attempt in range(2):
+        if anchor_pk is None:
+            edge = siblings.order_by(field if before else f'-{field}').values_list(field, flat=True).first()
+            lower, upper = (None, edge) if before else (edge, None)
+        else:
+            anchor = siblings.filter(pk=anchor_pk).values_list(field, flat=True).first()
+            if anchor is None:
+                raise ValueError('Anchor is not in the group')
+            if before:
+                upper = anchor
+                lower = siblings.filter(**{f'{field}__lt': anchor}).order_by(f'-{field}').values_list(
+                    field, flat=True).first()
+            else:
+                lower = anchor
+                upper = siblings.filter(**{f'{field}__gt': anchor}).order_by(field).values_list(
+                    field, flat=True).first()
+        try:
+            if lower == '' or upper == '':
+                raise ValueError('Unranked sibling')
+            key = key_between(lower, upper)
+        except ValueError:
+            if attempt:
+                raise
+            rebalance(group, field)
+            continue
+        if len(key) > REBALANCE_LENGTH:
+            transaction.on_commit(lambda: rebalance(group, field))
+        return key
@@ -5,6 +5,7 @@ All responses must match FastAPI/Pydantic model format exactly.
 """
 from rest_framework import serializers
 from typing import Optional, List, Any, Dict
+from .projection import parse_opt_fields
 
 
 class AsanaResourceSerializer(serializers.Serializer):
@@ -94,9 +95,8 @@ def apply_opt_fields(data: Dict[str, Any], opt_fields: Optional[List[str]]) -> D
     if opt_fields is None:
         return data
     
-    # Split comma-separated string if needed
-    if isinstance(opt_fields, str):
-        opt_fields = [f.strip() for f in opt_fields.split(',')]
+    # Split comma-separated values (e.g. ?opt_fields=name,notes) if needed
+    opt_fields = parse_opt_fields(opt_fields)
     
     # Filter data to only include requested fields
     # Note: This is a simplified implementation
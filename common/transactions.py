@@ -0,0 +1,135 @@
+"""
+Per-transaction buffers flushed when the transaction commits.
+
+Signal receivers that react to many rows at once (a cascade delete, a
+request that saves many objects) can buffer their work here and do it in
+one statement at commit time instead of one statement per row.
+defer_to_commit flushes after the commit, for work that must only see
+committed data (cache invalidation, notifications). defer_before_commit
+flushes just before it, inside the transaction, for rows that must commit
+or roll back together with the data they describe.
+
+Usage:
+    defer_to_commit('typeahead.remove', [instance.gid], remove_resources)
+    defer_before_commit('events', events, write_events)
+"""
+import threading
+from typing import Callable, Iterable, List
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+_state = threading.local()
+
+
+def defer_to_commit(name: str, items: Iterable, flush: Callable[[List], None], using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Add items to the `name` buffer of the current transaction; `flush` is
+    called once with the whole buffer when it commits. Outside a
+    transaction, `flush` is called right away.
+
+    Each savepoint level gets its own buffer and on_commit callback, so
+    items added inside a savepoint that is rolled back are discarded
+    together with it.
+    """
+    items = list(items)
+    if not items:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush(items)
+        return
+    _buffer(connection, name, flush).extend(items)
+
+
+def _buffer(connection, name: str, flush: Callable[[List], None]) -> List:
+    buffers = getattr(_state, 'buffers', None)
+    if buffers is None:
+        buffers = _state.buffers = {}
+    key = (name, connection.alias, tuple(connection.savepoint_ids))
+    entry = buffers.get(key)
+    if entry is not None:
+        buffer, callback = entry
+        # A rollback drops pending callbacks; a dropped buffer must not be reused
+        if any(pending[1] is callback for pending in connection.run_on_commit):
+            return buffer
+
+    buffer = []
+
+    def callback():
+        if buffers.get(key, (None,))[0] is buffer:
+            del buffers[key]
+        flush(buffer)
+
+    buffers[key] = (buffer, callback)
+    transaction.on_commit(callback, using=connection.alias)
+    return buffer
+
+
+def defer_before_commit(name: str, items: Iterable, flush: Callable[[List], None], using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Add items to the `name` buffer of the current transaction; `flush` is
+    called once with the whole buffer just before the outermost atomic
+    block commits, inside the transaction, so whatever it writes commits or
+    rolls back with it. Outside a transaction, `flush` is called right
+    away.
+
+    Items added inside a savepoint that is rolled back are discarded, as
+    with defer_to_commit.
+    """
+    items = list(items)
+    if not items:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush(items)
+        return
+    _hook_commit(connection)
+    buffers = getattr(_state, 'before_commit', None)
+    if buffers is None:
+        buffers = _state.before_commit = {}
+    key = (name, connection.alias, tuple(connection.savepoint_ids))
+    entry = buffers.get(key)
+    if entry is None or not _pending(connection, entry[2]):
+        # The on_commit marker only tells whether the savepoint the buffer
+        # was filled in has been rolled back
+        entry = buffers[key] = ([], flush, lambda: None)
+        transaction.on_commit(entry[2], using=connection.alias)
+    entry[0].extend(items)
+
+
+def _pending(connection, callback) -> bool:
+    return any(pending[1] is callback for pending in connection.run_on_commit)
+
+
+def _hook_commit(connection) -> None:
+    """Flush the connection's before-commit buffers whenever it commits."""
+    if getattr(connection, 'flushes_before_commit', False):
+        return
+    commit = connection.commit
+
+    def flush_and_commit():
+        try:
+            _flush_before_commit(connection)
+        except Exception:
+            # Atomic only rolls back on database errors
+            connection.rollback()
+            raise
+        commit()
+
+    connection.commit = flush_and_commit
+    connection.flushes_before_commit = True
+
+
+def _flush_before_commit(connection) -> None:
+    buffers = getattr(_state, 'before_commit', None)
+    # A flush may fill new buffers (in its own atomic block): repeat until
+    # none are left
+    while buffers:
+        keys = [key for key in buffers if key[1] == connection.alias]
+        if not keys:
+            return
+        for key in keys:
+            items, flush, marker = buffers.pop(key)
+            if _pending(connection, marker):
+                flush(items)